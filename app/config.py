@@ -180,6 +180,9 @@ class Config:
     USE_AZURE_AD = (get_secret_directly("azure-sql-use-azure-ad") or "false").lower() == "true" if KEYVAULT_AVAILABLE else False
     SQL_CONNECTION_TIMEOUT = int(get_secret_directly("azure-sql-connection-timeout") or "30") if KEYVAULT_AVAILABLE else 30
     SQL_COMMAND_TIMEOUT = int(get_secret_directly("azure-sql-command-timeout") or "30") if KEYVAULT_AVAILABLE else 30
+    SQL_POOL_SIZE = int(os.getenv("SQL_POOL_SIZE", "10"))
+    SQL_POOL_TIMEOUT = float(os.getenv("SQL_POOL_TIMEOUT", "30"))
+    SQL_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("SQL_POOL_HEALTH_CHECK_INTERVAL", "30"))
     
     @classmethod
     def validate_azure_sql_config(cls) -> Dict[str, Any]:
@@ -236,6 +239,7 @@ class Config:
             "password": get_secret_directly("rate-hawk-password") if KEYVAULT_AVAILABLE else None,
             "base_url": get_secret_directly("rate-hawk-base-url") if KEYVAULT_AVAILABLE else "https://api.worldota.net/api/b2b/v3/search/serp/hotels/",
             "timeout": 30,
+            "streaming_parse": True,                # Decode SERP response incrementally, hotel by hotel
             "module": "app.services.providers.rate_hawk",
             "class": "RateHawkProvider",
             "required_credentials": ["auth_type", "username", "password"],
@@ -248,6 +252,24 @@ class Config:
             },
             "hotel_mapping": {
                 "hotel_id_column": "rate_hawk_hotel_id"     # Database column with hotel IDs
+            },
+            "result_cache": {
+                "ttl_seconds": 60,                  # How long search results are reused
+                "stale_while_revalidate_seconds": 60,  # Serve expired result while refreshing (0 = off)
+                "coalesce_requests": True           # Share one in-flight call between identical searches
+            },
+            "hedging": {
+                "enabled": False,                   # Send second request after p95 latency without response
+                "percentile": 95,
+                "min_samples": 20                   # Latency samples required before hedging starts
+            },
+            "connection_pool": {
+                "limit": 50,                        # Total connection pool size
+                "limit_per_host": 20,               # Max connections per host
+                "keepalive_timeout": 30,            # Seconds idle connections are kept alive
+                "ttl_dns_cache": 300,               # DNS cache TTL in seconds
+                "force_close": False,               # Close connection after each request (disables keep-alive)
+                "prewarm_connections": 2            # Keep-alive connections opened on startup (0 = off)
             }
         },
         "goglobal": {
@@ -269,6 +291,24 @@ class Config:
             },
             "hotel_mapping": {
                 "hotel_id_column": "goglobal_hotel_id"      # Database column with hotel IDs  
+            },
+            "result_cache": {
+                "ttl_seconds": 60,                  # How long search results are reused
+                "stale_while_revalidate_seconds": 30,  # Serve expired result while refreshing (0 = off)
+                "coalesce_requests": True           # Share one in-flight call between identical searches
+            },
+            "hedging": {
+                "enabled": False,                   # Send second request after p95 latency without response
+                "percentile": 95,
+                "min_samples": 20                   # Latency samples required before hedging starts
+            },
+            "connection_pool": {
+                "limit": 50,                        # Total connection pool size
+                "limit_per_host": 20,               # Max connections per host
+                "keepalive_timeout": 30,            # Seconds idle connections are kept alive
+                "ttl_dns_cache": 300,               # DNS cache TTL in seconds
+                "force_close": False,               # Close connection after each request (disables keep-alive)
+                "prewarm_connections": 2            # Keep-alive connections opened on startup (0 = off)
             }
         },
         "tbo": {
@@ -289,6 +329,24 @@ class Config:
             },
             "hotel_mapping": {
                 "hotel_id_column": "tbo_hotel_id"          # Database column with hotel IDs
+            },
+            "result_cache": {
+                "ttl_seconds": 60,                  # How long search results are reused
+                "stale_while_revalidate_seconds": 30,  # Serve expired result while refreshing (0 = off)
+                "coalesce_requests": True           # Share one in-flight call between identical searches
+            },
+            "hedging": {
+                "enabled": False,                   # Send second request after p95 latency without response
+                "percentile": 95,
+                "min_samples": 20                   # Latency samples required before hedging starts
+            },
+            "connection_pool": {
+                "limit": 50,                        # Total connection pool size
+                "limit_per_host": 20,               # Max connections per host
+                "keepalive_timeout": 30,            # Seconds idle connections are kept alive
+                "ttl_dns_cache": 300,               # DNS cache TTL in seconds
+                "force_close": False,               # Close connection after each request (disables keep-alive)
+                "prewarm_connections": 2            # Keep-alive connections opened on startup (0 = off)
             }
         }
     }
@@ -355,7 +413,21 @@ class Config:
     # Retry Settings
     MAX_RETRIES = 3
     RETRY_BASE_DELAY = 1.0
-    
+
+    # Search Result Cache Settings
+    SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "false").lower() == "true"
+    SEARCH_CACHE_DEFAULT_TTL = float(os.getenv("SEARCH_CACHE_DEFAULT_TTL", "60"))
+    SEARCH_CACHE_MAX_MEMORY_MB = int(os.getenv("SEARCH_CACHE_MAX_MEMORY_MB", "64"))
+
+    # Event Loop Settings
+    NORMALIZATION_WORKERS = int(os.getenv("NORMALIZATION_WORKERS", "4"))  # Shared executor for response normalization
+    DEBUG_LOOP_BLOCKING = os.getenv("DEBUG_LOOP_BLOCKING", "false").lower() == "true"
+    LOOP_BLOCKING_THRESHOLD_MS = float(os.getenv("LOOP_BLOCKING_THRESHOLD_MS", "100"))
+
+    # Hotel Mapping Cache Settings
+    HOTEL_MAPPING_CACHE_TTL = int(os.getenv("HOTEL_MAPPING_CACHE_TTL", "900"))  # Refresh in-memory mappings every 15 min
+    HOTEL_MAPPING_RETRY_INTERVAL = int(os.getenv("HOTEL_MAPPING_RETRY_INTERVAL", "60"))  # Min seconds between loads after a failed one
+
     @classmethod
     def _ensure_data_directory(cls) -> None:
         """Ensure the data directory exists for CSV files."""
@@ -393,6 +465,30 @@ class Config:
             return provider_config.get("hotel_mapping")
         return None
     
+    @classmethod
+    def get_result_cache_config(cls, provider_name: str) -> Optional[Dict[str, Any]]:
+        """Get search result cache configuration for specific provider"""
+        provider_config = cls.get_provider_config(provider_name)
+        if provider_config:
+            return provider_config.get("result_cache")
+        return None
+    
+    @classmethod
+    def get_hedging_config(cls, provider_name: str) -> Optional[Dict[str, Any]]:
+        """Get hedged request configuration for specific provider"""
+        provider_config = cls.get_provider_config(provider_name)
+        if provider_config:
+            return provider_config.get("hedging")
+        return None
+    
+    @classmethod
+    def get_connection_pool_config(cls, provider_name: str) -> Optional[Dict[str, Any]]:
+        """Get HTTP connection pool configuration for specific provider"""
+        provider_config = cls.get_provider_config(provider_name)
+        if provider_config:
+            return provider_config.get("connection_pool")
+        return None
+    
     @classmethod
     def is_azure_environment(cls) -> bool:
         """
@@ -6,14 +6,160 @@ import phonetics
 from typing import Dict, List, Tuple, Optional
 import warnings
 import os
+import time
 warnings.filterwarnings('ignore')
 
+class HotelCandidateIndex:
+    """
+    Character n-gram inverted index over API hotels' normalized_name,
+    blocked by country_iso (and optionally city).
+    
+    candidates() returns row positions of the top-K hotels by n-gram Dice
+    similarity plus every hotel whose brand can satisfy the brand rules for
+    the reference brand (those rules do not depend on the name). Positions
+    are in catalog order, so the matching rules see candidates in the same
+    order as a full scan.
+    """
+    
+    def __init__(self, api_hotels: pd.DataFrame, brands: List[str], block_by_city: bool = False, ngram: int = 3):
+        self.ngram = ngram
+        self.block_by_city = block_by_city
+        self._gram_ids = {}
+        
+        names = api_hotels['normalized_name'].fillna('').tolist()
+        self._doc_grams = [self._gram_id_array(name) for name in names]
+        
+        # Blocks: country_iso (or (country_iso, city_normalized)) -> row positions
+        countries = api_hotels['country_iso'].fillna('').tolist()
+        if block_by_city:
+            cities = api_hotels['city_normalized'].fillna('').tolist()
+            keys = list(zip(countries, cities))
+        else:
+            keys = countries
+        block_positions = {}
+        for position, key in enumerate(keys):
+            block_positions.setdefault(key, []).append(position)
+        self._country_positions = {}
+        for position, country in enumerate(countries):
+            self._country_positions.setdefault(country, []).append(position)
+        
+        self._blocks = {key: self._build_block(positions) for key, positions in block_positions.items()}
+        self._country_blocks = (
+            {country: self._build_block(positions) for country, positions in self._country_positions.items()}
+            if block_by_city else self._blocks
+        )
+        self._global_block = self._build_block(list(range(len(names))))
+        
+        # Brand rules: fuzz.ratio(ref_brand, api_brand) > 0.85 (name), ref_brand in / ~ chain (chain)
+        name_brands = api_hotels['brand_from_name'].tolist() if 'brand_from_name' in api_hotels else [None] * len(names)
+        chains = [str(chain).lower() for chain in api_hotels['clean_chain'].fillna('')] if 'clean_chain' in api_hotels else [''] * len(names)
+        self._name_brand_positions = {}
+        self._chain_brand_positions = {}
+        for brand in brands:
+            name_matches = {api_brand for api_brand in set(name_brands)
+                            if api_brand and fuzz.ratio(brand, api_brand) / 100.0 > 0.85}
+            chain_matches = {chain for chain in set(chains)
+                             if chain and (brand.lower() in chain or fuzz.ratio(brand, chain) / 100.0 > 0.80)}
+            self._name_brand_positions[brand] = np.array(
+                [position for position, api_brand in enumerate(name_brands) if api_brand in name_matches], dtype=np.int64)
+            self._chain_brand_positions[brand] = np.array(
+                [position for position, chain in enumerate(chains) if chain in chain_matches], dtype=np.int64)
+    
+    def _grams(self, name: str) -> set:
+        padded = f" {name} "
+        return {padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1)}
+    
+    def _gram_id_array(self, name: str) -> np.ndarray:
+        if not name:
+            return np.empty(0, dtype=np.int64)
+        return np.array([self._gram_ids.setdefault(gram, len(self._gram_ids)) for gram in self._grams(name)], dtype=np.int64)
+    
+    def _build_block(self, positions: List[int]) -> Dict:
+        """Postings of one block: gram id -> local indices, plus gram counts per hotel"""
+        postings = {}
+        for local_idx, position in enumerate(positions):
+            for gram_id in self._doc_grams[position]:
+                postings.setdefault(int(gram_id), []).append(local_idx)
+        return {
+            'positions': np.array(positions, dtype=np.int64),
+            'doc_lens': np.array([len(self._doc_grams[position]) for position in positions], dtype=np.float64),
+            'postings': {gram_id: np.array(local, dtype=np.int64) for gram_id, local in postings.items()},
+        }
+    
+    def _top_k(self, block: Dict, name: str, top_k: int) -> np.ndarray:
+        """
+        Positions of the top_k hotels of a block by n-gram Dice similarity, plus the
+        top_k by overlap coefficient (one name contained in the other, as caught by
+        partial_ratio / token_set_ratio). Ties by catalog order.
+        """
+        if not name:
+            return np.empty(0, dtype=np.int64)
+        query_grams = self._grams(name)
+        hits = [block['postings'][self._gram_ids[gram]] for gram in query_grams
+                if gram in self._gram_ids and self._gram_ids[gram] in block['postings']]
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+        shared = np.bincount(np.concatenate(hits), minlength=len(block['positions']))
+        local = np.flatnonzero(shared)
+        shared, doc_lens = shared[local], block['doc_lens'][local]
+        dice = 2.0 * shared / (len(query_grams) + doc_lens)
+        overlap = shared / np.minimum(len(query_grams), doc_lens)
+        best = np.concatenate([
+            local[np.argsort(-dice, kind='stable')[:top_k]],
+            local[np.argsort(-overlap, kind='stable')[:top_k]],
+        ])
+        return block['positions'][best]
+    
+    def candidates(self, name: str, country_iso: str = None, city: str = None, brand: Optional[str] = None,
+                   top_k: int = 50, chain_brands: bool = True) -> np.ndarray:
+        """
+        Candidate row positions for a reference hotel
+        
+        Args:
+            name: Reference normalized_name
+            country_iso: Block to search (None = whole catalog)
+            city: Reference city (with block_by_city; falls back to the country block when the city block is empty)
+            brand: Reference brand (adds hotels passing the brand rules)
+            top_k: Hotels kept by n-gram similarity
+            chain_brands: Also add hotels whose chain field matches the brand
+            
+        Returns:
+            Sorted row positions into the indexed api_hotels
+        """
+        if country_iso is None:
+            block = self._global_block
+        else:
+            block = self._blocks.get((country_iso, city) if self.block_by_city else country_iso)
+            if block is None and self.block_by_city:
+                block = self._country_blocks.get(country_iso)
+            if block is None:
+                return np.empty(0, dtype=np.int64)
+        
+        positions = [self._top_k(block, name, top_k)]
+        if brand and brand in self._name_brand_positions:
+            positions.append(self._name_brand_positions[brand])
+            if chain_brands:
+                positions.append(self._chain_brand_positions[brand])
+        candidates = np.unique(np.concatenate(positions))
+        if country_iso is not None and len(candidates):
+            # Brand hotels of the same country only
+            candidates = np.intersect1d(candidates, np.array(self._country_positions.get(country_iso, []), dtype=np.int64))
+        return candidates
+
 class ProductionHotelMatcher:
-    def __init__(self, api_source: str = 'universal'):
+    def __init__(self, api_source: str = 'universal', use_candidate_index: bool = True,
+                 candidate_top_k: int = 50, fallback_top_k: int = 500, block_by_city: bool = False):
         self.reference_hotels = None
         self.api_hotels = None
         self.api_source = api_source
         
+        # Candidate generation: HotelCandidateIndex (top-K per reference hotel) or full scan
+        self.use_candidate_index = use_candidate_index
+        self.candidate_top_k = candidate_top_k
+        self.fallback_top_k = fallback_top_k
+        self.block_by_city = block_by_city
+        self.candidate_index = None
+        
         # Multi-API support for Direct Matching Only
         self.api_hotels_dict = {}  # Store multiple APIs
         
@@ -754,6 +900,12 @@ class ProductionHotelMatcher:
         api_by_country = self.api_hotels.groupby('country_iso')
         total_hotels = len(self.reference_hotels)
         
+        if self.use_candidate_index:
+            index_start = time.perf_counter()
+            self.candidate_index = HotelCandidateIndex(self.api_hotels, self.universal_brands, block_by_city=self.block_by_city)
+            print(f" Candidate index built in {time.perf_counter() - index_start:.2f}s "
+                  f"(top {self.candidate_top_k} per country, {self.fallback_top_k} for name-only fallback)")
+        
         print(f" Processing {total_hotels} reference hotels against {len(self.api_hotels):,} {api_name} hotels")
         
         total_comparisons = 0
@@ -771,7 +923,13 @@ class ProductionHotelMatcher:
             
             # Strategy 1: Universal ISO-based matching
             if ref_iso and ref_iso in api_by_country.groups:
-                candidates = api_by_country.get_group(ref_iso)
+                if self.use_candidate_index:
+                    candidates = self.api_hotels.iloc[self.candidate_index.candidates(
+                        ref_hotel['normalized_name'], ref_iso, city=ref_hotel['city'],
+                        brand=ref_hotel['brand'], top_k=self.candidate_top_k
+                    )]
+                else:
+                    candidates = api_by_country.get_group(ref_iso)
                 
                 for _, api_hotel in candidates.iterrows():
                     total_comparisons += 1
@@ -809,7 +967,15 @@ class ProductionHotelMatcher:
             if not best_match or best_confidence < 0.75:
                 # Use top 3000 hotels by similarity for performance
                 name_similarities = []
-                for _, api_hotel in self.api_hotels.iterrows():
+                if self.use_candidate_index:
+                    # Chain field is not used by the name-only rules
+                    fallback_candidates = self.api_hotels.iloc[self.candidate_index.candidates(
+                        ref_hotel['normalized_name'], brand=ref_hotel['brand'],
+                        top_k=self.fallback_top_k, chain_brands=False
+                    )]
+                else:
+                    fallback_candidates = self.api_hotels
+                for _, api_hotel in fallback_candidates.iterrows():
                     if api_hotel['normalized_name']:
                         sim = fuzz.ratio(ref_hotel['normalized_name'], api_hotel['normalized_name']) / 100.0
                         if sim > 0.4:
@@ -4,23 +4,36 @@ Production-Ready Room Mapper
 A robust, performant, and maintainable room mapping system for data engineering pipelines.
 """
 
+import numpy as np
 import pandas as pd
 import yaml
 import re
 import logging
+import argparse
+import os
+import time
 from pathlib import Path
 from collections import defaultdict, deque
-from rapidfuzz import fuzz
-from typing import Dict, List, Optional, Tuple, Set, Any, Union
+from rapidfuzz import fuzz, process
+from typing import Dict, Iterator, List, Optional, Tuple, Set, Any, Union
 from functools import lru_cache
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import combinations
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import hashlib
 import threading
 from enum import Enum
 import csv
+import heapq
+import json
+import sqlite3
 from datetime import datetime
 
+try:
+    import pyarrow
+except ImportError:  # Parquet failure log is optional
+    pyarrow = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -60,6 +73,20 @@ class RoomData:
     ref_hotel_name: str
     row: Dict[str, Any]
 
+@dataclass
+class HotelMappingResult:
+    """Mapping result of one hotel in picklable form (returned by pool workers)"""
+    hotel_idx: int
+    groups: List[List[int]]  # Room indices per group, in component iteration order
+    node_indices: List[int]
+    failures: List[Tuple[int, int, ScoreResult]]  # Pairs below threshold
+    pair_count: int  # Pairs scored (generated by the blocking index)
+    all_pairs: int  # Theoretical all-pairs count
+    elapsed: float
+    error: Optional[str] = None
+    cached: bool = False  # Loaded unchanged from MappingResultStore
+    new_scores: List[Tuple[int, int, ScoreResult]] = field(default_factory=list)  # Pairs scored (not from PairScoreCache)
+
 class ConfigurationError(Exception):
     """Custom exception for configuration errors"""
     pass
@@ -69,29 +96,122 @@ class DataValidationError(Exception):
     pass
 
 class MappingFailureLogger:
-    """Logger dla niepowodzonych mapowań - zintegrowany z głównym procesem"""
+    """
+    Logger dla niepowodzonych mapowań - zintegrowany z głównym procesem
+    
+    Rekordy są buforowane w pamięci i zapisywane partiami po batch_size
+    (flush); analiza przyczyn i formatowanie liczone są dopiero przy zapisie.
+    Format 'parquet' zapisuje każdą partię jako osobny plik part-*.parquet w
+    katalogu output_file. top_k zachowuje tylko K najbliższych progu par
+    (najwyższy score) per hotel, dla hoteli logowanych kolejno.
+    """
+    
+    COLUMNS = [
+        'timestamp', 'hotel_name', 'provider1', 'provider2',
+        'room1_name', 'room2_name', 'room1_bedding', 'room2_bedding',
+        'room1_class', 'room2_class', 'room1_view', 'room2_view',
+        'room1_capacity', 'room2_capacity', 'main_name_score',
+        'bedding_penalty', 'final_score', 'threshold', 'failure_reason'
+    ]
+    SCORE_COLUMNS = ('main_name_score', 'bedding_penalty', 'final_score', 'threshold')
     
-    def __init__(self, output_file="production_mapping_failures.csv"):
+    def __init__(self, output_file="production_mapping_failures.csv", batch_size: int = 10000,
+                 output_format: str = 'csv', top_k: Optional[int] = None):
+        if output_format not in ('csv', 'parquet'):
+            raise ConfigurationError(f"Unsupported failure log format: {output_format}")
+        if output_format == 'parquet' and pyarrow is None:
+            raise ConfigurationError("Parquet failure log requires pyarrow")
+        if top_k is not None and top_k < 1:
+            raise ConfigurationError(f"Failure log top_k must be at least 1, got {top_k}")
+        
         self.output_file = Path(output_file)
+        self.batch_size = batch_size
+        self.output_format = output_format
+        self.top_k = top_k
+        
+        self._buffer = []  # (logged_at, room1, room2, score, threshold, provider1, provider2)
+        self._sequence = 0
+        self._hotel_key = None  # Hotel of the current top-K heap
+        self._hotel_heap = []  # (score, -sequence, record), K highest scores
+        self._parts_written = 0
         self._initialize_csv()
     
     def _initialize_csv(self):
-        """Inicjalizuje plik CSV z nagłówkami jeśli nie istnieje"""
+        """Inicjalizuje plik CSV z nagłówkami jeśli nie istnieje (katalog dla Parquet)"""
+        if self.output_format == 'parquet':
+            self.output_file.mkdir(parents=True, exist_ok=True)
+            return
+        
         if not self.output_file.exists():
             with open(self.output_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    'timestamp', 'hotel_name', 'provider1', 'provider2',
-                    'room1_name', 'room2_name', 'room1_bedding', 'room2_bedding',
-                    'room1_class', 'room2_class', 'room1_view', 'room2_view',
-                    'room1_capacity', 'room2_capacity', 'main_name_score',
-                    'bedding_penalty', 'final_score', 'threshold', 'failure_reason'
-                ])
+                writer.writerow(self.COLUMNS)
     
     def log_failure(self, room1, room2, score_result, threshold, provider1, provider2):
-        """Loguje przypadek niepowodzenia mapowania"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        """Loguje przypadek niepowodzenia mapowania (do bufora)"""
+        record = (time.time(), room1, room2, score_result.score, threshold, provider1, provider2)
+        self._sequence += 1
         
+        if self.top_k is None:
+            self._buffer.append(record)
+        else:
+            hotel_key = str(room1.get('ref_hotel_name', room1.get('hotel_name', 'unknown')))
+            if hotel_key != self._hotel_key:
+                self._close_hotel()
+                self._hotel_key = hotel_key
+            
+            entry = (score_result.score, -self._sequence, record)
+            if len(self._hotel_heap) < self.top_k:
+                heapq.heappush(self._hotel_heap, entry)
+            elif entry > self._hotel_heap[0]:
+                heapq.heapreplace(self._hotel_heap, entry)
+        
+        if len(self._buffer) >= self.batch_size:
+            self._write_batch()
+    
+    def flush(self):
+        """Zapisuje wszystkie zbuforowane rekordy (także bieżącego hotelu top-K)"""
+        self._close_hotel()
+        self._write_batch()
+    
+    def _close_hotel(self):
+        """Przenosi top-K bieżącego hotelu do bufora, w kolejności logowania"""
+        self._buffer.extend(record for _, _, record in sorted(self._hotel_heap, key=lambda entry: -entry[1]))
+        self._hotel_heap = []
+        self._hotel_key = None
+    
+    def _write_batch(self):
+        """Analiza i zapis zbuforowanych rekordów jedną operacją"""
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        
+        timestamps = {}
+        rows = []
+        for logged_at, room1, room2, final_score, threshold, provider1, provider2 in records:
+            second = int(logged_at)
+            if second not in timestamps:
+                timestamps[second] = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+            rows.append(self._failure_row(timestamps[second], room1, room2, final_score, threshold, provider1, provider2))
+        
+        if self.output_format == 'parquet':
+            df = pd.DataFrame(rows, columns=self.COLUMNS)
+            for column in self.COLUMNS:
+                if column not in self.SCORE_COLUMNS:
+                    df[column] = ['' if value is None else str(value) for value in df[column]]
+            part_file = self.output_file / f"part-{datetime.now().strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{self._parts_written:05d}.parquet"
+            df.to_parquet(part_file, index=False)
+        else:
+            score_positions = [self.COLUMNS.index(column) for column in self.SCORE_COLUMNS]
+            for row in rows:
+                for position in score_positions:
+                    row[position] = f"{row[position]:.3f}"
+            with open(self.output_file, 'a', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows(rows)
+        self._parts_written += 1
+    
+    def _failure_row(self, timestamp, room1, room2, final_score, threshold, provider1, provider2) -> List[Any]:
+        """Wiersz logu niepowodzenia (wyniki liczbowe jako float)"""
         # Podstawowe dane
         hotel_name = room1.get('ref_hotel_name', room1.get('hotel_name', 'unknown'))
         room1_name = room1.get('main_name', room1.get('room_name', ''))
@@ -108,24 +228,19 @@ class MappingFailureLogger:
         room2_capacity = room2.get('room_capacity', '')
         
         # Przybliżone obliczenie składników (nie mamy dostępu do szczegółów)
-        final_score = score_result.score
         main_name_score = final_score / 0.2 if final_score > 0 else 0  # Odwrotne oszacowanie
         bedding_penalty = 0.2 if room1_bedding != room2_bedding else 1.0
         
         # Analiza przyczyny
         failure_reason = self._analyze_failure_reason(room1, room2, final_score, threshold)
         
-        # Zapis do CSV
-        with open(self.output_file, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                timestamp, hotel_name, provider1, provider2,
-                room1_name, room2_name, room1_bedding, room2_bedding,
-                room1_class, room2_class, room1_view, room2_view,
-                room1_capacity, room2_capacity, f"{main_name_score:.3f}",
-                f"{bedding_penalty:.3f}", f"{final_score:.3f}", 
-                f"{threshold:.3f}", failure_reason
-            ])
+        return [
+            timestamp, hotel_name, provider1, provider2,
+            room1_name, room2_name, room1_bedding, room2_bedding,
+            room1_class, room2_class, room1_view, room2_view,
+            room1_capacity, room2_capacity, main_name_score,
+            bedding_penalty, final_score, threshold, failure_reason
+        ]
     
     def _analyze_failure_reason(self, room1, room2, final_score, threshold):
         """Analizuje główną przyczynę niepowodzenia"""
@@ -160,6 +275,176 @@ class MappingFailureLogger:
         
         return "; ".join(reasons) if reasons else f"Below threshold by {gap:.3f}"
 
+class MappingResultStore:
+    """SQLite store of per-hotel mapping results for incremental runs"""
+    
+    # Part of every fingerprint - bump when scoring or grouping changes results
+    SCHEMA_VERSION = 1
+    
+    def __init__(self, db_path: str = "room_mapping_store.sqlite"):
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hotel_mappings ("
+            "hotel_name TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+            "result TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @classmethod
+    def fingerprint(cls, hotel_rooms: List[RoomData], config_hash: str, failure_top_k: Optional[int] = None) -> str:
+        """
+        Fingerprint of a hotel's rooms per provider (rows in load order) and the configuration
+        
+        Args:
+            hotel_rooms: Rooms of the hotel, as grouped by map_all_rooms
+            config_hash: RoomMapperConfig.config_hash
+            failure_top_k: Failures kept per hotel (stored failures are trimmed to it)
+            
+        Returns:
+            SHA-256 hex digest
+        """
+        provider_rows = defaultdict(list)
+        for room in hotel_rooms:
+            provider_rows[room.provider].append(room.row)
+        
+        digest = hashlib.sha256(f"{cls.SCHEMA_VERSION}:{config_hash}:{failure_top_k}".encode())
+        for provider, rows in provider_rows.items():
+            rows_json = json.dumps(rows, sort_keys=True, default=repr)
+            digest.update(f"{provider}:{hashlib.sha256(rows_json.encode()).hexdigest()};".encode())
+        return digest.hexdigest()
+    
+    def get(self, hotel_name: str, fingerprint: str, hotel_idx: int) -> Optional[HotelMappingResult]:
+        """Stored result of the hotel if its fingerprint is unchanged (None otherwise)"""
+        row = self._conn.execute(
+            "SELECT fingerprint, result FROM hotel_mappings WHERE hotel_name = ?", (str(hotel_name),)
+        ).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        
+        try:
+            data = json.loads(row[1])
+            return HotelMappingResult(
+                hotel_idx=hotel_idx,
+                groups=data['groups'],
+                node_indices=data['node_indices'],
+                failures=[(i, j, ScoreResult(score, algorithms_used)) for i, j, score, algorithms_used in data['failures']],
+                pair_count=data['pair_count'],
+                all_pairs=data['all_pairs'],
+                elapsed=0.0,
+                cached=True
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable stored mapping for {hotel_name}: {e}")
+            return None
+    
+    def save(self, hotel_name: str, fingerprint: str, hotel_result: HotelMappingResult) -> None:
+        """Store (replace) the result of a hotel"""
+        result = json.dumps({
+            'groups': hotel_result.groups,
+            'node_indices': hotel_result.node_indices,
+            'failures': [[i, j, score_result.score, score_result.algorithms_used]
+                         for i, j, score_result in hotel_result.failures],
+            'pair_count': hotel_result.pair_count,
+            'all_pairs': hotel_result.all_pairs,
+        })
+        self._conn.execute(
+            "INSERT OR REPLACE INTO hotel_mappings (hotel_name, fingerprint, result, updated_at) VALUES (?, ?, ?, ?)",
+            (str(hotel_name), fingerprint, result, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+    
+    def prune(self, hotel_names: List[str]) -> int:
+        """Delete hotels not in hotel_names; returns the number of deleted hotels"""
+        keep = {str(hotel_name) for hotel_name in hotel_names}
+        stale = [(name,) for (name,) in self._conn.execute("SELECT hotel_name FROM hotel_mappings") if name not in keep]
+        self._conn.executemany("DELETE FROM hotel_mappings WHERE hotel_name = ?", stale)
+        return len(stale)
+    
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+class PairScoreCache:
+    """SQLite cache of room pair scores, keyed by room content hashes and RoomMapperConfig.scoring_hash"""
+    
+    # Bit order of ScoreResult.algorithms_used in the stored bitmask
+    ALGORITHMS = (
+        'capacity_check', 'bedrooms_count_check', 'room_class_check', 'room_view_check',
+        'balcony_check', 'family_room_check', 'bedding_config_penalty', 'room_area_penalty',
+        'room_keywords_bonus', 'main_name_fuzzy_match'
+    )
+    QUERY_CHUNK = 500  # Room hashes per IN (...) query
+    
+    def __init__(self, db_path: str = "room_pair_scores.sqlite"):
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pair_scores ("
+            "config_hash TEXT NOT NULL, room1 TEXT NOT NULL, room2 TEXT NOT NULL, "
+            "score REAL NOT NULL, algorithms INTEGER NOT NULL, "
+            "PRIMARY KEY (config_hash, room1, room2)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def room_hash(row: Dict[str, Any]) -> str:
+        """Content hash of a room row (scores depend only on the two rows and the configuration)"""
+        return hashlib.sha256(json.dumps(row, sort_keys=True, default=repr).encode()).hexdigest()[:32]
+    
+    def get_hotel_scores(self, config_hash: str, hotel_rooms: List[RoomData]) -> Dict[Tuple[int, int], ScoreResult]:
+        """
+        Cached scores of a hotel's room pairs
+        
+        Args:
+            config_hash: RoomMapperConfig.scoring_hash
+            hotel_rooms: Rooms of the hotel
+            
+        Returns:
+            Dict (i, j) -> ScoreResult for pairs i < j of hotel_rooms found in the cache
+        """
+        positions = defaultdict(list)
+        for idx, room in enumerate(hotel_rooms):
+            positions[self.room_hash(room.row)].append(idx)
+        
+        room_hashes = list(positions)
+        scores = {}
+        for start in range(0, len(room_hashes), self.QUERY_CHUNK):
+            chunk = room_hashes[start:start + self.QUERY_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT room1, room2, score, algorithms FROM pair_scores "
+                f"WHERE config_hash = ? AND room1 IN ({', '.join('?' * len(chunk))})",
+                [config_hash, *chunk]
+            )
+            for room1, room2, score, algorithms in rows:
+                if room2 not in positions:
+                    continue
+                result = ScoreResult(score, {name: bool(algorithms >> bit & 1) for bit, name in enumerate(self.ALGORITHMS)})
+                for i in positions[room1]:
+                    for j in positions[room2]:
+                        if i < j:
+                            scores[(i, j)] = result
+        return scores
+    
+    def put_hotel_scores(self, config_hash: str, hotel_rooms: List[RoomData],
+                         scores: List[Tuple[int, int, ScoreResult]]) -> None:
+        """Store scores of a hotel's room pairs (i, j) -> ScoreResult"""
+        room_hashes = {}
+        rows = []
+        for i, j, result in scores:
+            for idx in (i, j):
+                if idx not in room_hashes:
+                    room_hashes[idx] = self.room_hash(hotel_rooms[idx].row)
+            algorithms = sum(1 << bit for bit, name in enumerate(self.ALGORITHMS) if result.algorithms_used.get(name))
+            rows.append((config_hash, room_hashes[i], room_hashes[j], result.score, algorithms))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO pair_scores (config_hash, room1, room2, score, algorithms) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+    
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
 class RoomMapperConfig:
     """Handles configuration loading and validation"""
     
@@ -208,6 +493,16 @@ class RoomMapperConfig:
         """Get configuration hash for caching"""
         return self._config_hash
     
+    @property
+    def scoring_hash(self) -> str:
+        """Configuration hash without settings that do not change pair scores (file paths, similarity threshold)"""
+        config = json.loads(json.dumps(self._config, default=str))
+        mapping_config = config.get('room_mapping_config', {})
+        for key in ('raw_input_files', 'input_files', 'output_files'):
+            mapping_config.pop(key, None)
+        mapping_config.get('fuzzy_matching', {}).get('thresholds', {}).pop('similarity_threshold', None)
+        return hashlib.md5(yaml.dump(config, sort_keys=True).encode()).hexdigest()
+    
     def get_input_files(self) -> Dict[str, str]:
         """Get input files configuration"""
         return self._config['room_mapping_config']['input_files']
@@ -454,6 +749,56 @@ class RoomScorer:
         
         return 1.0  # No bonus
     
+    def blocking_key(self, row: Dict[str, Any]) -> Tuple:
+        """
+        Values of the enabled veto attributes of a room (None where the veto does not apply)
+        
+        Two rooms can pass all enabled vetoes of score_room only if their keys are
+        equal wherever both have a value - the same conversions as score_capacity,
+        score_bedrooms_count, score_room_class, score_room_view, score_balcony
+        and score_family_room.
+        """
+        flags = self.algorithm_flags
+        key = []
+        if flags.capacity_check:
+            key.append(self._veto_count(row, 'room_capacity'))
+        if flags.bedrooms_count_check:
+            key.append(self._veto_count(row, 'bedrooms_count'))
+        if flags.room_class_check:
+            key.append(self._veto_text(row, 'room_class'))
+        if flags.room_view_check:
+            key.append(self._veto_text(row, 'room_view'))
+        if flags.balcony_check:
+            key.append(self._veto_value(row, 'balcony'))
+        if flags.family_room_check:
+            key.append(self._veto_value(row, 'family_room'))
+        return tuple(key)
+    
+    @staticmethod
+    def _veto_count(row: Dict[str, Any], field: str) -> Optional[int]:
+        """Count as compared by capacity/bedrooms vetoes (None for missing, invalid or 0)"""
+        try:
+            value = int(row.get(field, 0) or 0)
+        except (ValueError, TypeError):
+            return None
+        return value or None
+    
+    def _veto_text(self, row: Dict[str, Any], field: str) -> Optional[str]:
+        """Normalized text as compared by room class/view vetoes (None for missing)"""
+        value = row.get(field)
+        if pd.isna(value):
+            return None
+        try:
+            return self.normalizer.normalize_text(value)
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _veto_value(row: Dict[str, Any], field: str) -> Any:
+        """Raw value as compared by balcony/family room vetoes (None for missing)"""
+        value = row.get(field)
+        return None if pd.isna(value) else value
+    
     def score_main_name_fuzzy(self, row1: Dict[str, Any], row2: Dict[str, Any], debug: bool = False) -> float:
         """Score main name using advanced multi-level fuzzy matching"""
         try:
@@ -527,13 +872,96 @@ class RoomScorer:
             logger.info(f"  Wynik bez bonusu: {best_score:.3f}")
         return best_score
     
-    def score_room(self, row1: Dict[str, Any], row2: Dict[str, Any]) -> ScoreResult:
+    def normalize_main_name(self, row: Dict[str, Any]) -> str:
+        """Normalized main name as compared by score_main_name_fuzzy ('' if it cannot be normalized)"""
+        try:
+            return self.normalizer.normalize_text(row.get('main_name', ''))
+        except Exception as e:
+            logger.debug(f"Main name fuzzy scoring error: {e}")
+            return ''
+    
+    def score_main_name_fuzzy_matrix(self, names1: List[str], names2: List[str], workers: int = 1) -> np.ndarray:
+        """
+        score_main_name_fuzzy for every pair of normalized main names (bit-identical)
+        
+        The four fuzzy matrices are computed once per distinct name with
+        rapidfuzz.process.cdist; weighted best, thresholds and bonuses are
+        applied as array operations in the same order as the scalar path.
+        
+        Args:
+            names1: Normalized main names (rows), see normalize_main_name
+            names2: Normalized main names (columns)
+            workers: cdist threads (-1 = all cores)
+            
+        Returns:
+            Float64 matrix of shape (len(names1), len(names2))
+        """
+        unique1 = list(dict.fromkeys(names1))
+        unique2 = list(dict.fromkeys(names2))
+        
+        # Algorytmy i wagi jak w score_main_name_fuzzy (kolejność rozstrzyga remisy)
+        algorithms = [
+            (fuzz.token_sort_ratio, 0.8),
+            (fuzz.token_set_ratio, 0.75),
+            (fuzz.partial_ratio, 0.6),
+            (fuzz.ratio, 0.5),
+        ]
+        scores = np.stack([
+            process.cdist(unique1, unique2, scorer=scorer, dtype=np.float64, workers=workers) / 100.0
+            for scorer, _ in algorithms
+        ])
+        weights = np.array([weight for _, weight in algorithms]).reshape(-1, 1, 1)
+        best_index = np.argmax(scores * weights, axis=0)
+        best_score = np.take_along_axis(scores, best_index[np.newaxis], axis=0)[0]
+        
+        # Progowanie i bonusy
+        final_score = np.where(
+            best_score < self.MAIN_NAME_SIMILARITY_THRESHOLD,
+            best_score * self.MAIN_NAME_LOW_SIMILARITY_PENALTY,
+            np.where(
+                best_score >= 0.95,
+                np.minimum(best_score * self.MAIN_NAME_HIGH_SIMILARITY_BONUS, self.MAIN_NAME_PERFECT_BONUS),
+                np.where(best_score >= 0.85, best_score * self.MAIN_NAME_GOOD_SIMILARITY_BONUS, best_score)
+            )
+        )
+        
+        # Perfect match, word order match i puste nazwy
+        name_ids = {name: idx for idx, name in enumerate(dict.fromkeys(unique1 + unique2))}
+        word_sets = [frozenset(name.split()) for name in name_ids]
+        word_set_ids = {word_set: idx for idx, word_set in enumerate(dict.fromkeys(word_sets))}
+        
+        def name_arrays(names):
+            ids = np.array([name_ids[name] for name in names])
+            word_ids = np.array([word_set_ids[word_sets[name_ids[name]]] for name in names])
+            multi_word = np.array([len(word_sets[name_ids[name]]) > 1 for name in names])
+            empty = np.array([not name for name in names])
+            return ids, word_ids, multi_word, empty
+        
+        ids1, word_ids1, multi_word1, empty1 = name_arrays(unique1)
+        ids2, word_ids2, _, empty2 = name_arrays(unique2)
+        perfect = ids1[:, np.newaxis] == ids2[np.newaxis, :]
+        word_order = (word_ids1[:, np.newaxis] == word_ids2[np.newaxis, :]) & multi_word1[:, np.newaxis]
+        empty = empty1[:, np.newaxis] | empty2[np.newaxis, :]
+        
+        final_score = np.where(word_order, self.MAIN_NAME_WORD_ORDER_BONUS, final_score)
+        final_score = np.where(perfect, self.MAIN_NAME_PERFECT_BONUS, final_score)
+        final_score = np.where(empty, 0.0, final_score)
+        
+        # Rozwinięcie z unikalnych nazw do wszystkich par
+        positions1 = {name: idx for idx, name in enumerate(unique1)}
+        positions2 = {name: idx for idx, name in enumerate(unique2)}
+        return final_score[np.ix_([positions1[name] for name in names1], [positions2[name] for name in names2])]
+    
+    def score_room(self, row1: Dict[str, Any], row2: Dict[str, Any],
+                   main_name_score: Optional[float] = None) -> ScoreResult:
         """
         Score two rooms using configured algorithms
         
         Args:
             row1: First room data
             row2: Second room data
+            main_name_score: Precomputed score_main_name_fuzzy(row1, row2), e.g. from
+                             score_main_name_fuzzy_matrix (computed here if None)
             
         Returns:
             ScoreResult containing final score and algorithms used
@@ -595,7 +1023,9 @@ class RoomScorer:
         if not self.algorithm_flags.main_name_fuzzy_match:
             return ScoreResult(0.0, algorithms_used)
         
-        base_score = self.score_main_name_fuzzy(row1, row2)
+        if main_name_score is None:
+            main_name_score = self.score_main_name_fuzzy(row1, row2)
+        base_score = main_name_score
         algorithms_used['main_name_fuzzy_match'] = True
         
         final_score = base_score * penalty_multiplier * bonus_multiplier
@@ -605,28 +1035,39 @@ class RoomScorer:
 class RoomMapper:
     """Main class for room mapping operations"""
     
-    def __init__(self, config_path: str, log_failures: bool = True):
-        self.config = RoomMapperConfig(config_path)
+    def __init__(self, config_path: str, log_failures: bool = True, config: Optional[RoomMapperConfig] = None,
+                 batch_scoring: bool = True, failure_log_format: str = 'csv', failure_top_k: Optional[int] = None):
+        self.config = config or RoomMapperConfig(config_path)
         self.normalizer = TextNormalizer(self.config)
         self.scorer = RoomScorer(self.config, self.normalizer)
         
         # Performance settings
         self.LARGE_HOTEL_THRESHOLD = 20
         self.MAX_WORKERS = 4
+        self.CHUNK_PAIRS = 20000  # Estimated room pairs per process pool task
+        self.BATCH_SCORING = batch_scoring  # Main name fuzzy scores as cdist matrices per provider pair
+        self.FUZZY_WORKERS = -1  # cdist threads (-1 = all cores)
+        self.BATCH_MIN_PAIRS = 50  # Smaller provider pairs are scored one by one (matrix setup costs more)
+        self.BATCH_MAX_CELLS_PER_PAIR = 1.5  # Sparser provider pairs too (distinct name cells per scored pair)
         
         # Failure logging
+        if failure_top_k is not None and failure_top_k < 1:
+            raise ConfigurationError(f"failure_top_k must be at least 1, got {failure_top_k}")
         self.log_failures = log_failures
+        self.failure_top_k = failure_top_k  # Failures kept per hotel (None = all)
         if log_failures:
-            self.failure_logger = MappingFailureLogger("production_mapping_failures.csv")
-            logger.info("Mapping failure logging enabled - output: production_mapping_failures.csv")
+            self.failure_logger = MappingFailureLogger(f"production_mapping_failures.{failure_log_format}",
+                                                       output_format=failure_log_format, top_k=failure_top_k)
+            logger.info(f"Mapping failure logging enabled - output: {self.failure_logger.output_file}"
+                        + (f" (top {failure_top_k} near misses per hotel)" if failure_top_k else ""))
     
     def _validate_room_data(self, room_data: RoomData) -> bool:
         """Validate room data structure"""
         required_fields = ['main_name']
         
-        for field in required_fields:
-            if field not in room_data.row or not room_data.row[field]:
-                logger.warning(f"Missing required field '{field}' in room data")
+        for field_name in required_fields:
+            if field_name not in room_data.row or not room_data.row[field_name]:
+                logger.warning(f"Missing required field '{field_name}' in room data")
                 return False
         
         return True
@@ -634,38 +1075,99 @@ class RoomMapper:
     def _prefilter_rooms(self, hotel_rooms: List[RoomData]) -> List[Tuple[int, int]]:
         """
         Pre-filter room pairs to reduce O(n²) complexity
-        Only compare rooms that might potentially match
-        """
-        room_count = len(hotel_rooms)
-        pairs = []
         
-        # Group rooms by capacity for faster filtering
-        capacity_groups = defaultdict(list)
+        Blocking index: rooms are grouped by their veto attributes
+        (RoomScorer.blocking_key, honouring AlgorithmFlags) and only
+        cross-provider pairs of compatible groups - pairs that can pass all
+        enabled vetoes - are generated. Pairs are returned in (i, j) order.
+        """
+        blocks = defaultdict(list)
         for i, room in enumerate(hotel_rooms):
-            try:
-                capacity = int(room.row.get('room_capacity', 0) or 0)
-                capacity_groups[capacity].append(i)
-            except (ValueError, TypeError):
-                capacity_groups[0].append(i)  # Unknown capacity group
-        
-        # Generate pairs within and across capacity groups
-        for i in range(room_count):
-            for j in range(i + 1, room_count):
-                # Skip same provider
-                if hotel_rooms[i].provider == hotel_rooms[j].provider:
+            blocks[self.scorer.blocking_key(room.row)].append(i)
+        
+        keys = list(blocks)
+        pairs = []
+        for key_idx, key1 in enumerate(keys):
+            rooms1 = blocks[key1]
+            # Pairs inside one block
+            for position, i in enumerate(rooms1):
+                for j in rooms1[position + 1:]:
+                    if hotel_rooms[i].provider != hotel_rooms[j].provider:
+                        pairs.append((i, j))
+            
+            # Pairs across compatible blocks (values equal wherever both are known)
+            for key2 in keys[key_idx + 1:]:
+                if any(value1 is not None and value2 is not None and value1 != value2
+                       for value1, value2 in zip(key1, key2)):
                     continue
-                
-                pairs.append((i, j))
+                for i in rooms1:
+                    for j in blocks[key2]:
+                        if hotel_rooms[i].provider != hotel_rooms[j].provider:
+                            pairs.append((i, j) if i < j else (j, i))
         
+        pairs.sort()
         return pairs
     
-    def map_rooms_for_hotel(self, hotel_rooms: List[RoomData], threshold: float) -> Tuple[List[Set[int]], Dict[int, RoomData]]:
+    def _score_main_names(self, nodes: Dict[int, RoomData], pairs: List[Tuple[int, int]]) -> Dict[Tuple[int, int], float]:
+        """
+        score_main_name_fuzzy of room pairs, one cdist matrix per (provider_i, provider_j)
+        
+        Main names are normalized once per room. Pairs keep their (i, j)
+        argument order, so scores are bit-identical to the scalar path.
+        Provider pairs with fewer than BATCH_MIN_PAIRS pairs, or whose distinct
+        name matrix has more than BATCH_MAX_CELLS_PER_PAIR cells per pair, are
+        left out (score_room scores them one by one).
+        """
+        names = {}
+        provider_pairs = defaultdict(list)
+        for i, j in pairs:
+            provider_pairs[(nodes[i].provider, nodes[j].provider)].append((i, j))
+            for room_idx in (i, j):
+                if room_idx not in names:
+                    names[room_idx] = self.scorer.normalize_main_name(nodes[room_idx].row)
+        
+        scores = {}
+        for provider_pair_list in provider_pairs.values():
+            if len(provider_pair_list) < self.BATCH_MIN_PAIRS:
+                continue
+            rows = list(dict.fromkeys(i for i, _ in provider_pair_list))
+            columns = list(dict.fromkeys(j for _, j in provider_pair_list))
+            cells = len({names[i] for i in rows}) * len({names[j] for j in columns})
+            if cells > self.BATCH_MAX_CELLS_PER_PAIR * len(provider_pair_list):
+                continue
+            matrix = self.scorer.score_main_name_fuzzy_matrix(
+                [names[i] for i in rows], [names[j] for j in columns], workers=self.FUZZY_WORKERS
+            ).tolist()
+            row_positions = {i: position for position, i in enumerate(rows)}
+            column_positions = {j: position for position, j in enumerate(columns)}
+            for i, j in provider_pair_list:
+                scores[(i, j)] = matrix[row_positions[i]][column_positions[j]]
+        return scores
+    
+    @staticmethod
+    def _estimate_pair_count(hotel_rooms: List[RoomData]) -> int:
+        """Cross-provider room pairs of a hotel (pairs scored by map_rooms_for_hotel)"""
+        provider_counts = defaultdict(int)
+        for room in hotel_rooms:
+            provider_counts[room.provider] += 1
+        room_count = len(hotel_rooms)
+        return room_count * (room_count - 1) // 2 - sum(count * (count - 1) // 2 for count in provider_counts.values())
+    
+    def map_rooms_for_hotel(self, hotel_rooms: List[RoomData], threshold: float,
+                            failures: Optional[List[Tuple[int, int, ScoreResult]]] = None,
+                            pair_stats: Optional[Dict[str, int]] = None,
+                            pair_scores: Optional[Dict[Tuple[int, int], ScoreResult]] = None) -> Tuple[List[Set[int]], Dict[int, RoomData]]:
         """
         Map rooms for a single hotel using graph-based clustering
         
         Args:
             hotel_rooms: List of room data for the hotel
             threshold: Similarity threshold for matching
+            failures: If given, pairs below threshold are collected here as (i, j, result)
+                      instead of being written by the failure logger
+            pair_stats: If given, filled with 'pairs' (scored) and 'all_pairs' counts
+            pair_scores: Known scores by pair (e.g. from PairScoreCache); pairs found here
+                         are not scored again, newly scored pairs are added
             
         Returns:
             Tuple of (groups, nodes) where groups are sets of matched room indices
@@ -691,18 +1193,42 @@ class RoomMapper:
         nodes = {i: room for i, room in valid_rooms}
         edges = defaultdict(set)
         
-        # Pre-filter pairs to reduce comparisons
-        pairs = self._prefilter_rooms([room for _, room in valid_rooms])
+        # Pre-filter pairs to reduce comparisons. Vetoed pairs score 0.0, so they
+        # are only skipped when they cannot reach the threshold
+        all_pairs = room_count * (room_count - 1) // 2
+        if threshold > 0:
+            pairs = self._prefilter_rooms([room for _, room in valid_rooms])
+        else:
+            pairs = [(i, j) for i, j in combinations(range(len(valid_rooms)), 2)
+                     if valid_rooms[i][1].provider != valid_rooms[j][1].provider]
+        if pair_stats is not None:
+            pair_stats.update(pairs=len(pairs), all_pairs=all_pairs)
+        
+        logger.debug(f"Comparing {len(pairs)} room pairs (reduced from {all_pairs})")
         
-        logger.debug(f"Comparing {len(pairs)} room pairs (reduced from {room_count * (room_count - 1) // 2})")
+        known_scores = pair_scores if pair_scores is not None else {}
+        
+        # Main name fuzzy scores for all pairs at once
+        main_name_scores = {}
+        if self.BATCH_SCORING and pairs and self.scorer.algorithm_flags.main_name_fuzzy_match:
+            try:
+                main_name_scores = self._score_main_names(nodes, [pair for pair in pairs if pair not in known_scores])
+            except Exception as e:
+                logger.warning(f"Batch main name scoring failed, scoring pairs one by one: {e}")
         
         # Score room pairs
         for i, j in pairs:
             try:
-                result = self.scorer.score_room(nodes[i].row, nodes[j].row)
+                result = known_scores.get((i, j))
+                if result is None:
+                    result = self.scorer.score_room(nodes[i].row, nodes[j].row, main_name_scores.get((i, j)))
+                    if pair_scores is not None:
+                        pair_scores[(i, j)] = result
                 if result.score >= threshold:
                     edges[i].add(j)
                     edges[j].add(i)
+                elif failures is not None:
+                    failures.append((i, j, result))
                 else:
                     # Log mapping failure dla przypadków poniżej threshold
                     if self.log_failures:
@@ -816,10 +1342,23 @@ class RoomMapper:
         
         return df[final_columns]
     
-    def map_all_rooms(self) -> pd.DataFrame:
+    def map_all_rooms(self, workers: int = 1, chunk_pairs: Optional[int] = None,
+                      store_path: Optional[str] = None, score_cache_path: Optional[str] = None) -> pd.DataFrame:
         """
         Main method to map all rooms across providers
         
+        Args:
+            workers: Worker processes scoring hotels in parallel (1 = serial);
+                     output and failure log are identical to the serial run. Failures
+                     of each hotel are logged (and dropped) as soon as all earlier
+                     hotels are done, so only out-of-order hotels hold them
+            chunk_pairs: Estimated room pairs per pool task (default: CHUNK_PAIRS)
+            store_path: Incremental mode - SQLite MappingResultStore with the previous
+                        per-hotel results; only hotels whose fingerprint changed are
+                        recomputed, output and failure log are identical to a full run
+            score_cache_path: SQLite PairScoreCache - pair scores are reused across runs
+                              and thresholds, newly scored pairs are added
+        
         Returns:
             DataFrame with mapping results
         """
@@ -844,16 +1383,102 @@ class RoomMapper:
         results = []
         used_rooms = set()
         
+        # Incremental mode: reuse stored results of unchanged hotels
+        store = MappingResultStore(store_path) if store_path else None
+        hotel_results = {}
+        fingerprints = {}
+        # Stored results must be complete for any later run, so failures are collected
+        # whenever a store is used, even if this run does not log them
+        collect_failures = self.log_failures or store is not None
+        if store is not None:
+            for hotel_idx, (hotel_name, hotel_rooms) in enumerate(hotels.items(), 1):
+                fingerprints[hotel_idx] = store.fingerprint(hotel_rooms, self.config.config_hash, self.failure_top_k)
+                stored_result = store.get(hotel_name, fingerprints[hotel_idx], hotel_idx)
+                if stored_result is not None:
+                    hotel_results[hotel_idx] = stored_result
+            logger.info(f"Incremental mapping ({store_path}): {len(hotel_results)} hotels unchanged (skipped), "
+                        f"{len(hotels) - len(hotel_results)} recomputed")
+        
+        # Score hotels (serially or in worker processes), then merge in hotel order
+        hotel_items = [
+            (hotel_idx, hotel_rooms) for hotel_idx, hotel_rooms in enumerate(hotels.values(), 1)
+            if hotel_idx not in hotel_results
+        ]
+        score_cache = PairScoreCache(score_cache_path) if score_cache_path else None
+        cached_scores = None
+        if score_cache is not None:
+            scoring_hash = self.config.scoring_hash
+            cached_scores = {
+                hotel_idx: score_cache.get_hotel_scores(scoring_hash, hotel_rooms)
+                for hotel_idx, hotel_rooms in hotel_items
+            }
+        
+        if workers > 1 and len(hotel_items) > 1:
+            mapped_hotels = self._map_hotels_parallel(hotel_items, threshold, workers, chunk_pairs or self.CHUNK_PAIRS,
+                                                      cached_scores, collect_failures)
+        else:
+            mapped_hotels = (
+                self._map_hotel(hotel_idx, hotel_rooms, threshold, collect_failures,
+                                cached_scores[hotel_idx] if cached_scores is not None else None)
+                for hotel_idx, hotel_rooms in hotel_items
+            )
+        
+        # Store and log failures of each hotel as results arrive, in hotel order
+        hotel_names = list(hotels.keys())
+        hotel_room_lists = list(hotels.values())
+        next_hotel_idx = 1
+        
+        def finish_ready_hotels():
+            nonlocal next_hotel_idx
+            while next_hotel_idx in hotel_results:
+                self._finish_hotel_failures(hotel_results[next_hotel_idx], hotel_room_lists[next_hotel_idx - 1],
+                                            threshold, store, hotel_names[next_hotel_idx - 1],
+                                            fingerprints.get(next_hotel_idx))
+                next_hotel_idx += 1
+        
+        try:
+            for hotel_result in mapped_hotels:
+                hotel_results[hotel_result.hotel_idx] = hotel_result
+                finish_ready_hotels()
+            finish_ready_hotels()  # Unchanged (stored) hotels after the last recomputed one
+            
+            if store is not None:
+                pruned = store.prune(hotel_names)
+                if pruned:
+                    logger.info(f"Removed {pruned} hotels no longer in the input from {store_path}")
+        finally:
+            if store is not None:
+                store.close()
+        
+        if score_cache is not None:
+            try:
+                for hotel_idx, hotel_rooms in hotel_items:
+                    score_cache.put_hotel_scores(scoring_hash, hotel_rooms, hotel_results[hotel_idx].new_scores)
+            finally:
+                score_cache.close()
+            scored = sum(len(hotel_results[hotel_idx].new_scores) for hotel_idx, _ in hotel_items)
+            reused = sum(hotel_results[hotel_idx].pair_count for hotel_idx, _ in hotel_items) - scored
+            logger.info(f"Pair score cache ({score_cache_path}): {reused} pair scores reused, {scored} scored")
+        
         # Process each hotel
         for hotel_idx, (hotel_name, hotel_rooms) in enumerate(hotels.items(), 1):
+            hotel_result = hotel_results[hotel_idx]
+            timing = f"{hotel_name} ({len(hotel_rooms)} rooms, {hotel_result.pair_count}/{hotel_result.all_pairs} pairs) " + (
+                "unchanged" if hotel_result.cached else f"in {hotel_result.elapsed:.3f}s")
             if hotel_idx % 10 == 0 or hotel_idx <= 5:
-                logger.info(f"Processing hotel {hotel_idx}/{len(hotels)}: {hotel_name} ({len(hotel_rooms)} rooms)")
+                logger.info(f"Processed hotel {hotel_idx}/{len(hotels)}: {timing}")
+            else:
+                logger.debug(f"Processed hotel {hotel_idx}/{len(hotels)}: {timing}")
+            
+            if hotel_result.error is not None:
+                logger.error(f"Error processing hotel {hotel_name}: {hotel_result.error}")
+                continue
             
             try:
-                groups, nodes = self.map_rooms_for_hotel(hotel_rooms, threshold)
+                nodes = {i: hotel_rooms[i] for i in hotel_result.node_indices}
                 
                 # Process each group
-                for group in groups:
+                for group in hotel_result.groups:
                     providers = set(nodes[i].provider for i in group)
                     
                     # Create result row
@@ -883,10 +1508,10 @@ class RoomMapper:
                             used_rooms.add(room_key)
                         else:
                             # Empty columns for providers not in this group
-                            for field in ['reference_id', 'main_name', 'room_name', 'capacity', 'bedrooms_count',
+                            for field_name in ['reference_id', 'main_name', 'room_name', 'capacity', 'bedrooms_count',
                                         'room_class', 'room_view', 'bedding_config', 'room_area_m2',
                                         'room_keywords', 'balcony', 'family_room']:
-                                row[f'{provider}_{field}'] = ''
+                                row[f'{provider}_{field_name}'] = ''
                     
                     # Add group metadata
                     row['providers_in_group'] = ','.join(sorted(providers))
@@ -899,6 +1524,20 @@ class RoomMapper:
                 logger.error(f"Error processing hotel {hotel_name}: {e}")
                 continue
         
+        scored_pairs = sum(hotel_result.pair_count for hotel_result in hotel_results.values())
+        all_pairs = sum(hotel_result.all_pairs for hotel_result in hotel_results.values())
+        logger.info(f"Blocking index: {scored_pairs} of {all_pairs} room pairs scored "
+                    f"({scored_pairs / all_pairs:.1%})" if all_pairs else "Blocking index: no room pairs")
+        
+        slowest = sorted(hotel_results.values(), key=lambda hotel_result: hotel_result.elapsed, reverse=True)[:5]
+        hotel_names = list(hotels.keys())
+        logger.info(f"Hotel scoring time: {sum(hotel_result.elapsed for hotel_result in hotel_results.values()):.2f}s "
+                    f"(workers: {workers}); slowest: " +
+                    ", ".join(f"{hotel_names[hotel_result.hotel_idx - 1]} {hotel_result.elapsed:.3f}s" for hotel_result in slowest))
+        
+        if self.log_failures:
+            self.failure_logger.flush()
+        
         # Add unmapped rooms
         logger.info("Adding unmapped rooms...")
         for room in all_rooms:
@@ -923,10 +1562,10 @@ class RoomMapper:
                         row[f'{provider}_family_room'] = room.row.get('family_room', '')
                         row[f'{provider}_reference_id'] = room.row.get('reference_id', '')
                     else:
-                        for field in ['main_name', 'room_name', 'capacity', 'bedrooms_count',
+                        for field_name in ['main_name', 'room_name', 'capacity', 'bedrooms_count',
                                     'room_class', 'room_view', 'bedding_config', 'room_area_m2',
                                     'room_keywords', 'balcony', 'family_room', 'reference_id']:
-                            row[f'{provider}_{field}'] = ''
+                            row[f'{provider}_{field_name}'] = ''
                 
                 row['providers_in_group'] = room.provider
                 row['group_size'] = 1
@@ -949,6 +1588,106 @@ class RoomMapper:
         
         return df_output
     
+    def _map_hotel(self, hotel_idx: int, hotel_rooms: List[RoomData], threshold: float,
+                   collect_failures: bool,
+                   pair_scores: Optional[Dict[Tuple[int, int], ScoreResult]] = None) -> HotelMappingResult:
+        """Map one hotel (in this process or a pool worker) and time it"""
+        failures = [] if collect_failures else None
+        pair_stats = {}
+        cached_pairs = set(pair_scores) if pair_scores is not None else set()
+        start = time.perf_counter()
+        try:
+            groups, nodes = self.map_rooms_for_hotel(hotel_rooms, threshold, failures=failures,
+                                                     pair_stats=pair_stats, pair_scores=pair_scores)
+            error = None
+        except Exception as e:
+            groups, nodes, error = [], {}, str(e)
+        new_scores = [
+            (i, j, result) for (i, j), result in pair_scores.items() if (i, j) not in cached_pairs
+        ] if pair_scores is not None else []
+        
+        return HotelMappingResult(
+            hotel_idx=hotel_idx,
+            groups=[list(group) for group in groups],
+            node_indices=list(nodes),
+            failures=_top_failures(failures, self.failure_top_k) if failures else [],
+            pair_count=pair_stats.get('pairs', 0),
+            all_pairs=pair_stats.get('all_pairs', len(hotel_rooms) * (len(hotel_rooms) - 1) // 2),
+            elapsed=time.perf_counter() - start,
+            error=error,
+            new_scores=new_scores
+        )
+    
+    def _map_hotels_parallel(self, hotel_items: List[Tuple[int, List[RoomData]]], threshold: float,
+                             workers: int, chunk_pairs: int,
+                             cached_scores: Optional[Dict[int, Dict[Tuple[int, int], ScoreResult]]] = None,
+                             collect_failures: bool = True) -> Iterator[HotelMappingResult]:
+        """
+        Map hotels on a process pool
+        
+        Consecutive hotels are batched up to chunk_pairs estimated room pairs
+        (a larger hotel is a batch of its own) and the largest batches are
+        submitted first, so big hotels do not straggle at the end.
+        cached_scores (hotel_idx -> known pair scores) are sent along with the hotels;
+        collect_failures makes workers return below-threshold pairs.
+        
+        Yields:
+            HotelMappingResult per hotel, in completion order
+        """
+        batches = []
+        batch, batch_pairs = [], 0
+        for hotel_idx, hotel_rooms in hotel_items:
+            pair_count = self._estimate_pair_count(hotel_rooms)
+            if batch and batch_pairs + pair_count > chunk_pairs:
+                batches.append((batch_pairs, batch))
+                batch, batch_pairs = [], 0
+            batch.append((hotel_idx, hotel_rooms, cached_scores.get(hotel_idx) if cached_scores is not None else None))
+            batch_pairs += pair_count
+        if batch:
+            batches.append((batch_pairs, batch))
+        batches.sort(key=lambda item: item[0], reverse=True)
+        
+        logger.info(f"Mapping {len(hotel_items)} hotels on {workers} worker processes ({len(batches)} tasks, "
+                    f"~{chunk_pairs} pairs per task)")
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_mapping_worker,
+                                 initargs=(self.config, self.BATCH_SCORING, self.failure_top_k)) as executor:
+            futures = [
+                executor.submit(_map_hotel_batch, batch, threshold, collect_failures)
+                for _, batch in batches
+            ]
+            for future in as_completed(futures):
+                yield from future.result()
+    
+    def _finish_hotel_failures(self, hotel_result: HotelMappingResult, hotel_rooms: List[RoomData], threshold: float,
+                               store: Optional[MappingResultStore], hotel_name: str, fingerprint: Optional[str]) -> None:
+        """Save a recomputed hotel to the store, log its failures and drop them from the result"""
+        if hotel_result.error is not None:
+            return
+        if store is not None and not hotel_result.cached:
+            store.save(hotel_name, fingerprint, hotel_result)
+        nodes = {i: hotel_rooms[i] for i in hotel_result.node_indices}
+        self._log_hotel_failures(hotel_result, nodes, threshold)
+        hotel_result.failures = []
+    
+    def _log_hotel_failures(self, hotel_result: HotelMappingResult, nodes: Dict[int, RoomData], threshold: float) -> None:
+        """Write collected below-threshold pairs of a hotel to the failure log, in scoring order"""
+        if not self.log_failures:
+            return
+        
+        for i, j, score_result in hotel_result.failures:
+            try:
+                self.failure_logger.log_failure(
+                    room1=nodes[i].row,
+                    room2=nodes[j].row,
+                    score_result=score_result,
+                    threshold=threshold,
+                    provider1=nodes[i].provider,
+                    provider2=nodes[j].provider
+                )
+            except Exception as e:
+                logger.error(f"Error logging mapping failure ({i}, {j}): {e}")
+    
     def create_legacy_room_mappings_csv(self, df_output: pd.DataFrame, output_file: str = "room_mappings_legacy_format.csv") -> pd.DataFrame:
         """
         Create CSV in the legacy room_mappings.csv format
@@ -1146,18 +1885,70 @@ class RoomMapper:
         
         return legacy_row
 
-def main():
+def _top_failures(failures: List[Tuple[int, int, ScoreResult]], top_k: Optional[int]) -> List[Tuple[int, int, ScoreResult]]:
+    """K highest-scoring failures (earlier pair wins ties), in scoring order; all if top_k is None"""
+    if top_k is None or len(failures) <= top_k:
+        return failures
+    keep = heapq.nlargest(top_k, range(len(failures)), key=lambda position: (failures[position][2].score, -position))
+    return [failures[position] for position in sorted(keep)]
+
+# Process pool worker state - one mapper per worker, built from the parent's configuration
+_worker_mapper: Optional[RoomMapper] = None
+
+def _init_mapping_worker(config: RoomMapperConfig, batch_scoring: bool = True, failure_top_k: Optional[int] = None) -> None:
+    """Pool initializer: build the worker's mapper from the shared read-only configuration"""
+    global _worker_mapper
+    _worker_mapper = RoomMapper(config.config_path, log_failures=False, config=config, batch_scoring=batch_scoring,
+                                failure_top_k=failure_top_k)
+    _worker_mapper.FUZZY_WORKERS = 1  # Parallelism comes from the pool
+
+def _map_hotel_batch(batch: List[Tuple[int, List[RoomData], Optional[Dict[Tuple[int, int], ScoreResult]]]],
+                     threshold: float, collect_failures: bool) -> List[HotelMappingResult]:
+    """Pool task: map a batch of hotels"""
+    return [
+        _worker_mapper._map_hotel(hotel_idx, hotel_rooms, threshold, collect_failures, pair_scores)
+        for hotel_idx, hotel_rooms, pair_scores in batch
+    ]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Production room mapper")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes scoring hotels (default: RoomMapper.MAX_WORKERS, at most CPU count; 1 = serial)")
+    parser.add_argument("--chunk-pairs", type=int, default=None,
+                        help="Estimated room pairs per worker task (default: RoomMapper.CHUNK_PAIRS)")
+    parser.add_argument("--scalar-scoring", action="store_true",
+                        help="Score main names pair by pair instead of cdist matrices")
+    parser.add_argument("--failure-log-format", choices=["csv", "parquet"], default="csv",
+                        help="Mapping failure log format (parquet: directory of part files, needs pyarrow)")
+    parser.add_argument("--failure-top-k", type=int, default=None,
+                        help="Log only the K highest-scoring failures (near misses) per hotel")
+    parser.add_argument("--score-cache", default=None,
+                        help="SQLite cache of pair scores reused across runs and thresholds "
+                             "(e.g. room_pair_scores.sqlite)")
+    parser.add_argument("--store", default=None,
+                        help="Incremental mode: SQLite store of previous per-hotel results "
+                             "(e.g. room_mapping_store.sqlite); only changed hotels are recomputed")
+    args = parser.parse_args(argv)
+    if args.failure_top_k is not None and args.failure_top_k < 1:
+        parser.error("--failure-top-k must be at least 1")
+    return args
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
     try:
         logger.info("Initializing Room Mapper...")
         
         config_path = 'app/config/room_mappings_config.yaml'
-        mapper = RoomMapper(config_path)
+        mapper = RoomMapper(config_path, batch_scoring=not args.scalar_scoring,
+                            failure_log_format=args.failure_log_format, failure_top_k=args.failure_top_k)
         
         logger.info("Cache optimization active for maximum performance")
         
         # Perform mapping
-        results_df = mapper.map_all_rooms()
+        workers = args.workers if args.workers is not None else min(mapper.MAX_WORKERS, os.cpu_count() or 1)
+        results_df = mapper.map_all_rooms(workers=workers, chunk_pairs=args.chunk_pairs, store_path=args.store,
+                                          score_cache_path=args.score_cache)
         
         # Save results in current format
         output_file = 'room_mappings_COMPLETE_DICTIONARY.csv'
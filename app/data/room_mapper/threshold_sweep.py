@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Similarity threshold sweep for the room mapper
+
+ScoreResult.score does not depend on similarity_threshold, so room groups for
+any threshold can be rebuilt from cached pair scores without re-scoring.
+Pairs missing from the PairScoreCache are scored once and added; every
+threshold is then grouped exactly as RoomMapper.map_rooms_for_hotel does.
+
+Usage (from repository root):
+    python -m app.data.room_mapper.threshold_sweep --thresholds 0.6 0.65 0.7 0.75 0.8
+    python -m app.data.room_mapper.threshold_sweep --thresholds 0.7 0.8 --groups-dir sweep/
+"""
+
+import argparse
+import csv
+import json
+import logging
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.data.room_mapper.room_mapper_prod import PairScoreCache, RoomData, RoomMapper
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_thresholds(mapper: RoomMapper, score_cache: PairScoreCache, thresholds: List[float],
+                     groups_dir: str = None) -> Dict[float, Dict[str, Any]]:
+    """
+    Group all hotels for every threshold from cached pair scores
+
+    Args:
+        mapper: Room mapper (its configuration defines input files and scoring)
+        score_cache: Pair score cache, extended with pairs scored here
+        thresholds: Similarity thresholds to evaluate
+        groups_dir: If given, room groups per threshold are written there as CSV
+
+    Returns:
+        Dict threshold -> stats (groups, mapped_groups, mapped_rooms, unmapped_rooms, failures, seconds)
+    """
+    hotels: Dict[Any, List[RoomData]] = defaultdict(list)
+    for room in mapper.load_room_data():
+        hotels[room.ref_hotel_name].append(room)
+
+    scoring_hash = mapper.config.scoring_hash
+    hotel_scores = {}
+    start = time.perf_counter()
+    for hotel_name, hotel_rooms in hotels.items():
+        hotel_scores[hotel_name] = score_cache.get_hotel_scores(scoring_hash, hotel_rooms)
+    cached_pairs = {hotel_name: set(scores) for hotel_name, scores in hotel_scores.items()}
+    logger.info(f"Loaded {sum(len(scores) for scores in hotel_scores.values())} cached pair scores "
+                f"for {len(hotels)} hotels in {time.perf_counter() - start:.2f}s")
+
+    results = {}
+    for threshold in thresholds:
+        start = time.perf_counter()
+        stats = {'groups': 0, 'mapped_groups': 0, 'mapped_rooms': 0, 'unmapped_rooms': 0, 'failures': 0}
+        group_rows = []
+        for hotel_name, hotel_rooms in hotels.items():
+            failures = []
+            groups, nodes = mapper.map_rooms_for_hotel(hotel_rooms, threshold, failures=failures,
+                                                       pair_scores=hotel_scores[hotel_name])
+            stats['failures'] += len(failures)
+            for group in groups:
+                stats['groups'] += 1
+                if len({nodes[i].provider for i in group}) > 1:
+                    stats['mapped_groups'] += 1
+                    stats['mapped_rooms'] += len(group)
+                else:
+                    stats['unmapped_rooms'] += len(group)
+                if groups_dir:
+                    group_id = stats['groups']
+                    group_rows.extend(
+                        [hotel_name, group_id, nodes[i].provider, nodes[i].row.get('reference_id', ''),
+                         nodes[i].row.get('room_name', ''), nodes[i].row.get('main_name', '')]
+                        for i in group
+                    )
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        results[threshold] = stats
+
+        if groups_dir:
+            output_path = Path(groups_dir) / f"room_groups_{threshold:g}.csv"
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['ref_hotel_name', 'group_id', 'provider', 'reference_id', 'room_name', 'main_name'])
+                writer.writerows(group_rows)
+
+    # Pairs scored during the sweep (not cached before)
+    scored = 0
+    for hotel_name, hotel_rooms in hotels.items():
+        new_scores = [(i, j, result) for (i, j), result in hotel_scores[hotel_name].items()
+                      if (i, j) not in cached_pairs[hotel_name]]
+        score_cache.put_hotel_scores(scoring_hash, hotel_rooms, new_scores)
+        scored += len(new_scores)
+    logger.info(f"Scored {scored} pairs missing from the cache")
+
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Room mapper similarity threshold sweep")
+    parser.add_argument("--thresholds", type=float, nargs="+", required=True, help="Similarity thresholds to evaluate")
+    parser.add_argument("--config", default="app/config/room_mappings_config.yaml", help="Room mapper configuration")
+    parser.add_argument("--score-cache", default="room_pair_scores.sqlite", help="SQLite pair score cache")
+    parser.add_argument("--groups-dir", default=None, help="Write room groups per threshold as CSV to this directory")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: print only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Per-hotel progress of the mapper is noise here
+    logging.getLogger("app.data.room_mapper.room_mapper_prod").setLevel(logging.WARNING)
+
+    mapper = RoomMapper(args.config, log_failures=False)
+    score_cache = PairScoreCache(args.score_cache)
+    try:
+        results = sweep_thresholds(mapper, score_cache, args.thresholds, args.groups_dir)
+    finally:
+        score_cache.close()
+
+    print(f"{'threshold':>9} {'groups':>7} {'mapped groups':>14} {'mapped rooms':>13} {'unmapped rooms':>15} "
+          f"{'failures':>9} {'seconds':>8}")
+    for threshold, stats in results.items():
+        print(f"{threshold:>9g} {stats['groups']:>7} {stats['mapped_groups']:>14} {stats['mapped_rooms']:>13} "
+              f"{stats['unmapped_rooms']:>15} {stats['failures']:>9} {stats['seconds']:>8}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({str(threshold): stats for threshold, stats in results.items()}, indent=2))
+        print(f"\nResults written to {output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,23 +8,283 @@ Each function handles one standardized column
 import pandas as pd
 import yaml
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
+
+# Memoized room_class results (distinct normalized room names) per parser
+ROOM_CLASS_CACHE_SIZE = 8192
+
+# Rows read and standardized at a time by process_api
+PROCESS_CHUNK_SIZE = 50000
+
+# Columns produced by parsing room_name (parse_room_columns), in process order;
+# room_area yields room_area_m2 and room_area_sqft
+PARSED_COLUMNS = (
+    'main_name', 'bedrooms_count', 'room_capacity', 'room_area', 'room_class', 'room_quality',
+    'room_quality_category', 'bedding_config', 'bedding_type', 'room_view', 'balcony',
+    'family_room', 'club_room', 'room_keywords'
+)
+
+# process_api output columns and null cleanup
+PROCESS_API_COLUMNS = [
+    'reference_id', 'ref_hotel_name', 'hotel_id', 'hotel_name', 'room_name',
+    'main_name', 'bedrooms_count', 'room_capacity', 'room_area_m2', 'room_area_sqft',
+    'room_quality', 'bedding_type', 'bedding_config', 'room_class', 'balcony',
+    'family_room', 'club_room', 'room_view', 'room_keywords'
+]
+NULL_TEXT_VALUES = ('undefined', 'undefined_value', '0')
+TEXT_COLUMNS_TO_CLEAN = ('room_quality', 'bedding_type', 'bedding_config', 'room_class', 'room_view', 'room_keywords')
+NUMERIC_COLUMNS_TO_CLEAN = ('bedrooms_count', 'room_capacity', 'balcony', 'family_room', 'club_room')
+
+_KEYWORD_SEPARATORS = re.compile(r'[(),\[\]{}|*-]')
+_WORD_EDGE_PUNCTUATION = re.compile(r'^[^\w]+|[^\w]+$')
+_WHITESPACE_RUNS = re.compile(r'\s+')
+
+# Required literal prefilter (_required_literal); IGNORECASE also matches these
+# non-ASCII letters against ASCII ones (dotted/dotless i, long s, Kelvin sign)
+_LITERAL_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 -_')
+_ASCII_CASE_FOLDS = re.compile('[\u0130\u0131\u017f\u212a]')
+
+# Provider-specific patterns
+_TBO_CLEANING_PATTERNS = [
+    re.compile(r'\s*-\s*TBO Special Deal.*', re.IGNORECASE),
+    re.compile(r'\s*\[TBO Offer\].*', re.IGNORECASE),
+]
+# Przykład: RateHawk używa "br" zamiast "bedroom"
+_RATEHAWK_BEDROOM_PATTERNS = [
+    (re.compile(r'(\d+)\s*br\b'), 1),
+    (re.compile(r'(\d+)\s*-\s*br\b'), 1),
+]
+
+
+def _is_missing(room_name) -> bool:
+    """Room name is NaN/None or empty"""
+    if isinstance(room_name, str):
+        return room_name == ''
+    return pd.isna(room_name)
+
+
+def _required_literal(pattern: re.Pattern) -> str:
+    """
+    Longest literal every match of pattern contains ('' if none is certain)
+    
+    Only top-level literal runs are considered - groups, classes, character
+    escapes and optional characters end a run, top-level alternation gives ''.
+    The literal is lowercased for IGNORECASE patterns.
+    """
+    source = pattern.pattern
+    if pattern.flags & re.VERBOSE:
+        return ''
+    runs, run, depth, i = [], '', 0, 0
+    while i < len(source):
+        char = source[i]
+        if char == '|' and depth == 0:
+            return ''
+        if char == '\\':
+            escaped = source[i + 1:i + 2]
+            # Escaped punctuation (e.g. \( or \.) matches itself
+            if escaped and not escaped.isalnum() and depth == 0:
+                run += escaped
+            else:
+                runs.append(run)
+                run = ''
+            i += 2
+            continue
+        if char == '[':
+            runs.append(run)
+            run = ''
+            i += 2 if source[i + 1:i + 2] == '^' else 1
+            i += 1 if source[i:i + 1] == ']' else 0
+            while i < len(source) and source[i] != ']':
+                i += 2 if source[i] == '\\' else 1
+        elif char in '?*{':
+            # Previous character is optional
+            runs.append(run[:-1])
+            run = ''
+            if char == '{':
+                i = source.find('}', i) if '}' in source[i:] else len(source)
+        elif char in _LITERAL_CHARS and depth == 0:
+            run += char
+        else:
+            depth += (char == '(') - (char == ')')
+            runs.append(run)
+            run = ''
+        i += 1
+    runs.append(run)
+    literal = max(runs, key=len)
+    return literal.lower() if pattern.flags & re.IGNORECASE else literal
+
 
 class RoomDataParser:
     """Universal parser for room data standardization"""
     
-    def __init__(self, provider: str = 'universal'):
-        """Initialize parser with configuration"""
+    def __init__(self, provider: str = 'universal', room_class_cache_size: int = ROOM_CLASS_CACHE_SIZE):
+        """
+        Initialize parser with configuration
+        
+        Args:
+            provider: Provider whose specific parsing functions are used
+            room_class_cache_size: Max memoized room_class results (0 disables memoization)
+        """
         self.provider = provider
         self.config = self._load_config()
-        
+        self._compile_rules()
+        self._room_class_memo = lru_cache(maxsize=room_class_cache_size)(self._match_room_class)
+    
     def _load_config(self) -> dict:
         """Load room mappings configuration"""
         config_path = Path('app/config/room_mappings_config.yaml')
         with open(config_path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
     
+    # ===== RULE COMPILATION =====
+    
+    def _compile_rules(self) -> None:
+        """
+        Precompile parsing rules of all standardized columns from configuration
+        
+        Patterns are compiled and keywords lowercased and sorted once, so parsing
+        a room name only matches. Call again after changing self.config.
+        """
+        patterns = self.config.get('parsing_patterns', {})
+        cleaning = self.config.get('room_name_cleaning', {})
+        
+        # main_name cleaning
+        # (pattern, replacement, literal) - a pattern is skipped while its literal is absent
+        self._cleaning_rules = []
+        for pattern_config in cleaning.get('remove_patterns', []):
+            pattern = re.compile(pattern_config['pattern'], re.IGNORECASE)
+            self._cleaning_rules.append((pattern, '', self._cleaning_literal(pattern)))
+        for pattern_config in cleaning.get('final_cleanup', []):
+            pattern = re.compile(pattern_config['pattern'])
+            self._cleaning_rules.append((pattern, pattern_config.get('replacement', ''), self._cleaning_literal(pattern)))
+        
+        # Regex sections
+        bedrooms_config = patterns.get('bedrooms_count', {})
+        self._bedroom_patterns = self._compile_value_patterns(bedrooms_config.get('patterns', []))
+        self._bedrooms_default = bedrooms_config.get('default', 0)
+        
+        capacity_config = patterns.get('room_capacity', {})
+        self._capacity_patterns = self._compile_value_patterns(capacity_config.get('patterns', []))
+        self._capacity_keywords = [(keyword.lower(), capacity) for keyword, capacity in capacity_config.get('keywords', {}).items()]
+        self._capacity_default = capacity_config.get('default', 2)
+        
+        area_config = patterns.get('room_area', {})
+        area_flags = re.IGNORECASE if area_config.get('case_insensitive', True) else 0
+        self._area_patterns = []
+        for pattern_config in area_config.get('patterns', []):
+            pattern = re.compile(pattern_config['pattern'], area_flags)
+            self._area_patterns.append((pattern, pattern_config.get('group', 1), pattern_config.get('unit', 'm2'), _required_literal(pattern)))
+        self._area_case_insensitive = bool(area_flags)
+        self._area_default = area_config.get('default', None)
+        
+        # Keyword sections (longest keyword first)
+        self._quality_rules = self._compile_keyword_section(patterns.get('room_quality', {}))
+        self._quality_category_rules = self._compile_keyword_section(patterns.get('room_quality_category', {}))
+        self._bedding_config_rules = self._compile_keyword_section(patterns.get('bedding_config', {}))
+        self._view_rules = self._compile_keyword_section(patterns.get('room_view', {}))
+        # bedding_type returns the matched standardized keyword itself
+        self._bedding_type_rules = self._compile_keyword_section(patterns.get('bedding_config', {}), keyword_values=True)
+        self._last_bedding_match = (None, None)
+        
+        # Boolean features
+        boolean_config = patterns.get('boolean_features', {})
+        self._feature_rules = {}
+        for feature in ('balcony', 'family_room', 'club_room'):
+            feature_config = boolean_config.get(feature, {})
+            self._feature_rules[feature] = (
+                [keyword.lower() for keyword in feature_config.get('keywords', [])],
+                feature_config.get('default', 0)
+            )
+        
+        # room_keywords - exclude words gathered from other config sections
+        keywords_config = patterns.get('room_keywords', {})
+        all_exclude_words = list(keywords_config.get('exclude_words', []))
+        for section_path in keywords_config.get('exclude_from_sections', []):
+            all_exclude_words.extend(self._get_words_from_config_section(section_path))
+        force_include = keywords_config.get('force_include', [])
+        case_insensitive = keywords_config.get('case_insensitive', True)
+        if case_insensitive:
+            all_exclude_words = [word.lower() for word in all_exclude_words]
+            force_include = [word.lower() for word in force_include]
+        self._keywords_exclude = frozenset(all_exclude_words)
+        self._keywords_force_include = frozenset(force_include)
+        self._keywords_case_insensitive = case_insensitive
+        self._keywords_min_length = keywords_config.get('min_word_length', 3)
+        self._keywords_max = keywords_config.get('max_keywords', 5)
+        self._keywords_default = keywords_config.get('default', None)
+        
+        self._compile_room_class_rules()
+    
+    @staticmethod
+    def _cleaning_literal(pattern: re.Pattern) -> str:
+        """Required literal usable on original-case text (IGNORECASE literals only without letters)"""
+        literal = _required_literal(pattern)
+        if pattern.flags & re.IGNORECASE and literal.lower() != literal.upper():
+            return ''
+        return literal
+    
+    @staticmethod
+    def _compile_value_patterns(pattern_configs: list) -> list:
+        """Compile (pattern, group, fixed value, required literal) rules; case sensitivity is per pattern"""
+        rules = []
+        for pattern_config in pattern_configs:
+            pattern = re.compile(pattern_config['pattern'], re.IGNORECASE if pattern_config.get('case_insensitive', True) else 0)
+            rules.append((pattern, pattern_config.get('group', 1), pattern_config.get('value', None), _required_literal(pattern)))
+        return rules
+    
+    @staticmethod
+    def _compile_keyword_section(section_config: dict, keyword_values: bool = False) -> tuple:
+        """
+        Compile keyword -> value section as (rules, case_insensitive, default, any_keyword)
+        
+        Args:
+            section_config: Config section with keywords, case_insensitive and default
+            keyword_values: Return the matched keyword instead of its value
+        """
+        keywords = section_config.get('keywords', {})
+        case_insensitive = section_config.get('case_insensitive', True)
+        rules = [
+            (keyword.lower() if case_insensitive else keyword, keyword if keyword_values else keywords[keyword])
+            for keyword in sorted(keywords.keys(), key=len, reverse=True)
+        ]
+        # Any keyword present - names without one skip the ordered scan
+        any_keyword = re.compile('|'.join(re.escape(keyword) for keyword, _ in rules)) if rules else None
+        return rules, case_insensitive, None if keyword_values else section_config.get('default', None), any_keyword
+    
+    @staticmethod
+    def _match_value_patterns(rules: list, text: str) -> Optional[int]:
+        """Value of the first matching rule in lowercased text, None if none matches"""
+        # A rule cannot match without its required literal (unless IGNORECASE folds
+        # a non-ASCII letter into one, e.g. long s into s)
+        prefilter = text.isascii() or not _ASCII_CASE_FOLDS.search(text)
+        for pattern, group, fixed_value, literal in rules:
+            if prefilter and literal not in text:
+                continue
+            match = pattern.search(text)
+            if match:
+                # If pattern has a fixed value, return it
+                if fixed_value is not None:
+                    return int(fixed_value)
+                try:
+                    return int(match.group(group))
+                except (ValueError, IndexError):
+                    continue
+        return None
+    
+    @staticmethod
+    def _match_keyword_section(section: tuple, room_name: str, room_name_lower: str) -> Any:
+        """Value of the first (longest) keyword found in room name, section default otherwise"""
+        rules, case_insensitive, default_value, any_keyword = section
+        text = room_name_lower if case_insensitive else room_name
+        if any_keyword is None or not any_keyword.search(text):
+            return default_value
+        for keyword, value in rules:
+            if keyword in text:
+                return value
+        return default_value
+    
     # ===== COLUMN PARSING FUNCTIONS =====
     
     def parse_main_name(self, room_name: str) -> str:
@@ -33,7 +293,7 @@ class RoomDataParser:
         
         Args:
             room_name: Original room name from provider
-            
+        
         Returns:
             Cleaned main_name
         """
@@ -42,27 +302,10 @@ class RoomDataParser:
             return getattr(self, f'_parse_main_name_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return ''
         
-        main_name = str(room_name)
-        
-        # Apply removal patterns
-        cleaning_patterns = self.config.get('room_name_cleaning', {}).get('remove_patterns', [])
-        
-        for pattern_config in cleaning_patterns:
-            pattern = pattern_config['pattern']
-            main_name = re.sub(pattern, '', main_name, flags=re.IGNORECASE)
-        
-        # Apply final cleanup
-        final_cleanup = self.config.get('room_name_cleaning', {}).get('final_cleanup', [])
-        
-        for pattern_config in final_cleanup:
-            pattern = pattern_config['pattern']
-            replacement = pattern_config.get('replacement', '')
-            main_name = re.sub(pattern, replacement, main_name)
-        
-        return main_name.strip()
+        return self._apply_universal_cleaning(str(room_name))
     
     def parse_bedrooms_count(self, room_name: str) -> int:
         """
@@ -70,7 +313,7 @@ class RoomDataParser:
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Number of bedrooms (None if not found)
         """
@@ -79,36 +322,10 @@ class RoomDataParser:
             return getattr(self, f'_parse_bedrooms_count_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return None
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get patterns from config
-        bedroom_patterns = self.config.get('parsing_patterns', {}).get('bedrooms_count', {})
-        patterns = bedroom_patterns.get('patterns', [])
-        default_value = bedroom_patterns.get('default', 0)
-        
-        # Try each pattern
-        for pattern_config in patterns:
-            pattern = pattern_config['pattern']
-            group = pattern_config.get('group', 1)
-            fixed_value = pattern_config.get('value', None)
-            case_insensitive = pattern_config.get('case_insensitive', True)
-            
-            flags = re.IGNORECASE if case_insensitive else 0
-            match = re.search(pattern, room_name_lower, flags=flags)
-            
-            if match:
-                # If pattern has a fixed value, return it
-                if fixed_value is not None:
-                    return int(fixed_value)
-                try:
-                    return int(match.group(group))
-                except (ValueError, IndexError):
-                    continue
         
-        return default_value
+        return self._parse_bedrooms_count_universal(room_name)
     
     def parse_room_capacity(self, room_name: str) -> int:
         """
@@ -116,7 +333,7 @@ class RoomDataParser:
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Maximum guest capacity (None if not found)
         """
@@ -125,49 +342,19 @@ class RoomDataParser:
             return getattr(self, f'_parse_room_capacity_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return None
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get patterns from config
-        capacity_config = self.config.get('parsing_patterns', {}).get('room_capacity', {})
-        patterns = capacity_config.get('patterns', [])
-        keywords = capacity_config.get('keywords', {})
-        default_value = capacity_config.get('default', 2)
         
-        # Try regex patterns first (highest priority)
-        for pattern_config in patterns:
-            pattern = pattern_config['pattern']
-            group = pattern_config.get('group', 1)
-            fixed_value = pattern_config.get('value', None)
-            case_insensitive = pattern_config.get('case_insensitive', True)
-            
-            flags = re.IGNORECASE if case_insensitive else 0
-            match = re.search(pattern, room_name_lower, flags=flags)
-            
-            if match:
-                if fixed_value is not None:
-                    return int(fixed_value)
-                try:
-                    return int(match.group(group))
-                except (ValueError, IndexError):
-                    continue
-        
-        # Try keywords
-        for keyword, capacity in keywords.items():
-            if keyword.lower() in room_name_lower:
-                return int(capacity)
-        
-        return default_value
-
+        room_name = str(room_name)
+        return self._rule_room_capacity(room_name, room_name.lower())
+    
     def parse_room_keywords(self, room_name: str) -> str:
         """
         Parse room_keywords: Extract unique keywords from room name that are not captured by other attributes
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Comma-separated string of unique keywords (default None if not found)
         """
@@ -176,99 +363,19 @@ class RoomDataParser:
             return getattr(self, f'_parse_room_keywords_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return None
-            
-        room_name_str = str(room_name).strip()
-        
-        # Get config
-        keywords_config = self.config.get('parsing_patterns', {}).get('room_keywords', {})
-        exclude_from_sections = keywords_config.get('exclude_from_sections', [])
-        exclude_words = keywords_config.get('exclude_words', [])
-        force_include = keywords_config.get('force_include', [])
-        min_word_length = keywords_config.get('min_word_length', 3)
-        max_keywords = keywords_config.get('max_keywords', 5)
-        case_insensitive = keywords_config.get('case_insensitive', True)
-        default_value = keywords_config.get('default', None)
-        
-        # Build exclude_words list from config sections
-        all_exclude_words = list(exclude_words)  # Start with manual exclude_words
-        
-        # Add words from specified config sections
-        for section_path in exclude_from_sections:
-            section_words = self._get_words_from_config_section(section_path)
-            all_exclude_words.extend(section_words)
-        
-        # Convert exclude and force_include lists to lowercase if case insensitive
-        if case_insensitive:
-            exclude_words_lower = [word.lower() for word in all_exclude_words]
-            force_include_lower = [word.lower() for word in force_include]
-        else:
-            exclude_words_lower = all_exclude_words
-            force_include_lower = force_include
         
-        # Clean room name and split into words
-        # Remove common punctuation and split
-        import re
-        
-        # Remove parentheses, brackets, commas, and other common separators
-        cleaned_name = re.sub(r'[(),\[\]{}|*-]', ' ', room_name_str)
-        
-        # Split into words and clean
-        words = cleaned_name.split()
-        
-        # Extract keywords
-        keywords = []
-        
-        for word in words:
-            # Clean word (remove punctuation at start/end)
-            clean_word = re.sub(r'^[^\w]+|[^\w]+$', '', word)
-            
-            if not clean_word:
-                continue
-                
-            # Convert to lowercase for comparison if case insensitive
-            word_for_comparison = clean_word.lower() if case_insensitive else clean_word
-            
-            # Check minimum length
-            if len(clean_word) < min_word_length:
-                continue
-            
-            # Check if word should be force included
-            if word_for_comparison in force_include_lower:
-                if clean_word not in keywords:  # Avoid duplicates
-                    keywords.append(clean_word)
-                continue
-            
-            # Check if word should be excluded
-            if word_for_comparison in exclude_words_lower:
-                continue
-            
-            # Check if it's a number (usually not interesting as keyword)
-            if clean_word.isdigit():
-                continue
-            
-            # Add keyword if not already present
-            if clean_word not in keywords:
-                keywords.append(clean_word)
-            
-            # Stop if we've reached max keywords
-            if len(keywords) >= max_keywords:
-                break
-        
-        # Return keywords as comma-separated string or default
-        if keywords:
-            return ', '.join(keywords)
-        else:
-            return default_value
-
+        room_name = str(room_name)
+        return self._rule_room_keywords(room_name, room_name.lower())
+    
     def _get_words_from_config_section(self, section_path: str) -> list:
         """
         Extract words from a specific config section path
         
         Args:
             section_path: Dot-separated path to config section (e.g., 'room_class.keywords')
-            
+        
         Returns:
             List of words from that section
         """
@@ -297,7 +404,6 @@ class RoomDataParser:
                         words.extend([str(item) for item in value])
                     elif isinstance(value, str):
                         # Add single string, split by spaces and commas
-                        import re
                         split_words = re.split(r'[,\s]+', value)
                         words.extend([word.strip() for word in split_words if word.strip()])
                     elif key == 'keywords' and isinstance(value, dict):
@@ -308,7 +414,7 @@ class RoomDataParser:
                                 # Also add words from the value
                                 split_words = re.split(r'[,\s]+', subvalue)
                                 words.extend([word.strip() for word in split_words if word.strip()])
-                            
+            
             elif isinstance(current_section, list):
                 # If it's a list, add all items
                 words.extend([str(item) for item in current_section])
@@ -321,24 +427,23 @@ class RoomDataParser:
                     clean_words.append(word)
                 else:
                     # Split multi-word phrases
-                    import re
                     split_words = re.split(r'[,\s]+', word)
                     clean_words.extend([w.strip() for w in split_words if w.strip() and ' ' not in w.strip()])
             
             return clean_words
-            
+        
         except Exception as e:
             # If any error occurs, return empty list
             print(f"Warning: Could not extract words from config section '{section_path}': {e}")
             return words
-
+    
     def parse_room_area(self, room_name: str) -> tuple:
         """
         Parse room_area: Extract room area from room name (sq ft, m2, etc.)
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Tuple (area_m2, area_sqft) - both values provided
         """
@@ -347,53 +452,21 @@ class RoomDataParser:
             return getattr(self, f'_parse_room_area_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return (None, None)
-            
-        room_name_str = str(room_name)
-        
-        # Get patterns from config
-        area_config = self.config.get('parsing_patterns', {}).get('room_area', {})
-        patterns = area_config.get('patterns', [])
-        default_value = area_config.get('default', None)
-        case_insensitive = area_config.get('case_insensitive', True)
-        
-        # Try each pattern
-        for pattern_config in patterns:
-            pattern = pattern_config['pattern']
-            group = pattern_config.get('group', 1)
-            unit = pattern_config.get('unit', 'm2')
-            
-            flags = re.IGNORECASE if case_insensitive else 0
-            match = re.search(pattern, room_name_str, flags=flags)
-            
-            if match:
-                try:
-                    area_value = float(match.group(group))
-                    
-                    # Return both m2 and sqft
-                    if unit == 'sq_ft':
-                        # Original is square feet
-                        area_sqft = round(area_value, 1)
-                        area_m2 = round(area_value * 0.092903, 1)  # Convert to m2
-                    else:  # unit == 'm2'
-                        # Original is square meters
-                        area_m2 = round(area_value, 1)
-                        area_sqft = round(area_value * 10.764, 1)  # Convert to sqft
-                    
-                    return (area_m2, area_sqft)
-                except (ValueError, IndexError):
-                    continue
         
-        return (default_value, default_value)
+        room_name = str(room_name)
+        return self._rule_room_area(room_name, room_name.lower())
     
     def parse_room_class(self, room_name: str) -> str:
         """
         Parse room_class: Extract room class from room name (room, suite, villa, etc.)
         
+        Results are memoized per normalized room name (see get_room_class_cache_stats).
+        
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Room class (default 'room' if not found)
         """
@@ -402,47 +475,75 @@ class RoomDataParser:
             return getattr(self, f'_parse_room_class_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return None
-            
-        room_name_lower = str(room_name).lower()
         
-        # Get config
+        room_name = str(room_name)
+        return self._rule_room_class(room_name, room_name.lower())
+    
+    def _compile_room_class_rules(self) -> None:
+        """Precompile room_class priority patterns and keywords from configuration"""
         class_config = self.config.get('parsing_patterns', {}).get('room_class', {})
-        priority_patterns = class_config.get('priority_patterns', [])
         keywords = class_config.get('keywords', {})
-        default_value = class_config.get('default', None)
         case_insensitive = class_config.get('case_insensitive', True)
+        flags = re.IGNORECASE if case_insensitive else 0
         
-        # First check priority patterns (most specific, context-aware)
-        for pattern_config in priority_patterns:
-            pattern = pattern_config['pattern']
-            value = pattern_config['value']
-            
-            flags = re.IGNORECASE if case_insensitive else 0
-            if re.search(pattern, room_name_lower, flags=flags):
-                return value
+        self._room_class_case_insensitive = case_insensitive
+        self._room_class_default = class_config.get('default', None)
+        self._room_class_patterns = [
+            (re.compile(pattern_config['pattern'], flags), pattern_config['value'])
+            for pattern_config in class_config.get('priority_patterns', [])
+        ]
         
-        # Then search for keywords in order of priority (longest first)
+        # Keywords in order of priority (longest first), sorted once
         sorted_keywords = sorted(keywords.keys(), key=len, reverse=True)
+        self._room_class_keywords = [
+            (keyword.lower() if case_insensitive else keyword, keywords[keyword]) for keyword in sorted_keywords
+        ]
+    
+    def _match_room_class(self, room_name: str) -> Optional[str]:
+        """
+        Match room_class rules against a normalized room name (uncached)
         
-        for keyword in sorted_keywords:
-            if case_insensitive:
-                if keyword.lower() in room_name_lower:
-                    return keywords[keyword]
-            else:
-                if keyword in room_name:
-                    return keywords[keyword]
+        Args:
+            room_name: Room name, lowercased if room_class matching is case insensitive
         
-        return default_value
-
+        Returns:
+            Room class or configured default
+        """
+        # First check priority patterns (most specific, context-aware) - always on lowercased name
+        if self._room_class_patterns:
+            room_name_lower = room_name if self._room_class_case_insensitive else room_name.lower()
+            for pattern, value in self._room_class_patterns:
+                if pattern.search(room_name_lower):
+                    return value
+        
+        # Then search for keywords in order of priority
+        for keyword, value in self._room_class_keywords:
+            if keyword in room_name:
+                return value
+        
+        return self._room_class_default
+    
+    def get_room_class_cache_stats(self) -> Dict[str, Any]:
+        """Get room_class memoization statistics"""
+        info = self._room_class_memo.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "entries": info.currsize,
+            "max_entries": info.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 3) if lookups else 0.0
+        }
+    
     def parse_room_quality(self, room_name: str) -> str:
         """
         Parse room_quality: Extract room quality from room name (grand, comfort, classic, etc.)
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Room quality (default None if not found)
         """
@@ -451,38 +552,19 @@ class RoomDataParser:
             return getattr(self, f'_parse_room_quality_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
-            quality_config = self.config.get('parsing_patterns', {}).get('room_quality', {})
-            return quality_config.get('default', None)
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get keywords from config
-        quality_config = self.config.get('parsing_patterns', {}).get('room_quality', {})
-        keywords = quality_config.get('keywords', {})
-        default_value = quality_config.get('default', None)
-        case_insensitive = quality_config.get('case_insensitive', True)
-        
-        # Search for keywords in order of priority (longest first)
-        sorted_keywords = sorted(keywords.keys(), key=len, reverse=True)
-        
-        for keyword in sorted_keywords:
-            if case_insensitive:
-                if keyword.lower() in room_name_lower:
-                    return keywords[keyword]
-            else:
-                if keyword in room_name:
-                    return keywords[keyword]
+        if _is_missing(room_name):
+            return self._quality_rules[2]
         
-        return default_value
-
+        room_name = str(room_name)
+        return self._match_keyword_section(self._quality_rules, room_name, room_name.lower())
+    
     def parse_room_quality_category(self, room_name: str) -> str:
         """
         Parse room_quality_category: Extract room quality category from room name (entry, enhanced, high, etc.)
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Room quality category (default None if not found)
         """
@@ -491,37 +573,19 @@ class RoomDataParser:
             return getattr(self, f'_parse_room_quality_category_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return None
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get keywords from config
-        quality_config = self.config.get('parsing_patterns', {}).get('room_quality_category', {})
-        keywords = quality_config.get('keywords', {})
-        default_value = quality_config.get('default', None)
-        case_insensitive = quality_config.get('case_insensitive', True)
-        
-        # Search for keywords in order of priority (longest first)
-        sorted_keywords = sorted(keywords.keys(), key=len, reverse=True)
         
-        for keyword in sorted_keywords:
-            if case_insensitive:
-                if keyword.lower() in room_name_lower:
-                    return keywords[keyword]
-            else:
-                if keyword in room_name:
-                    return keywords[keyword]
-        
-        return default_value
-
+        room_name = str(room_name)
+        return self._match_keyword_section(self._quality_category_rules, room_name, room_name.lower())
+    
     def parse_bedding_config(self, room_name: str) -> str:
         """
         Parse bedding_config: Extract bedding configuration from room name (single, double, twin, etc.)
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Bedding configuration (default 'undefined' if not found)
         """
@@ -530,38 +594,19 @@ class RoomDataParser:
             return getattr(self, f'_parse_bedding_config_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
-            bedding_config = self.config.get('parsing_patterns', {}).get('bedding_config', {})
-            return bedding_config.get('default', None)
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get keywords from config
-        bedding_config = self.config.get('parsing_patterns', {}).get('bedding_config', {})
-        keywords = bedding_config.get('keywords', {})
-        default_value = bedding_config.get('default', None)
-        case_insensitive = bedding_config.get('case_insensitive', True)
+        if _is_missing(room_name):
+            return self._bedding_config_rules[2]
         
-        # Search for keywords in order of priority (longest first)
-        sorted_keywords = sorted(keywords.keys(), key=len, reverse=True)
-        
-        for keyword in sorted_keywords:
-            if case_insensitive:
-                if keyword.lower() in room_name_lower:
-                    return keywords[keyword]
-            else:
-                if keyword in room_name:
-                    return keywords[keyword]
-        
-        return default_value
-
+        room_name = str(room_name)
+        return self._match_keyword_section(self._bedding_config_rules, room_name, room_name.lower())
+    
     def parse_bedding_type(self, room_name: str) -> str:
         """
         Parse bedding_type: Extract original bedding description from room name
         
         Args:
             room_name: Original room name from provider
-            
+        
         Returns:
             Original bedding description found in room name
         """
@@ -570,38 +615,20 @@ class RoomDataParser:
             return getattr(self, f'_parse_bedding_type_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return ''
         
-        room_name_lower = str(room_name).lower()
-        
-        # Get bedding_config keywords to find original descriptions
-        bedding_config = self.config['parsing_patterns']['bedding_config']
-        keywords = bedding_config.get('keywords', {})
-        case_insensitive = bedding_config.get('case_insensitive', True)
-        
-        # Search for keywords and return the standardized keyword
-        sorted_keywords = sorted(keywords.keys(), key=len, reverse=True)
-        
-        for keyword in sorted_keywords:
-            if case_insensitive:
-                keyword_lower = keyword.lower()
-                if keyword_lower in room_name_lower:
-                    # Return the standardized keyword (not the original text from room_name)
-                    return keyword
-            else:
-                if keyword in room_name:
-                    return keyword
-        
-        return None  # No bedding type found
-
+        # Return the standardized keyword (not the original text from room_name), None if not found
+        room_name = str(room_name)
+        return self._match_keyword_section(self._bedding_type_rules, room_name, room_name.lower())
+    
     def parse_room_view(self, room_name: str) -> str:
         """
         Parse room_view: Extract view type from room name (sea_view, city_view, etc.)
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             Room view type (default 'no_view' if not found)
         """
@@ -610,38 +637,19 @@ class RoomDataParser:
             return getattr(self, f'_parse_room_view_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
-            view_config = self.config.get('parsing_patterns', {}).get('room_view', {})
-            return view_config.get('default', None)
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get keywords from config
-        view_config = self.config.get('parsing_patterns', {}).get('room_view', {})
-        keywords = view_config.get('keywords', {})
-        default_value = view_config.get('default', None)
-        case_insensitive = view_config.get('case_insensitive', True)
-        
-        # Search for keywords in order of priority (longest first)
-        sorted_keywords = sorted(keywords.keys(), key=len, reverse=True)
+        if _is_missing(room_name):
+            return self._view_rules[2]
         
-        for keyword in sorted_keywords:
-            if case_insensitive:
-                if keyword.lower() in room_name_lower:
-                    return keywords[keyword]
-            else:
-                if keyword in room_name:
-                    return keywords[keyword]
-        
-        return default_value
-
+        room_name = str(room_name)
+        return self._match_keyword_section(self._view_rules, room_name, room_name.lower())
+    
     def parse_balcony(self, room_name: str) -> int:
         """
         Parse balcony: Check if room has balcony/terrace/patio
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             1 if has balcony, None if not found
         """
@@ -650,31 +658,18 @@ class RoomDataParser:
             return getattr(self, f'_parse_balcony_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return None
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get keywords from config
-        boolean_config = self.config.get('parsing_patterns', {}).get('boolean_features', {})
-        balcony_config = boolean_config.get('balcony', {})
-        keywords = balcony_config.get('keywords', [])
-        default_value = balcony_config.get('default', 0)
         
-        # Search for any balcony-related keywords
-        for keyword in keywords:
-            if keyword.lower() in room_name_lower:
-                return 1
-        
-        return default_value
-
+        return self._match_feature('balcony', str(room_name).lower())
+    
     def parse_family_room(self, room_name: str) -> int:
         """
         Parse family_room: Check if room is family-friendly
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             1 if family room, None if not found
         """
@@ -683,31 +678,18 @@ class RoomDataParser:
             return getattr(self, f'_parse_family_room_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return None
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get keywords from config
-        boolean_config = self.config.get('parsing_patterns', {}).get('boolean_features', {})
-        family_config = boolean_config.get('family_room', {})
-        keywords = family_config.get('keywords', [])
-        default_value = family_config.get('default', 0)
-        
-        # Search for any family-related keywords
-        for keyword in keywords:
-            if keyword.lower() in room_name_lower:
-                return 1
         
-        return default_value
-
+        return self._match_feature('family_room', str(room_name).lower())
+    
     def parse_club_room(self, room_name: str) -> int:
         """
         Parse club_room: Check if room is club/executive level
         
         Args:
             room_name: Room name to parse
-            
+        
         Returns:
             1 if club room, None if not found
         """
@@ -716,69 +698,259 @@ class RoomDataParser:
             return getattr(self, f'_parse_club_room_{self.provider}')(room_name)
         
         # Default universal logic
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return None
-            
-        room_name_lower = str(room_name).lower()
-        
-        # Get keywords from config
-        boolean_config = self.config.get('parsing_patterns', {}).get('boolean_features', {})
-        club_config = boolean_config.get('club_room', {})
-        keywords = club_config.get('keywords', [])
-        default_value = club_config.get('default', 0)
         
-        # Search for any club-related keywords
+        return self._match_feature('club_room', str(room_name).lower())
+    
+    def _match_feature(self, feature: str, room_name_lower: str) -> int:
+        """1 if any keyword of the boolean feature is in room name, feature default otherwise"""
+        keywords, default_value = self._feature_rules[feature]
         for keyword in keywords:
-            if keyword.lower() in room_name_lower:
+            if keyword in room_name_lower:
                 return 1
-        
         return default_value
-
+    
+    # ===== COMPILED COLUMN RULES =====
+    # Universal logic for a present room name, as (room_name, room_name_lower) -> value
+    
+    def _rule_main_name(self, room_name: str, room_name_lower: str) -> str:
+        return self._apply_universal_cleaning(room_name)
+    
+    def _rule_bedrooms_count(self, room_name: str, room_name_lower: str) -> int:
+        return self._parse_bedrooms_count_universal(room_name_lower)
+    
+    def _rule_room_capacity(self, room_name: str, room_name_lower: str) -> int:
+        # Try regex patterns first (highest priority)
+        capacity = self._match_value_patterns(self._capacity_patterns, room_name_lower)
+        if capacity is not None:
+            return capacity
+        
+        # Try keywords
+        for keyword, keyword_capacity in self._capacity_keywords:
+            if keyword in room_name_lower:
+                return int(keyword_capacity)
+        
+        return self._capacity_default
+    
+    def _rule_room_area(self, room_name: str, room_name_lower: str) -> tuple:
+        # Required literals are lowercased for IGNORECASE patterns (see _match_value_patterns)
+        literal_text = room_name_lower if self._area_case_insensitive else room_name
+        prefilter = literal_text.isascii() or not _ASCII_CASE_FOLDS.search(literal_text)
+        for pattern, group, unit, literal in self._area_patterns:
+            if prefilter and literal not in literal_text:
+                continue
+            match = pattern.search(room_name)
+            if match:
+                try:
+                    area_value = float(match.group(group))
+                    
+                    # Return both m2 and sqft
+                    if unit == 'sq_ft':
+                        # Original is square feet
+                        area_sqft = round(area_value, 1)
+                        area_m2 = round(area_value * 0.092903, 1)  # Convert to m2
+                    else:  # unit == 'm2'
+                        # Original is square meters
+                        area_m2 = round(area_value, 1)
+                        area_sqft = round(area_value * 10.764, 1)  # Convert to sqft
+                    
+                    return (area_m2, area_sqft)
+                except (ValueError, IndexError):
+                    continue
+        
+        return (self._area_default, self._area_default)
+    
+    def _rule_room_class(self, room_name: str, room_name_lower: str) -> str:
+        return self._room_class_memo(room_name_lower if self._room_class_case_insensitive else room_name)
+    
+    def _rule_room_quality(self, room_name: str, room_name_lower: str) -> str:
+        return self._match_keyword_section(self._quality_rules, room_name, room_name_lower)
+    
+    def _rule_room_quality_category(self, room_name: str, room_name_lower: str) -> str:
+        return self._match_keyword_section(self._quality_category_rules, room_name, room_name_lower)
+    
+    def _rule_bedding_config(self, room_name: str, room_name_lower: str) -> str:
+        index = self._match_bedding_keyword(room_name, room_name_lower)
+        return self._bedding_config_rules[2] if index is None else self._bedding_config_rules[0][index][1]
+    
+    def _rule_bedding_type(self, room_name: str, room_name_lower: str) -> str:
+        index = self._match_bedding_keyword(room_name, room_name_lower)
+        return None if index is None else self._bedding_type_rules[0][index][1]
+    
+    def _match_bedding_keyword(self, room_name: str, room_name_lower: str) -> Optional[int]:
+        """
+        Index of the first bedding_config keyword found in room name
+        
+        bedding_config and bedding_type scan the same keywords, so the match of
+        the previous room name is reused when both columns are parsed.
+        """
+        last_room_name, last_index = self._last_bedding_match
+        if room_name == last_room_name:
+            return last_index
+        
+        rules, case_insensitive, _, any_keyword = self._bedding_config_rules
+        text = room_name_lower if case_insensitive else room_name
+        index = None
+        if any_keyword is not None and any_keyword.search(text):
+            index = next((position for position, (keyword, _) in enumerate(rules) if keyword in text), None)
+        self._last_bedding_match = (room_name, index)
+        return index
+    
+    def _rule_room_view(self, room_name: str, room_name_lower: str) -> str:
+        return self._match_keyword_section(self._view_rules, room_name, room_name_lower)
+    
+    def _rule_balcony(self, room_name: str, room_name_lower: str) -> int:
+        return self._match_feature('balcony', room_name_lower)
+    
+    def _rule_family_room(self, room_name: str, room_name_lower: str) -> int:
+        return self._match_feature('family_room', room_name_lower)
+    
+    def _rule_club_room(self, room_name: str, room_name_lower: str) -> int:
+        return self._match_feature('club_room', room_name_lower)
+    
+    def _rule_room_keywords(self, room_name: str, room_name_lower: str) -> str:
+        case_insensitive = self._keywords_case_insensitive
+        force_include = self._keywords_force_include
+        exclude_words = self._keywords_exclude
+        min_word_length = self._keywords_min_length
+        max_keywords = self._keywords_max
+        
+        # Remove parentheses, brackets, commas, and other common separators, then split into words
+        words = _KEYWORD_SEPARATORS.sub(' ', room_name.strip()).split()
+        
+        keywords = []
+        for word in words:
+            # Clean word (remove punctuation at start/end)
+            clean_word = word if word.isalnum() else _WORD_EDGE_PUNCTUATION.sub('', word)
+            
+            if not clean_word:
+                continue
+            
+            # Convert to lowercase for comparison if case insensitive
+            word_for_comparison = clean_word.lower() if case_insensitive else clean_word
+            
+            # Check minimum length
+            if len(clean_word) < min_word_length:
+                continue
+            
+            # Check if word should be force included
+            if word_for_comparison in force_include:
+                if clean_word not in keywords:  # Avoid duplicates
+                    keywords.append(clean_word)
+                continue
+            
+            # Check if word should be excluded
+            if word_for_comparison in exclude_words:
+                continue
+            
+            # Check if it's a number (usually not interesting as keyword)
+            if clean_word.isdigit():
+                continue
+            
+            # Add keyword if not already present
+            if clean_word not in keywords:
+                keywords.append(clean_word)
+            
+            # Stop if we've reached max keywords
+            if len(keywords) >= max_keywords:
+                break
+        
+        # Return keywords as comma-separated string or default
+        if keywords:
+            return ', '.join(keywords)
+        else:
+            return self._keywords_default
+    
+    # ===== BATCH PARSING =====
+    
+    def _column_parsers(self, columns) -> list:
+        """
+        Resolve parse function of each column for the current provider
+        
+        Returns:
+            List of (present_name_parser(room_name, room_name_lower), missing_name_parser(room_name))
+        """
+        parsers = []
+        for column in columns:
+            public_parser = getattr(self, f'parse_{column}')
+            provider_parser = getattr(self, f'_parse_{column}_{self.provider}', None)
+            if provider_parser is not None:
+                parsers.append((lambda room_name, room_name_lower, parse=provider_parser: parse(room_name), public_parser))
+            else:
+                parsers.append((getattr(self, f'_rule_{column}'), public_parser))
+        return parsers
+    
+    def parse_room_columns(self, room_name: str, columns=PARSED_COLUMNS) -> Dict[str, Any]:
+        """
+        Parse all standardized columns of a room name in one pass
+        
+        Same values as the individual parse_* functions; the room name is
+        lowercased once and every column uses precompiled rules.
+        
+        Args:
+            room_name: Room name to parse
+            columns: Columns to parse (default: all PARSED_COLUMNS)
+        
+        Returns:
+            Dict column -> value (room_area as (area_m2, area_sqft) tuple)
+        """
+        return dict(zip(columns, self._parse_rows([room_name], self._column_parsers(columns))[0]))
+    
+    @staticmethod
+    def _parse_rows(room_names, parsers: list) -> list:
+        """Fused pass: one tuple of column values per room name (each distinct name is parsed once)"""
+        fast_parsers = [parse for parse, _ in parsers]
+        parsed = {}
+        rows = []
+        for room_name in room_names:
+            row = parsed.get(room_name) if isinstance(room_name, str) else None
+            if row is None:
+                if _is_missing(room_name):
+                    row = tuple([parse_missing(room_name) for _, parse_missing in parsers])
+                else:
+                    text = room_name if isinstance(room_name, str) else str(room_name)
+                    text_lower = text.lower()
+                    row = tuple([parse(text, text_lower) for parse in fast_parsers])
+                    if text is room_name:
+                        parsed[room_name] = row
+            rows.append(row)
+        return rows
+    
     # ===== PROVIDER-SPECIFIC METHODS =====
     
     def _parse_main_name_tbo(self, room_name: str) -> str:
         """TBO-specific main_name parsing - take only text before first comma"""
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return ''
         
         main_name = str(room_name).strip()
         
         # TBO SPECIFIC LOGIC: Take only text before first comma
-        # Example: "Superior Room, 1 King Bed (Palace, with Waterpark Access),NonSmoking" 
+        # Example: "Superior Room, 1 King Bed (Palace, with Waterpark Access),NonSmoking"
         #          -> "Superior Room"
         if ',' in main_name:
             main_name = main_name.split(',')[0].strip()
         
         # Apply additional TBO-specific cleaning patterns if needed
-        tbo_patterns = [
-            r'\s*-\s*TBO Special Deal.*',
-            r'\s*\[TBO Offer\].*',
-        ]
-        
-        for pattern in tbo_patterns:
-            main_name = re.sub(pattern, '', main_name, flags=re.IGNORECASE)
+        for pattern in _TBO_CLEANING_PATTERNS:
+            main_name = pattern.sub('', main_name)
         
         # Apply final cleanup (remove extra spaces, normalize)
-        main_name = re.sub(r'\s+', ' ', main_name).strip()
+        main_name = _WHITESPACE_RUNS.sub(' ', main_name).strip()
         
         return main_name
     
     def _parse_bedrooms_count_ratehawk(self, room_name: str) -> int:
         """RateHawk-specific bedrooms parsing (example)"""
-        if pd.isna(room_name) or room_name == '':
+        if _is_missing(room_name):
             return 0
         
         # RateHawk może mieć inne konwencje nazewnictwa
         room_name_lower = str(room_name).lower()
         
-        # Przykład: RateHawk używa "br" zamiast "bedroom"
-        ratehawk_patterns = [
-            (r'(\d+)\s*br\b', 1),
-            (r'(\d+)\s*-\s*br\b', 1),
-        ]
-        
-        for pattern, group in ratehawk_patterns:
-            match = re.search(pattern, room_name_lower)
+        for pattern, group in _RATEHAWK_BEDROOM_PATTERNS:
+            match = pattern.search(room_name_lower) if 'br' in room_name_lower else None
             if match:
                 try:
                     return int(match.group(group))
@@ -790,61 +962,32 @@ class RoomDataParser:
     
     def _apply_universal_cleaning(self, room_name: str) -> str:
         """Apply universal cleaning patterns"""
-        cleaning_patterns = self.config.get('room_name_cleaning', {}).get('remove_patterns', [])
-        
-        for pattern_config in cleaning_patterns:
-            pattern = pattern_config['pattern']
-            room_name = re.sub(pattern, '', room_name, flags=re.IGNORECASE)
-        
-        # Apply final cleanup
-        final_cleanup = self.config.get('room_name_cleaning', {}).get('final_cleanup', [])
-        
-        for pattern_config in final_cleanup:
-            pattern = pattern_config['pattern']
-            replacement = pattern_config.get('replacement', '')
-            room_name = re.sub(pattern, replacement, room_name)
+        # Remove patterns, then final cleanup
+        for pattern, replacement, literal in self._cleaning_rules:
+            if literal in room_name:
+                room_name = pattern.sub(replacement, room_name)
         
         return room_name.strip()
     
     def _parse_bedrooms_count_universal(self, room_name: str) -> int:
         """Universal bedrooms parsing logic"""
-        room_name_lower = str(room_name).lower()
-        
-        # Get patterns from config
-        bedroom_patterns = self.config.get('parsing_patterns', {}).get('bedrooms_count', {})
-        patterns = bedroom_patterns.get('patterns', [])
-        default_value = bedroom_patterns.get('default', 0)
-        
-        # Try each pattern
-        for pattern_config in patterns:
-            pattern = pattern_config['pattern']
-            group = pattern_config.get('group', 1)
-            fixed_value = pattern_config.get('value', None)
-            case_insensitive = pattern_config.get('case_insensitive', True)
-            
-            flags = re.IGNORECASE if case_insensitive else 0
-            match = re.search(pattern, room_name_lower, flags=flags)
-            
-            if match:
-                # If pattern has a fixed value, return it
-                if fixed_value is not None:
-                    return int(fixed_value)
-                try:
-                    return int(match.group(group))
-                except (ValueError, IndexError):
-                    continue
-        
-        return default_value
+        bedrooms = self._match_value_patterns(self._bedroom_patterns, str(room_name).lower())
+        return self._bedrooms_default if bedrooms is None else bedrooms
     
-    def process_api(self, input_csv_path: str, output_csv_path: str, provider: str) -> bool:
+    def process_api(self, input_csv_path: str, output_csv_path: str, provider: str,
+                    chunk_size: int = PROCESS_CHUNK_SIZE) -> bool:
         """
         Process API data by applying all parsing functions to create standardized columns
         
+        Rows are read and written in chunks of chunk_size; every chunk is parsed
+        in one fused pass over room_name (parse_room_columns).
+        
         Args:
             input_csv_path: Path to input CSV file
             output_csv_path: Path to output CSV file
             provider: API provider name
-            
+            chunk_size: Rows processed at a time
+        
         Returns:
             True if successful, False otherwise
         """
@@ -852,81 +995,66 @@ class RoomDataParser:
             # Set provider for this processing session
             self.provider = provider
             
-            # Load data
-            df = pd.read_csv(input_csv_path)
-            
-            # Handle main_name based on provider
-            if provider == 'ratehawk':
-                # RateHawk: Use existing main_name from source file (already clean)
-                # main_name column already exists and is good quality
-                pass
-            else:
-                # Other APIs: Generate main_name by processing room_name
-                df['main_name'] = df['room_name'].apply(self.parse_main_name)
-            
-            # Apply all other parsing functions to create standardized columns
-            df['bedrooms_count'] = df['room_name'].apply(self.parse_bedrooms_count)
-            df['room_capacity'] = df['room_name'].apply(self.parse_room_capacity)
-            
-            # Parse room area (returns tuple: area_m2, area_sqft)
-            area_results = df['room_name'].apply(self.parse_room_area)
-            df['room_area_m2'] = [result[0] for result in area_results]
-            df['room_area_sqft'] = [result[1] for result in area_results]
-            
-            df['room_quality'] = df['room_name'].apply(self.parse_room_quality)
-            df['bedding_type'] = df['room_name'].apply(self.parse_bedding_type)
-            df['bedding_config'] = df['room_name'].apply(self.parse_bedding_config)
-            df['room_class'] = df['room_name'].apply(self.parse_room_class)
-            df['balcony'] = df['room_name'].apply(self.parse_balcony)
-            df['family_room'] = df['room_name'].apply(self.parse_family_room)
-            df['club_room'] = df['room_name'].apply(self.parse_club_room)
-            df['room_view'] = df['room_name'].apply(self.parse_room_view)
-            df['room_keywords'] = df['room_name'].apply(self.parse_room_keywords)
-            
-            # Select and reorder columns according to target structure
-            target_columns = [
-                'reference_id', 'ref_hotel_name', 'hotel_id', 'hotel_name', 'room_name', 
-                'main_name', 'bedrooms_count', 'room_capacity', 'room_area_m2', 'room_area_sqft',
-                'room_quality', 'bedding_type', 'bedding_config', 'room_class', 'balcony', 
-                'family_room', 'club_room', 'room_view', 'room_keywords'
-            ]
-            
-            # Create output dataframe with only target columns
-            output_df = df[target_columns]
-            
-            # Replace undefined and 0 values with null for better data quality
-            # Apply to specific columns where these values should be null
-            columns_to_clean = [
-                'room_quality', 'bedding_type', 'bedding_config', 'room_class', 'room_view', 'room_keywords'
-            ]
+            # RateHawk: Use existing main_name from source file (already clean);
+            # other APIs: Generate main_name by processing room_name
+            columns = [column for column in PARSED_COLUMNS
+                       if column != 'room_quality_category' and not (column == 'main_name' and provider == 'ratehawk')]
+            parsers = self._column_parsers(columns)
             
-            for col in columns_to_clean:
-                if col in output_df.columns:
-                    output_df[col] = output_df[col].replace(['undefined', 'undefined_value', '0'], None)
+            # Text as in the file - column types do not depend on the rows of a chunk
+            chunks = pd.read_csv(input_csv_path, chunksize=chunk_size, dtype=str, keep_default_na=False, na_values=[''])
             
-            # Also clean numeric columns where 0 should be null
-            numeric_columns_to_clean = ['bedrooms_count', 'room_capacity', 'balcony', 'family_room', 'club_room']
+            written = False
+            for chunk in chunks:
+                output_df = self._standardize_chunk(chunk, columns, parsers)
+                output_df.to_csv(output_csv_path, index=False, mode='a' if written else 'w', header=not written)
+                written = True
             
-            for col in numeric_columns_to_clean:
-                if col in output_df.columns:
-                    output_df[col] = output_df[col].replace([0, '0'], None)
-            
-            # Clean room area columns where 0.0 should be null
-            area_columns_to_clean = ['room_area_m2', 'room_area_sqft']
-            for col in area_columns_to_clean:
-                if col in output_df.columns:
-                    output_df[col] = output_df[col].replace([0.0, '0.0', 0], None)
-            
-            # Save processed data
-            output_df.to_csv(output_csv_path, index=False)
+            if not written:
+                pd.DataFrame(columns=PROCESS_API_COLUMNS).to_csv(output_csv_path, index=False)
             
             return True
-            
+        
         except Exception as e:
             print(f"Error processing {provider}: {e}")
             return False
     
-
+    def _standardize_chunk(self, df: pd.DataFrame, columns: list, parsers: list) -> pd.DataFrame:
+        """
+        Parse standardized columns of a chunk and select process_api output columns
+        
+        Undefined and 0 values are replaced with null for better data quality;
+        numeric columns are written as floats.
+        """
+        parsed = dict(zip(columns, zip(*self._parse_rows(df['room_name'].tolist(), parsers)))) if len(df) else {}
+        
+        output = {column: df[column] for column in PROCESS_API_COLUMNS if column in df.columns}
+        for column in columns:
+            values = parsed.get(column, ())
+            if column == 'room_area':
+                output['room_area_m2'] = [self._null_if_zero(area[0]) for area in values]
+                output['room_area_sqft'] = [self._null_if_zero(area[1]) for area in values]
+            elif column in NUMERIC_COLUMNS_TO_CLEAN:
+                output[column] = [self._null_if_zero(value) for value in values]
+            elif column in TEXT_COLUMNS_TO_CLEAN:
+                output[column] = [None if value in NULL_TEXT_VALUES else value for value in values]
+            else:
+                output[column] = list(values)
+        
+        output_df = pd.DataFrame(output, index=df.index)
+        for column in ('room_area_m2', 'room_area_sqft') + NUMERIC_COLUMNS_TO_CLEAN:
+            if column in output_df.columns:
+                output_df[column] = output_df[column].astype('float64')
+        
+        # Select and reorder columns according to target structure
+        return output_df[PROCESS_API_COLUMNS]
+    
+    @staticmethod
+    def _null_if_zero(value):
+        """None for missing and 0 values"""
+        if value is None or value == 0 or value == '0' or value == '0.0':
+            return None
+        return value
 
 
 def process_goglobal_step_by_step(step: str = 'main_name', provider: str = 'goglobal'):
@@ -1,19 +1,24 @@
 import os
+import json
 import logging
 import uuid
 import asyncio
+from collections.abc import MutableMapping
 from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from app.models.request import HotelSearchRequest
-from app.models.response import HotelSearchResponse, ProviderResult, MetaInfo
+from app.models.response import HotelSearchResponse, MetaInfo
+from app.models.compact_offer import materialize_offers
 from app.services.universal_provider import universal_provider
 from app.services.blob_storage import blob_storage_service
 from app.utils.logger import get_logger
+from app.utils.loop_monitor import start_loop_monitor_if_enabled
 from app.config import Config
 
 # Load environment variables
@@ -286,45 +291,64 @@ def _validate_meal_types(request: HotelSearchRequest, criteria: dict, session_lo
         criteria["meal_types"] = request.meal_types
 
 
-def _process_provider_results(aggregated_results: dict, session_logger) -> dict:
-    """Process and validate provider results"""
-    results_by_provider = {}
-    for provider_name, provider_result in aggregated_results["providers"].items():
-        if provider_result["status"] == "success":
-            # Validate offers data before processing
-            offers_data = provider_result.get("offers", [])
-            if not isinstance(offers_data, list):
-                session_logger.warning(f"Provider {provider_name} returned non-list offers: {type(offers_data)}")
-                offers_data = []
-
-            # Validate each offer has required fields
-            validated_offers = []
-            for i, offer in enumerate(offers_data):
-                if not isinstance(offer, dict):
-                    session_logger.warning(f"Provider {provider_name} offer {i} is not dict: {type(offer)}")
-                    continue
-
-                # Check for required fields
-                required_fields = ["total_price", "currency", "room_name"]
-                if all(field in offer for field in required_fields):
-                    validated_offers.append(offer)
+def _validate_provider_offers(provider_name: str, provider_result: dict) -> list:
+    """Validate successful provider's offers and set their provider field (in place, no copies)"""
+    # Validate offers data before processing
+    offers_data = provider_result.get("offers", [])
+    if not isinstance(offers_data, list):
+        session_logger.warning(f"Provider {provider_name} returned non-list offers: {type(offers_data)}")
+        offers_data = []
+
+    # Process and add each offer with provider field
+    validated_offers = []
+    for i, offer in enumerate(offers_data):
+        if not isinstance(offer, MutableMapping):
+            session_logger.warning(f"Provider {provider_name} offer {i} is not an offer mapping: {type(offer)}")
+            continue
+
+        # Check for required fields
+        required_fields = ["total_price", "currency", "room_name"]
+        if all(field in offer for field in required_fields):
+            # Provider is the first field of materialized CompactOffers
+            offer["provider"] = provider_name
+            validated_offers.append(offer)
+        else:
+            missing = [f for f in required_fields if f not in offer]
+            session_logger.warning(f"Provider {provider_name} offer {i} missing fields: {missing}")
+
+    return validated_offers
+
+
+def _response_fields() -> list:
+    """Offer fields returned to clients - room_category is always set by categorization"""
+    return Config.get_allowed_fields() + ["room_category"]
+
+
+def _categorize_rooms(offers: list) -> None:
+    """Set room_category on offers in place based on room_name"""
+    try:
+        from app.services.room_mapping import get_room_mapping_service
+        room_service = get_room_mapping_service()
+
+        for offer in offers:
+            room_name = offer.get('room_name', '')
+            if room_name:
+                room_category = room_service.get_room_class(room_name)
+                if room_category:
+                    # Format room_class to be more readable (e.g. junior_suite -> Junior Suite)
+                    offer['room_category'] = room_category.replace('_', ' ').title()
                 else:
-                    missing = [f for f in required_fields if f not in offer]
-                    session_logger.warning(f"Provider {provider_name} offer {i} missing fields: {missing}")
+                    offer['room_category'] = 'Other'
+            else:
+                offer['room_category'] = 'Other'
 
-            results_by_provider[provider_name] = ProviderResult(
-                status="success",
-                data=validated_offers,
-                error=None
-            )
-        else:
-            results_by_provider[provider_name] = ProviderResult(
-                status="error",
-                data=None,
-                error=provider_result.get("error", "Unknown error")
-            )
+        logger.info(f"[NORMALIZATION] Room categorization completed successfully")
 
-    return results_by_provider
+    except Exception as e:
+        logger.error(f"[NORMALIZATION] Room categorization failed: {e}")
+        # Continue processing - set all to 'Other' if categorization fails
+        for offer in offers:
+            offer.setdefault('room_category', 'Other')
 
 
 @app.post("/hotels/search",
@@ -440,36 +464,16 @@ async def search_hotels(request: HotelSearchRequest):
         for provider_name, provider_result in aggregated_results["providers"].items():
             if provider_result["status"] == "success":
                 successful_providers += 1
-                # Validate offers data before processing
-                offers_data = provider_result.get("offers", [])
-                if not isinstance(offers_data, list):
-                    session_logger.warning(f"Provider {provider_name} returned non-list offers: {type(offers_data)}")
-                    offers_data = []
-
-                # Process and add each offer with provider field
-                validated_offers = []
-                for i, offer in enumerate(offers_data):
-                    if not isinstance(offer, dict):
-                        session_logger.warning(f"Provider {provider_name} offer {i} is not dict: {type(offer)}")
-                        continue
-
-                    # Check for required fields
-                    required_fields = ["total_price", "currency", "room_name"]
-                    if all(field in offer for field in required_fields):
-                        # Create new offer with provider field first for proper ordering
-                        ordered_offer = {"provider": provider_name}
-                        ordered_offer.update(offer)
-                        validated_offers.append(ordered_offer)
-                        all_offers.append(ordered_offer)
-                    else:
-                        missing = [f for f in required_fields if f not in offer]
-                        session_logger.warning(f"Provider {provider_name} offer {i} missing fields: {missing}")
+                validated_offers = _validate_provider_offers(provider_name, provider_result)
+                all_offers.extend(validated_offers)
 
                 provider_breakdown[provider_name] = {
                     "status": "success",
                     "offers_count": len(validated_offers),
                     "processing_time_ms": provider_result.get("processing_time_ms")
                 }
+                if provider_result.get("cache"):
+                    provider_breakdown[provider_name]["cache"] = provider_result["cache"]
             else:
                 provider_breakdown[provider_name] = {
                     "status": "error",
@@ -480,36 +484,11 @@ async def search_hotels(request: HotelSearchRequest):
 
         logger.info(f"[NORMALIZATION] Processed {len(all_offers)} offers from {successful_providers} providers")
 
-        # Filter fields
-        filtered_offers = Config.filter_response_data(all_offers)
+        # Apply room categorization to all offers centrally (in place)
+        _categorize_rooms(all_offers)
 
-        # Apply room categorization to all offers centrally (final step)
-        try:
-            from app.services.room_mapping import get_room_mapping_service
-            room_service = get_room_mapping_service()
-            
-            categorized_count = 0
-            for offer in filtered_offers:
-                room_name = offer.get('room_name', '')
-                if room_name:
-                    room_category = room_service.get_room_class(room_name)
-                    if room_category:
-                        # Format room_class to be more readable (e.g. junior_suite -> Junior Suite)
-                        formatted_category = room_category.replace('_', ' ').title()
-                        offer['room_category'] = formatted_category
-                        categorized_count += 1
-                    else:
-                        offer['room_category'] = 'Other'
-                else:
-                    offer['room_category'] = 'Other'
-            
-            logger.info(f"[NORMALIZATION] Room categorization completed successfully")
-            
-        except Exception as e:
-            logger.error(f"[NORMALIZATION] Room categorization failed: {e}")
-            # Continue processing - set all to 'Other' if categorization fails
-            for offer in filtered_offers:
-                offer.setdefault('room_category', 'Other')
+        # Filter fields while materializing response dicts - the only per-offer copy
+        filtered_offers = materialize_offers(all_offers, _response_fields())
 
         # Simple final results
         processing_time = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -536,7 +515,8 @@ async def search_hotels(request: HotelSearchRequest):
                 "successful_providers": successful_providers,
                 "total_results": len(all_offers),
                 "processing_time_ms": processing_time,
-                "provider_breakdown": provider_breakdown
+                "provider_breakdown": provider_breakdown,
+                "cache": aggregated_results["summary"].get("cache")
             },
             "search_criteria": {
                 "hotel_names": request.hotel_names,
@@ -590,6 +570,112 @@ async def search_hotels(request: HotelSearchRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+
+def format_stream_event(event: dict, stream_format: str = "ndjson") -> str:
+    """Serialize stream event as NDJSON line or Server-Sent Event"""
+    data = json.dumps(event, default=str)
+    if stream_format == "sse":
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+def prepare_stream_search(request: HotelSearchRequest):
+    """
+    Validate streaming search request before the response starts.
+
+    Returns:
+        Tuple (request_id, criteria) - raises HTTPException on invalid meal types
+    """
+    request_id = f"req_{int(datetime.utcnow().timestamp())}_{uuid.uuid4().hex[:8]}"
+    logger.info(f"[SEARCH] Started streaming session: {request_id}")
+
+    criteria = _prepare_search_criteria(request)
+    _validate_meal_types(request, criteria, logger, request_id)
+    return request_id, criteria
+
+
+async def stream_search_events(request_id: str, criteria: dict):
+    """
+    Run search and yield one event per provider as soon as it completes,
+    followed by a final summary event.
+
+    Provider events carry offers processed like /hotels/search (validated,
+    field-filtered, room-categorized); meal filtering is applied in search_single.
+    """
+    async for event in universal_provider.search_stream(criteria):
+        if event["event"] == "summary":
+            logger.info(f"[RESULTS] Streaming search completed: {event['summary'].get('total_offers', 0)} offers")
+            yield {"event": "summary", "request_id": request_id, "summary": event["summary"]}
+            continue
+
+        provider_name = event["provider"]
+        provider_result = event["result"]
+        payload = {
+            "event": "provider",
+            "request_id": request_id,
+            "provider": provider_name,
+            "status": provider_result["status"],
+            "processing_time_ms": provider_result.get("processing_time_ms")
+        }
+        if provider_result.get("cache"):
+            payload["cache"] = provider_result["cache"]
+
+        if provider_result["status"] == "success":
+            offers = _validate_provider_offers(provider_name, provider_result)
+            _categorize_rooms(offers)
+            offers = materialize_offers(offers, _response_fields())
+            payload["offers_count"] = len(offers)
+            payload["data"] = offers
+        else:
+            payload["offers_count"] = 0
+            payload["error"] = provider_result.get("error", "Unknown error")
+            payload["data"] = []
+
+        logger.info(f"[PROVIDERS] Streaming {payload['offers_count']} offers from {provider_name} ({payload['status']})")
+        yield payload
+
+
+@app.post("/hotels/search/stream",
+          tags=["Hotels"],
+          summary="Streaming Hotel Price Search",
+          description="Search hotel prices and stream each provider's offers as soon as they arrive",
+          response_description="NDJSON lines or Server-Sent Events: one event per provider, then a summary event")
+async def search_hotels_stream(request: HotelSearchRequest,
+                               format: str = Query("ndjson", description="Stream format: ndjson or sse")):
+    """
+    **Streaming Multi-Provider Hotel Search**
+
+    Same request as `/hotels/search`, but results are streamed instead of
+    waiting for the slowest provider.
+
+    **Events:**
+    - `provider`: one per provider - status, processing time and normalized offers (`data`)
+    - `summary`: last event - same aggregated statistics as `search_all` summary
+    """
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format '{format}'. Supported formats: {list(STREAM_MEDIA_TYPES)}"
+        )
+
+    request_id, criteria = prepare_stream_search(request)
+
+    async def event_stream():
+        async for event in stream_search_events(request_id, criteria):
+            yield format_stream_event(event, format)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache", "X-Request-ID": request_id}
+    )
+
+
 @app.get("/meal-types")
 async def get_supported_meal_types():
     """Get list of supported meal types with descriptions."""
@@ -765,6 +851,16 @@ async def startup_event():
     logger.info("Starting Hotel Aggregator API")
     logger.info(f"Loaded {len(universal_provider.get_available_providers())} providers: {', '.join(universal_provider.get_available_providers())}")
 
+    # Preload hotel mappings so request-time lookups are served from memory
+    from app.services.hotel_mapping import hotel_mapping_service
+    await hotel_mapping_service.preload()
+
+    # Open keep-alive connections to suppliers before the first search
+    await universal_provider.prewarm_connections()
+
+    # Debug: report event loop blocking (DEBUG_LOOP_BLOCKING=true)
+    start_loop_monitor_if_enabled()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
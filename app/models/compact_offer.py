@@ -0,0 +1,153 @@
+"""
+Compact internal offer representation.
+
+Offers travel from adapter normalize() through meal filtering, validation and
+room categorization as CompactOffer objects: one fixed __slots__ layout instead
+of a dict per offer, updated in place instead of copied at every step. They are
+turned into plain dicts - and from there into the Offer response model - only
+when the response is built (materialize_offers).
+
+CompactOffer keeps the dict interface the pipeline uses (get, [], in, del,
+setdefault, items, copy), so provider and filtering code reads it like the
+dicts it replaces. A field counts as present once assigned; unassigned slots
+behave like missing keys.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Internal offer fields in materialized order: provider first, then Offer model
+# order; offer_id is TBO's booking reference (not part of the response model)
+OFFER_FIELDS = (
+    "provider",
+    "supplier_hotel_id",
+    "hotel_id",
+    "hotel_name",
+    "supplier_room_code",
+    "room_name",
+    "room_category",
+    "room_mapping_id",
+    "total_price",
+    "currency",
+    "meal_plan",
+    "free_cancellation_until",
+    "room_features",
+    "amenities",
+    "offer_id",
+)
+
+_FIELD_SET = frozenset(OFFER_FIELDS)
+
+
+class CompactOffer(MutableMapping):
+    """Offer with a fixed slot per field, read and written like a dict"""
+
+    __slots__ = OFFER_FIELDS
+
+    def __init__(self, **fields: Any):
+        for key, value in fields.items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _FIELD_SET:
+            raise KeyError(f"Unknown offer field: {key}")
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        try:
+            delattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET and hasattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in OFFER_FIELDS if hasattr(self, key))
+
+    def __len__(self) -> int:
+        return sum(1 for key in OFFER_FIELDS if hasattr(self, key))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return default
+
+    def copy(self) -> "CompactOffer":
+        """Shallow copy (same field values)"""
+        offer = CompactOffer()
+        for key in OFFER_FIELDS:
+            try:
+                setattr(offer, key, getattr(self, key))
+            except AttributeError:
+                pass
+        return offer
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Materialize offer as a plain dict.
+
+        Args:
+            fields: Fields to include (default: all present fields)
+
+        Returns:
+            Dict of present fields in OFFER_FIELDS order
+        """
+        keys = OFFER_FIELDS if fields is None else [key for key in OFFER_FIELDS if key in fields]
+        offer = {}
+        for key in keys:
+            try:
+                offer[key] = getattr(self, key)
+            except AttributeError:
+                pass
+        return offer
+
+    def __repr__(self) -> str:
+        return f"CompactOffer({self.to_dict()!r})"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for key, value in state.items():
+            setattr(self, key, value)
+
+
+def materialize_offers(offers: Iterable[MutableMapping], fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Turn pipeline offers into response dicts with the given fields.
+
+    This is the single per-offer copy of the search path.
+
+    Args:
+        offers: CompactOffer (or plain dict) offers
+        fields: Fields to include (default: all)
+
+    Returns:
+        List of offer dicts
+    """
+    fields = frozenset(fields) if fields is not None else None
+    materialized = []
+    for offer in offers:
+        if isinstance(offer, CompactOffer):
+            materialized.append(offer.to_dict(fields))
+        elif fields is None:
+            materialized.append(dict(offer))
+        else:
+            materialized.append({key: value for key, value in offer.items() if key in fields})
+    return materialized
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps default handling CompactOffer (everything else as str)"""
+    if isinstance(value, CompactOffer):
+        return value.to_dict()
+    return str(value)
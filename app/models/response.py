@@ -93,6 +93,11 @@ class MetaInfo(BaseModel):
             "goglobal": {"status": "success", "offers_count": 0, "processing_time_ms": 1029}
         }
     )
+    cache: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Search result cache statistics (null if cache disabled)",
+        example={"hits": 2, "misses": 1, "max_age_seconds": 12.4}
+    )
 
 
 
@@ -1,12 +1,223 @@
-import os
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional, Union
-from contextlib import asynccontextmanager
-import pyodbc
-from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
-from azure.core.exceptions import AzureError
-import struct
+import threading
+import time
+import concurrent.futures
+from collections import deque
+from typing import List, Dict, Any, Optional, Callable
+from contextlib import asynccontextmanager, contextmanager
+
+try:
+    import pyodbc
+except ImportError:  # Allows running the pool against another DB-API driver (e.g. sqlite3)
+    pyodbc = None
+
+
+class ConnectionPoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available within the timeout"""
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of DB-API connections.
+    
+    Connections are created lazily by the `connect` callable up to `max_size`,
+    kept warm between queries and health-checked before reuse when they were
+    idle longer than `health_check_interval`. Connections that raised an error
+    while in use are discarded instead of being returned to the pool.
+    """
+    
+    def __init__(self,
+                 connect: Callable[[], Any],
+                 max_size: int = 10,
+                 acquire_timeout: float = 30.0,
+                 health_check_interval: float = 30.0,
+                 max_idle_time: float = 300.0,
+                 health_check_query: str = "SELECT 1"):
+        """
+        Initialize connection pool.
+        
+        Args:
+            connect: Callable returning a new DB-API connection
+            max_size: Maximum number of open connections
+            acquire_timeout: Max seconds to wait for a free connection
+            health_check_interval: Idle seconds after which connection is pinged before reuse
+            max_idle_time: Idle seconds after which connection is closed instead of reused
+            health_check_query: Query used to ping connections
+        """
+        self._connect = connect
+        self.max_size = max(1, max_size)
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.max_idle_time = max_idle_time
+        self.health_check_query = health_check_query
+        
+        self.logger = logging.getLogger(__name__)
+        
+        self._condition = threading.Condition()
+        self._idle: deque = deque()  # (connection, last_used_timestamp)
+        self._in_use = 0
+        self._closed = False
+        
+        # Metrics
+        self._created = 0
+        self._recycled = 0
+        self._acquired = 0
+        self._timeouts = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+    
+    @property
+    def size(self) -> int:
+        """Number of open connections (idle + in use)"""
+        return self._in_use + len(self._idle)
+    
+    def _close_connection(self, connection) -> None:
+        """Close connection ignoring driver errors"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
+    def _is_healthy(self, connection) -> bool:
+        """Ping connection with health check query"""
+        try:
+            cursor = connection.cursor()
+            cursor.execute(self.health_check_query)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Pooled connection failed health check: {e}")
+            return False
+    
+    def acquire(self):
+        """
+        Get connection from pool, creating a new one if below max_size.
+        Blocks up to acquire_timeout when the pool is exhausted.
+        
+        Returns:
+            DB-API connection
+        """
+        start_time = time.monotonic()
+        deadline = start_time + self.acquire_timeout
+        
+        while True:
+            connection = None
+            last_used = None
+            create_new = False
+            
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                    if self._idle:
+                        connection, last_used = self._idle.pop()  # LIFO - warmest connection first
+                        break
+                    if self.size < self.max_size:
+                        create_new = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise ConnectionPoolTimeoutError(
+                            f"No database connection available within {self.acquire_timeout}s (pool size {self.max_size})"
+                        )
+                    self._condition.wait(remaining)
+                # Reserve slot before leaving the lock
+                self._in_use += 1
+            
+            try:
+                if create_new:
+                    connection = self._connect()
+                    with self._condition:
+                        self._created += 1
+                else:
+                    idle_time = time.monotonic() - last_used
+                    if idle_time > self.max_idle_time or (
+                            idle_time > self.health_check_interval and not self._is_healthy(connection)):
+                        # Stale or broken - drop and try again
+                        self._release_slot(connection, discard=True)
+                        continue
+            except Exception:
+                self._release_slot(None, discard=True)
+                raise
+            
+            wait_time = time.monotonic() - start_time
+            with self._condition:
+                self._acquired += 1
+                self._total_wait_time += wait_time
+                self._max_wait_time = max(self._max_wait_time, wait_time)
+            return connection
+    
+    def _release_slot(self, connection, discard: bool) -> None:
+        """Return connection (or its reserved slot) to the pool"""
+        with self._condition:
+            self._in_use -= 1
+            if connection is not None:
+                if discard or self._closed:
+                    self._recycled += 1
+                else:
+                    self._idle.append((connection, time.monotonic()))
+                    connection = None
+            self._condition.notify()
+        
+        if connection is not None:
+            self._close_connection(connection)
+    
+    def release(self, connection, discard: bool = False) -> None:
+        """
+        Return connection to pool.
+        
+        Args:
+            connection: Connection obtained from acquire()
+            discard: Close connection instead of reusing it (e.g. after an error)
+        """
+        if not discard:
+            try:
+                # Leave no open transaction on a pooled connection
+                connection.rollback()
+            except Exception:
+                discard = True
+        self._release_slot(connection, discard)
+    
+    @contextmanager
+    def connection(self):
+        """Context manager - acquire connection, discard it if the block raises"""
+        connection = self.acquire()
+        try:
+            yield connection
+        except Exception:
+            self.release(connection, discard=True)
+            raise
+        else:
+            self.release(connection)
+    
+    def close(self) -> None:
+        """Close all idle connections; in-use connections are closed on release"""
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._condition.notify_all()
+        for connection in idle:
+            self._close_connection(connection)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool metrics for monitoring"""
+        with self._condition:
+            return {
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "created": self._created,
+                "recycled": self._recycled,
+                "acquired": self._acquired,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait_time / self._acquired * 1000, 2) if self._acquired else 0.0,
+                "max_wait_ms": round(self._max_wait_time * 1000, 2)
+            }
 
 
 class AzureSQLConnector:
@@ -23,7 +234,11 @@ class AzureSQLConnector:
                  use_managed_identity: bool = False,
                  use_azure_ad: bool = False,
                  connection_timeout: int = 30,
-                 command_timeout: int = 30):
+                 command_timeout: int = 30,
+                 pool_size: int = 10,
+                 pool_timeout: float = 30.0,
+                 pool_health_check_interval: float = 30.0,
+                 connect_factory: Optional[Callable[[], Any]] = None):
         """
         Initialize Azure SQL connector.
         
@@ -36,6 +251,11 @@ class AzureSQLConnector:
             use_azure_ad: Use Azure AD authentication
             connection_timeout: Connection timeout in seconds
             command_timeout: Command timeout in seconds
+            pool_size: Maximum number of pooled connections
+            pool_timeout: Max seconds to wait for a free pooled connection
+            pool_health_check_interval: Idle seconds after which connection is pinged before reuse
+            connect_factory: Optional callable returning a DB-API connection
+                (replaces pyodbc, e.g. lambda: sqlite3.connect(path, check_same_thread=False))
         """
         self.server = server
         self.database = database
@@ -49,12 +269,29 @@ class AzureSQLConnector:
         # Initialize logger
         self.logger = logging.getLogger(__name__)
         
-        # Connection pool settings
-        self.pool = None
-        self.connection_string = self._build_connection_string()
+        # Connection pool with one long-lived executor for blocking driver calls
+        if connect_factory is None:
+            self.connection_string = self._build_connection_string()
+            connect_factory = lambda: pyodbc.connect(self.connection_string)
+        else:
+            self.connection_string = None
+        
+        self.pool = ConnectionPool(
+            connect=connect_factory,
+            max_size=pool_size,
+            acquire_timeout=pool_timeout,
+            health_check_interval=pool_health_check_interval
+        )
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.pool.max_size,
+            thread_name_prefix="azure-sql"
+        )
         
     def _get_available_driver(self) -> str:
         """Get available ODBC driver for SQL Server"""
+        if pyodbc is None:
+            raise ImportError("pyodbc is required for Azure SQL connections")
+        
         available_drivers = pyodbc.drivers()
         
         # Priority order of drivers to try
@@ -121,7 +358,7 @@ class AzureSQLConnector:
     def test_connection(self) -> bool:
         """Test database connection."""
         try:
-            with pyodbc.connect(self.connection_string) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT 1")
                 result = cursor.fetchone()
@@ -132,35 +369,63 @@ class AzureSQLConnector:
             self.logger.error(f"Database connection test failed: {str(e)}")
             return False
     
+    async def _run_in_executor(self, func: Callable, *args):
+        """Run blocking driver call on the connector's dedicated executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
     @asynccontextmanager
     async def get_connection(self):
-        """Get database connection with context manager."""
+        """Get pooled database connection with context manager."""
         connection = None
+        failed = False
         try:
-            # For async operations, we might need to use threading
-            import concurrent.futures
-            
-            loop = asyncio.get_event_loop()
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                connection = await loop.run_in_executor(
-                    executor, pyodbc.connect, self.connection_string
-                )
-                
+            connection = await self._run_in_executor(self.pool.acquire)
             yield connection
             
         except Exception as e:
+            failed = True
             self.logger.error(f"Failed to get database connection: {str(e)}")
             raise
         finally:
             if connection:
-                connection.close()
+                # Broken connections are recycled instead of returned to the pool.
+                # Released inline, not on the executor: its workers may all be blocked
+                # in acquire() waiting for exactly this release.
+                self.pool.release(connection, failed)
+    
+    def _execute_query_sync(self, query: str, parameters, fetch_results: bool) -> Optional[List[Dict[str, Any]]]:
+        """Blocking part of execute_query - runs on the executor with a pooled connection"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            if parameters:
+                cursor.execute(query, parameters)
+            else:
+                cursor.execute(query)
+            
+            if fetch_results:
+                # Get column names
+                columns = [column[0] for column in cursor.description] if cursor.description else []
+                
+                # Fetch all results and convert to list of dictionaries
+                results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                
+                self.logger.info(f"Query executed successfully, returned {len(results)} rows")
+                return results
+            else:
+                # For INSERT, UPDATE, DELETE operations
+                conn.commit()
+                affected_rows = cursor.rowcount
+                self.logger.info(f"Query executed successfully, affected {affected_rows} rows")
+                return None
     
     async def execute_query(self, 
                           query: str, 
                           parameters: Optional[Dict[str, Any]] = None,
                           fetch_results: bool = True) -> Optional[List[Dict[str, Any]]]:
         """
-        Execute SQL query asynchronously.
+        Execute SQL query asynchronously on a pooled connection.
         
         Args:
             query: SQL query to execute
@@ -171,35 +436,7 @@ class AzureSQLConnector:
             Query results as list of dictionaries or None
         """
         try:
-            async with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                if parameters:
-                    cursor.execute(query, parameters)
-                else:
-                    cursor.execute(query)
-                
-                if fetch_results:
-                    # Get column names
-                    columns = [column[0] for column in cursor.description] if cursor.description else []
-                    
-                    # Fetch all results
-                    rows = cursor.fetchall()
-                    
-                    # Convert to list of dictionaries
-                    results = []
-                    for row in rows:
-                        row_dict = dict(zip(columns, row))
-                        results.append(row_dict)
-                    
-                    self.logger.info(f"Query executed successfully, returned {len(results)} rows")
-                    return results
-                else:
-                    # For INSERT, UPDATE, DELETE operations
-                    conn.commit()
-                    affected_rows = cursor.rowcount
-                    self.logger.info(f"Query executed successfully, affected {affected_rows} rows")
-                    return None
+            return await self._run_in_executor(self._execute_query_sync, query, parameters, fetch_results)
                     
         except Exception as e:
             self.logger.error(f"Query execution failed: {str(e)}")
@@ -208,6 +445,15 @@ class AzureSQLConnector:
                 self.logger.error(f"Parameters: {parameters}")
             raise
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool metrics (in use, idle, wait time, created)"""
+        return self.pool.get_stats()
+    
+    def close(self) -> None:
+        """Close pooled connections and shut down the executor"""
+        self.pool.close()
+        self._executor.shutdown(wait=False)
+    
     async def execute_stored_procedure(self, 
                                      procedure_name: str, 
                                      parameters: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
@@ -262,27 +508,30 @@ class AzureSQLConnector:
             
             insert_query = f"INSERT INTO {table_name} ({column_names}) VALUES ({placeholders})"
             
-            # Process data in batches
-            total_inserted = 0
-            
-            async with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                for i in range(0, len(data), batch_size):
-                    batch = data[i:i + batch_size]
-                    
-                    # Prepare batch data
-                    batch_values = []
-                    for record in batch:
-                        values = [record.get(col) for col in columns]
-                        batch_values.append(values)
-                    
-                    # Execute batch
-                    cursor.executemany(insert_query, batch_values)
-                    conn.commit()
+            # Process data in batches on a single pooled connection
+            def insert_batches() -> int:
+                inserted = 0
+                with self.pool.connection() as conn:
+                    cursor = conn.cursor()
                     
-                    total_inserted += len(batch)
-                    self.logger.info(f"Inserted batch: {len(batch)} records (Total: {total_inserted})")
+                    for i in range(0, len(data), batch_size):
+                        batch = data[i:i + batch_size]
+                        
+                        # Prepare batch data
+                        batch_values = []
+                        for record in batch:
+                            values = [record.get(col) for col in columns]
+                            batch_values.append(values)
+                        
+                        # Execute batch
+                        cursor.executemany(insert_query, batch_values)
+                        conn.commit()
+                        
+                        inserted += len(batch)
+                        self.logger.info(f"Inserted batch: {len(batch)} records (Total: {inserted})")
+                return inserted
+            
+            total_inserted = await self._run_in_executor(insert_batches)
             
             self.logger.info(f"Bulk insert completed successfully: {total_inserted} records")
             return True
@@ -354,6 +603,9 @@ def create_azure_sql_connector_from_env() -> AzureSQLConnector:
     use_azure_ad = Config.USE_AZURE_AD
     connection_timeout = Config.SQL_CONNECTION_TIMEOUT
     command_timeout = Config.SQL_COMMAND_TIMEOUT
+    pool_size = Config.SQL_POOL_SIZE
+    pool_timeout = Config.SQL_POOL_TIMEOUT
+    pool_health_check_interval = Config.SQL_POOL_HEALTH_CHECK_INTERVAL
     
     if not server or not database:
         raise ValueError("AZURE_SQL_SERVER and AZURE_SQL_DATABASE configuration are required")
@@ -366,10 +618,33 @@ def create_azure_sql_connector_from_env() -> AzureSQLConnector:
         use_managed_identity=use_managed_identity,
         use_azure_ad=use_azure_ad,
         connection_timeout=connection_timeout,
-        command_timeout=command_timeout
+        command_timeout=command_timeout,
+        pool_size=pool_size,
+        pool_timeout=pool_timeout,
+        pool_health_check_interval=pool_health_check_interval
     )
 
 
+# Shared connector - one connection pool for all services in the process
+_shared_connector: Optional[AzureSQLConnector] = None
+_shared_connector_lock = threading.Lock()
+
+
+def get_shared_azure_sql_connector() -> AzureSQLConnector:
+    """
+    Get process-wide Azure SQL connector (created on first use).
+    
+    HotelMapping, MealMapping and DatabaseOperations share it, so they reuse
+    the same warm connection pool.
+    """
+    global _shared_connector
+    if _shared_connector is None:
+        with _shared_connector_lock:
+            if _shared_connector is None:
+                _shared_connector = create_azure_sql_connector_from_env()
+    return _shared_connector
+
+
 # Example usage and testing
 if __name__ == "__main__":
     async def main():
@@ -7,7 +7,7 @@ import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
-from app.services.azure_sql_connector import AzureSQLConnector, create_azure_sql_connector_from_env
+from app.services.azure_sql_connector import AzureSQLConnector, get_shared_azure_sql_connector
 from app.config import Config
 
 # Initialize logger
@@ -17,8 +17,9 @@ logger = logging.getLogger(__name__)
 class DatabaseOperations:
     """Klasa zawierająca przykładowe operacje na bazie danych."""
     
-    def __init__(self, connector: AzureSQLConnector):
-        self.connector = connector
+    def __init__(self, connector: Optional[AzureSQLConnector] = None):
+        # Domyślnie współdzielony connector (wspólna pula połączeń)
+        self.connector = connector or get_shared_azure_sql_connector()
         self.logger = logging.getLogger(__name__)
     
     async def create_sample_tables(self) -> bool:
@@ -345,7 +346,7 @@ async def test_azure_sql_connection():
     """Testuje połączenie z Azure SQL."""
     try:
         # Utworzenie connectora z konfiguracji środowiska
-        connector = create_azure_sql_connector_from_env()
+        connector = get_shared_azure_sql_connector()
         
         # Test połączenia
         if connector.test_connection():
@@ -377,7 +378,7 @@ async def demo_database_operations():
     """Demonstracja operacji na bazie danych."""
     try:
         # Utworzenie connectora
-        connector = create_azure_sql_connector_from_env()
+        connector = get_shared_azure_sql_connector()
         operations = DatabaseOperations(connector)
         
         print("\n🚀 Starting Azure SQL Database Demo...")
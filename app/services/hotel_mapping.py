@@ -1,20 +1,45 @@
 import asyncio
 import concurrent.futures
+import time
 from typing import Optional, List, Dict
 import logging
 import pandas as pd
 
-from app.services.azure_sql_connector import create_azure_sql_connector_from_env
+from app.services.azure_sql_connector import get_shared_azure_sql_connector
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
 class HotelMapping:
-    """Azure SQL Database hotel mapping service for all providers"""
+    """
+    Azure SQL Database hotel mapping service for all providers.
     
+    The whole hotel_mappings table is preloaded into in-memory indexes so that
+    search-time lookups need no database round-trip:
+    - forward index: ref_hotel_name -> {provider: provider_hotel_id}
+    - reverse index: provider -> {provider_hotel_id: ref_hotel_name}
+    Indexes are refreshed in the background once they are older than the TTL.
+    After a failed load, lookups don't retry it before the retry interval passes.
+    """
+
+    # SQL Server allows max 2100 parameters per statement
+    RESOLVE_BATCH_SIZE = 1000
+
     def __init__(self):
         self.sql_connector = None
         self.provider_configs: Dict[str, Dict] = {}
+        
+        # In-memory mapping cache
+        self._forward_index: Dict[str, Dict[str, str]] = {}
+        self._reverse_index: Dict[str, Dict[str, str]] = {}
+        self._cache_loaded_at: Optional[float] = None
+        self._cache_ttl = config.HOTEL_MAPPING_CACHE_TTL
+        self._retry_interval = config.HOTEL_MAPPING_RETRY_INTERVAL
+        self._last_load_attempt_at: Optional[float] = None
+        self._last_load_failed = False
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        
         self._load_provider_configs()
         self._initialize_sql_connector()
     
@@ -41,12 +66,297 @@ class HotelMapping:
                 self.sql_connector = None
                 return
                 
-            self.sql_connector = create_azure_sql_connector_from_env()
+            self.sql_connector = get_shared_azure_sql_connector()
             logger.info("Azure SQL connector initialized for hotel mapping")
         except Exception as e:
             logger.error(f"Failed to initialize SQL connector: {e}")
             self.sql_connector = None
     
+    def _get_hotel_id_columns(self) -> Dict[str, str]:
+        """Get provider -> hotel_id_column mapping from provider configs"""
+        return {
+            provider: provider_config["hotel_id_column"]
+            for provider, provider_config in self.provider_configs.items()
+            if provider_config.get("hotel_id_column")
+        }
+    
+    @staticmethod
+    def _clean_hotel_id(value) -> Optional[str]:
+        """Convert raw database value to provider hotel ID string (None if empty)"""
+        if value is None or (not isinstance(value, str) and pd.isna(value)) or not value:
+            return None
+        return str(value)
+    
+    @property
+    def is_cache_loaded(self) -> bool:
+        """True if the mapping indexes have been loaded at least once"""
+        return self._cache_loaded_at is not None
+    
+    def _is_cache_stale(self) -> bool:
+        """Check if cached indexes are older than configured TTL"""
+        if self._cache_loaded_at is None:
+            return True
+        return (time.time() - self._cache_loaded_at) >= self._cache_ttl
+    
+    def _in_retry_backoff(self) -> bool:
+        """Check if the last load failed less than the retry interval ago"""
+        return self._last_load_failed and (time.time() - self._last_load_attempt_at) < self._retry_interval
+    
+    async def _load_all_mappings_async(self) -> bool:
+        """
+        Load the whole hotel_mappings table and rebuild forward/reverse indexes.
+        
+        Indexes are built aside and swapped in at the end, so concurrent readers
+        always see a complete snapshot.
+        """
+        self._last_load_attempt_at = time.time()
+        loaded = await self._load_indexes()
+        self._last_load_failed = not loaded
+        if not loaded and self.is_cache_loaded:
+            logger.warning(f"[MAPPING] Hotel mapping refresh failed - serving previous snapshot, "
+                           f"next attempt in {self._retry_interval}s")
+        return loaded
+    
+    async def _load_indexes(self) -> bool:
+        """Query hotel_mappings and swap in the new indexes"""
+        if not self.sql_connector:
+            logger.error("SQL connector not available")
+            return False
+        
+        hotel_id_columns = self._get_hotel_id_columns()
+        if not hotel_id_columns:
+            logger.error("No provider hotel_id_columns configured")
+            return False
+        
+        try:
+            start_time = time.time()
+            columns_str = ', '.join(f'[{col}]' for col in ['ref_hotel_name', *hotel_id_columns.values()])
+            query = f"""
+            SELECT {columns_str}
+            FROM [dbo].[hotel_mappings]
+            """
+            
+            results = await self.sql_connector.execute_query(query)
+            if not results:
+                logger.warning("No hotel mappings found in database")
+                return False
+            
+            forward_index: Dict[str, Dict[str, str]] = {}
+            reverse_index: Dict[str, Dict[str, str]] = {provider: {} for provider in hotel_id_columns}
+            
+            for row in results:
+                ref_hotel_name = row.get('ref_hotel_name')
+                if not ref_hotel_name or ref_hotel_name in forward_index:
+                    # Keep first row per hotel (same as SELECT TOP 1 lookups)
+                    continue
+                
+                provider_ids = {}
+                for provider, hotel_id_column in hotel_id_columns.items():
+                    hotel_id = self._clean_hotel_id(row.get(hotel_id_column))
+                    if hotel_id:
+                        provider_ids[provider] = hotel_id
+                        reverse_index[provider].setdefault(hotel_id, ref_hotel_name)
+                forward_index[ref_hotel_name] = provider_ids
+            
+            self._forward_index = forward_index
+            self._reverse_index = reverse_index
+            self._cache_loaded_at = time.time()
+            
+            load_time = (self._cache_loaded_at - start_time) * 1000
+            logger.info(f"[MAPPING] Loaded {len(forward_index)} hotel mappings into memory in {load_time:.0f}ms")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error loading hotel mappings: {e}")
+            return False
+    
+    async def preload(self) -> bool:
+        """
+        Load mapping indexes if not loaded yet. Safe to call concurrently -
+        only one database load is performed.
+        
+        Returns:
+            True if indexes are available
+        """
+        if self.is_cache_loaded:
+            return True
+        
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        
+        async with self._load_lock:
+            if self.is_cache_loaded:
+                return True
+            return await self._load_all_mappings_async()
+    
+    async def refresh(self) -> bool:
+        """Force reload of mapping indexes from database"""
+        return await self._load_all_mappings_async()
+    
+    def _maybe_schedule_refresh(self) -> None:
+        """Schedule background refresh if indexes are stale and no failed load is backing off"""
+        if self._is_cache_stale() and not self._in_retry_backoff():
+            self._schedule_background_refresh()
+    
+    def _schedule_background_refresh(self) -> None:
+        """Refresh stale indexes in background - current snapshot keeps serving lookups"""
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self.refresh())
+            logger.debug("[MAPPING] Hotel mapping cache stale - background refresh scheduled")
+        except RuntimeError:
+            # No running event loop (sync caller) - next async lookup will refresh
+            pass
+    
+    async def _ensure_cache(self) -> bool:
+        """Ensure indexes are loaded, scheduling refresh when stale (not while backing off after a failed load)"""
+        if not self.is_cache_loaded:
+            if self._in_retry_backoff():
+                return False
+            return await self.preload()
+        self._maybe_schedule_refresh()
+        return True
+    
+    def get_cache_stats(self) -> Dict[str, object]:
+        """Get mapping cache statistics for monitoring"""
+        return {
+            "loaded": self.is_cache_loaded,
+            "hotels": len(self._forward_index),
+            "age_seconds": round(time.time() - self._cache_loaded_at, 1) if self._cache_loaded_at else None,
+            "ttl_seconds": self._cache_ttl,
+            "last_load_failed": self._last_load_failed,
+            "refresh_in_progress": bool(self._refresh_task and not self._refresh_task.done())
+        }
+    
+    async def get_hotel_id_async(self, ref_hotel_name: str, provider: str) -> Optional[str]:
+        """
+        Get hotel ID for provider from in-memory indexes.
+        
+        Falls back to a direct database query only if the indexes could not be loaded.
+        
+        Args:
+            ref_hotel_name: Exact hotel name from database ref_hotel_name column
+            provider: Provider name (rate_hawk, goglobal, etc.)
+            
+        Returns:
+            Hotel ID for the provider or None if not found
+        """
+        if provider not in self.provider_configs:
+            logger.error(f"No configuration found for provider '{provider}'")
+            return None
+        
+        if not await self._ensure_cache():
+            hotel_id_column = self.provider_configs[provider].get("hotel_id_column")
+            hotel_df = await self._get_hotel_data_async(ref_hotel_name)
+            if hotel_df is None or hotel_df.empty or hotel_id_column not in hotel_df.columns:
+                return None
+            return self._clean_hotel_id(hotel_df[hotel_id_column].iloc[0])
+        
+        return self._lookup_hotel_id(ref_hotel_name, provider)
+    
+    async def get_ref_hotel_name_by_provider_id_async(self, provider_id: str, provider: str) -> Optional[str]:
+        """
+        Reverse lookup from in-memory indexes: provider hotel ID -> ref_hotel_name.
+        
+        Args:
+            provider_id: Hotel ID from the provider
+            provider: Provider name (rate_hawk, goglobal, tbo)
+            
+        Returns:
+            Reference hotel name if found, None otherwise
+        """
+        if provider not in self.provider_configs:
+            logger.error(f"No configuration found for provider '{provider}'")
+            return None
+        
+        if not await self._ensure_cache():
+            hotel_id_column = self.provider_configs[provider].get("hotel_id_column")
+            return await self._get_ref_hotel_name_by_provider_id_async(provider_id, hotel_id_column)
+        
+        return self._reverse_index.get(provider, {}).get(str(provider_id))
+
+    async def resolve_hotels(self, hotel_names: List[str], stats: Optional[Dict] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Resolve provider hotel IDs for many hotels and all providers at once.
+
+        Served from in-memory indexes when loaded, otherwise with a single
+        WHERE ref_hotel_name IN (...) query (chunked for very long lists).
+
+        Args:
+            hotel_names: List of exact ref_hotel_name values
+            stats: Optional dict filled with 'queries', 'source' and 'resolved' counters
+
+        Returns:
+            Dict {ref_hotel_name: {provider: provider_hotel_id}} - every requested
+            name is present, hotels without mapping get an empty dict
+        """
+        unique_names = list(dict.fromkeys(name for name in hotel_names if name))
+        resolved: Dict[str, Dict[str, str]] = {name: {} for name in unique_names}
+        queries = 0
+        source = "cache"
+
+        if self.is_cache_loaded:
+            self._maybe_schedule_refresh()
+            for name in unique_names:
+                resolved[name] = dict(self._forward_index.get(name, {}))
+        else:
+            source = "database"
+            hotel_id_columns = self._get_hotel_id_columns()
+            if not self.sql_connector:
+                logger.error("SQL connector not available")
+            elif not hotel_id_columns:
+                logger.error("No provider hotel_id_columns configured")
+            else:
+                columns_str = ', '.join(f'[{col}]' for col in ['ref_hotel_name', *hotel_id_columns.values()])
+                for i in range(0, len(unique_names), self.RESOLVE_BATCH_SIZE):
+                    batch = unique_names[i:i + self.RESOLVE_BATCH_SIZE]
+                    placeholders = ', '.join('?' for _ in batch)
+                    query = f"""
+                    SELECT {columns_str}
+                    FROM [dbo].[hotel_mappings]
+                    WHERE [ref_hotel_name] IN ({placeholders})
+                    """
+                    try:
+                        queries += 1
+                        results = await self.sql_connector.execute_query(query, tuple(batch))
+                    except Exception as e:
+                        logger.error(f"Error resolving hotel mappings for {batch}: {e}")
+                        continue
+
+                    seen = set()
+                    for row in results or []:
+                        ref_hotel_name = row.get('ref_hotel_name')
+                        if ref_hotel_name not in resolved or ref_hotel_name in seen:
+                            # Keep first row per hotel (same as SELECT TOP 1 lookups)
+                            continue
+                        seen.add(ref_hotel_name)
+                        for provider, hotel_id_column in hotel_id_columns.items():
+                            hotel_id = self._clean_hotel_id(row.get(hotel_id_column))
+                            if hotel_id:
+                                resolved[ref_hotel_name][provider] = hotel_id
+
+        resolved_count = sum(1 for provider_ids in resolved.values() if provider_ids)
+        logger.info(f"[MAPPING] Resolved {resolved_count}/{len(unique_names)} hotels from {source} ({queries} queries)")
+
+        if stats is not None:
+            stats.update({"queries": queries, "source": source, "resolved": resolved_count})
+        return resolved
+
+    def _lookup_hotel_id(self, ref_hotel_name: str, provider: str) -> Optional[str]:
+        """Look up provider hotel ID in forward index (no I/O)"""
+        provider_ids = self._forward_index.get(ref_hotel_name)
+        if provider_ids is None:
+            logger.warning(f"No data found for hotel '{ref_hotel_name}'")
+            return None
+        
+        hotel_id = provider_ids.get(provider)
+        if hotel_id:
+            logger.debug(f"{provider.upper()}: Mapped '{ref_hotel_name}' to '{hotel_id}'")
+        else:
+            logger.warning(f"{provider.upper()}: Hotel '{ref_hotel_name}' found but no ID for provider")
+        return hotel_id
+    
     async def _get_hotel_data_async(self, ref_hotel_name: str) -> Optional[pd.DataFrame]:
         """Async method to get hotel data for all providers from database"""
         if not self.sql_connector:
@@ -111,6 +421,11 @@ class HotelMapping:
                 logger.error(f"Missing hotel_id_column configuration for provider '{provider}'")
                 return None
             
+            # Serve from in-memory indexes when available
+            if self.is_cache_loaded:
+                self._maybe_schedule_refresh()
+                return self._lookup_hotel_id(ref_hotel_name, provider)
+            
             # Get hotel data for this specific hotel
             def run_async_in_thread():
                 """Run async method in a separate thread to avoid event loop conflicts"""
@@ -171,6 +486,11 @@ class HotelMapping:
                 logger.error(f"Missing hotel_id_column configuration for provider '{provider}'")
                 return None
             
+            # Serve from in-memory indexes when available
+            if self.is_cache_loaded:
+                self._maybe_schedule_refresh()
+                return self._reverse_index.get(provider, {}).get(str(provider_id))
+            
             # Get data using async method
             def run_async_in_thread():
                 """Run async reverse lookup in a separate thread"""
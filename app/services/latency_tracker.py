@@ -0,0 +1,76 @@
+import logging
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderLatencyTracker:
+    """
+    Rolling latency distribution per provider.
+
+    Keeps the most recent successful call durations for every provider and
+    exposes percentiles used for deadline-aware retries and hedged requests.
+    """
+
+    def __init__(self, window_size: int = 200):
+        """
+        Initialize tracker.
+
+        Args:
+            window_size: Number of most recent samples kept per provider
+        """
+        self.window_size = window_size
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider_name: str, duration_seconds: float) -> None:
+        """Record duration of a completed provider call"""
+        with self._lock:
+            samples = self._samples.get(provider_name)
+            if samples is None:
+                samples = self._samples[provider_name] = deque(maxlen=self.window_size)
+            samples.append(duration_seconds)
+
+    def sample_count(self, provider_name: str) -> int:
+        """Number of samples recorded for provider"""
+        samples = self._samples.get(provider_name)
+        return len(samples) if samples else 0
+
+    def percentile(self, provider_name: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get latency percentile in seconds (nearest-rank).
+
+        Args:
+            provider_name: Provider name
+            percentile: Percentile 0-100 (e.g. 50, 95)
+            min_samples: Return None until at least this many samples exist
+
+        Returns:
+            Latency in seconds or None if not enough samples
+        """
+        with self._lock:
+            samples = self._samples.get(provider_name)
+            if not samples or len(samples) < min_samples:
+                return None
+            ordered = sorted(samples)
+        index = max(0, min(len(ordered) - 1, int(round(percentile / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get p50/p95 latency per provider in milliseconds"""
+        stats = {}
+        for provider_name in list(self._samples):
+            p50 = self.percentile(provider_name, 50)
+            p95 = self.percentile(provider_name, 95)
+            stats[provider_name] = {
+                "samples": self.sample_count(provider_name),
+                "p50_ms": int(p50 * 1000) if p50 is not None else None,
+                "p95_ms": int(p95 * 1000) if p95 is not None else None
+            }
+        return stats
+
+
+# Global instance
+latency_tracker = ProviderLatencyTracker()
@@ -2,13 +2,16 @@
 
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Any
 from enum import Enum
 from app.config import config
-from app.services.azure_sql_connector import create_azure_sql_connector_from_env
+from app.services.azure_sql_connector import get_shared_azure_sql_connector
 
 logger = logging.getLogger(__name__)
 
+_NO_LOOKUP: Mapping[str, Any] = MappingProxyType({})
+
 class FilteringStrategy(str, Enum):
     """Provider filtering capabilities"""
     REQUEST_LEVEL = "request_level"     # Provider supports native filtering
@@ -23,6 +26,10 @@ class MealMapping:
     - Get provider-specific meal codes
     - Convert between standard and provider codes
     - Validate meal type availability
+    
+    Per-provider lookup tables are precomputed once the mappings are loaded,
+    so filtering and meal code normalization of offers (apply) are a single
+    pass of dict lookups.
     """
     
     def __init__(self):
@@ -31,8 +38,17 @@ class MealMapping:
         """        
         self._mappings = {}
         self.provider_capabilities = {}
+        # provider -> {provider meal value (lowercased) -> standard code}
+        self._standard_codes: Dict[str, Mapping[str, str]] = {}
+        # provider -> {standard code -> accepted provider values (lowercased)}, response-level providers only
+        self._accepted_values: Dict[str, Mapping[str, FrozenSet[str]]] = {}
+        # provider -> offer field holding the provider meal value (None = common field names)
+        self._meal_fields: Dict[str, Optional[str]] = {}
+        # (provider, requested standard codes) -> accepted provider values
+        self._filter_values: Dict[tuple, FrozenSet[str]] = {}
         self._load_mappings()
         self._initialize_provider_capabilities()
+        self._build_lookup_tables()
     
     def _load_mappings(self) -> None:
         """Load meal mappings from Azure SQL Database"""
@@ -74,7 +90,7 @@ class MealMapping:
     async def _async_load_mappings(self) -> bool:
         """Async method to load data from Azure SQL Database"""
         try:
-            connector = create_azure_sql_connector_from_env()
+            connector = get_shared_azure_sql_connector()
             
             # Pobierz całą tabelę meal_mappings
             query = "SELECT * FROM [dbo].[meal_mappings]"
@@ -182,6 +198,34 @@ class MealMapping:
         
         self.provider_capabilities = capabilities
     
+    def _build_lookup_tables(self) -> None:
+        """Precompute frozen per-provider lookup tables from loaded mappings and capabilities"""
+        standard_codes = {}
+        for meal_code, mapping in self._mappings.items():
+            for provider_name, provider_value in mapping.items():
+                # First code wins for duplicated provider values, as in a scan of the mappings
+                standard_codes.setdefault(provider_name, {}).setdefault(provider_value.lower().strip(), meal_code)
+        
+        accepted_values = {}
+        for provider_name, capabilities in self.provider_capabilities.items():
+            if capabilities["strategy"] == FilteringStrategy.RESPONSE_LEVEL:
+                accepted_values[provider_name] = MappingProxyType({
+                    meal_code: frozenset(value.lower().strip() for value in values)
+                    for meal_code, values in capabilities["reverse_mapping"].items()
+                })
+        
+        meal_fields = {}
+        for provider_name in config.get_all_provider_names():
+            meal_config = config.get_meal_filtering_config(provider_name) or {}
+            meal_fields[provider_name] = meal_config.get("response_field")
+        
+        self._standard_codes = {name: MappingProxyType(codes) for name, codes in standard_codes.items()}
+        self._accepted_values = accepted_values
+        self._meal_fields = meal_fields
+        self._filter_values = {}
+        logger.debug(f"Meal lookup tables: {({name: len(codes) for name, codes in self._standard_codes.items()})} provider values, "
+                     f"response-level filtering for {list(accepted_values)}")
+    
     def get_provider_value(self, meal_code: str, provider: str) -> Optional[str]:
         """
         Get provider-specific meal code for standard meal code.
@@ -207,10 +251,9 @@ class MealMapping:
         Returns:
             Standard meal code or None if not found
         """
-        for code, mapping in self._mappings.items():
-            if mapping.get(provider) == provider_value:
-                return code
-        return None
+        if not isinstance(provider_value, str):
+            return None
+        return self._standard_codes.get(provider, _NO_LOOKUP).get(provider_value.lower().strip())
     
     def get_all_mappings(self) -> Dict[str, Dict[str, Any]]:
         """Get all meal mappings"""
@@ -241,35 +284,94 @@ class MealMapping:
         """
         Normalize meal_plan values in offers from provider-specific to standard codes.
         
+        Offers are updated in place - they are owned by the normalization that
+        produced them, so no per-offer copy is made.
+        
+        Args:
+            offers: List of offers (CompactOffer or dict) containing meal_plan field
+            provider: Provider name (e.g., 'tbo', 'rate_hawk')
+            
+        Returns:
+            The same list, with normalized meal_plan values
+        """
+        return self.apply(provider, offers)
+    
+    def apply(self, provider: str, offers: List[Dict[str, Any]],
+              meal_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Filter offers by meal types and normalize their meal_plan to standard codes, in one pass.
+        
+        Response-level filtering (OR over meal_types) applies only to providers
+        with that strategy; other providers' offers are only normalized.
+        Offers are updated in place.
+        
         Args:
-            offers: List of offer dictionaries containing meal_plan field
             provider: Provider name (e.g., 'tbo', 'rate_hawk')
+            offers: Normalized offers (CompactOffer or dict)
+            meal_types: Requested standard meal codes (optional)
             
         Returns:
-            List of offers with normalized meal_plan values
+            Matching offers with standard meal_plan codes
         """
         if not offers:
             return offers
         
-        normalized_offers = []
+        filter_values = self._get_filter_values(provider, meal_types) if meal_types else None
+        result = self._fused_pass(provider, offers, filter_values, normalize=True)
+        
+        if filter_values is not None:
+            logger.info(f"{provider}: Filtered {len(offers)} to {len(result)} offers for meal_types {meal_types}")
+        return result
+    
+    def _get_filter_values(self, provider: str, meal_types: List[str]) -> Optional[FrozenSet[str]]:
+        """
+        Get accepted provider meal values (lowercased) for requested meal types.
+        
+        Returns:
+            Frozen set of values, or None if no response-level filtering applies
+        """
+        accepted_values = self._accepted_values.get(provider)
+        if not accepted_values:
+            return None
+        
+        meal_codes = frozenset(mt.strip() for mt in meal_types if mt and mt.strip()).intersection(accepted_values)
+        if not meal_codes:
+            return None
+        
+        # Keys are subsets of the known meal codes, so the cache stays small
+        key = (provider, meal_codes)
+        filter_values = self._filter_values.get(key)
+        if filter_values is None:
+            filter_values = self._filter_values[key] = frozenset().union(*(accepted_values[code] for code in meal_codes))
+        return filter_values
+    
+    def _fused_pass(self, provider: str, offers: List[Dict[str, Any]],
+                    filter_values: Optional[FrozenSet[str]], normalize: bool) -> List[Dict[str, Any]]:
+        """Single pass over offers: keep those matching filter_values (None = all), normalize meal_plan"""
+        standard_codes = self._standard_codes.get(provider, _NO_LOOKUP)
+        meal_field = self._meal_fields.get(provider)
+        result = offers if filter_values is None else []
+        unmapped = set()
+        
         for offer in offers:
-            # Create a copy of the offer to avoid modifying original
-            normalized_offer = offer.copy()
-            
-            # Get the current meal_plan value
-            current_meal_plan = offer.get('meal_plan')
-            if current_meal_plan:
-                # Convert provider-specific value to standard code
-                standard_code = self.get_standard_code(current_meal_plan, provider)
-                if standard_code:
-                    normalized_offer['meal_plan'] = standard_code
-                    logger.debug(f"Normalized meal_plan: {current_meal_plan} -> {standard_code}")
-                else:
-                    logger.warning(f"No mapping found for {provider} meal_plan: {current_meal_plan}")
+            if filter_values is not None:
+                offer_meal = offer.get(meal_field) if meal_field else self._extract_meal_from_offer(provider, offer)
+                if not offer_meal or offer_meal.lower().strip() not in filter_values:
+                    continue
+                result.append(offer)
             
-            normalized_offers.append(normalized_offer)
+            if normalize:
+                meal_plan = offer.get('meal_plan')
+                if meal_plan:
+                    standard_code = standard_codes.get(meal_plan.lower().strip())
+                    if standard_code:
+                        offer['meal_plan'] = standard_code
+                    else:
+                        unmapped.add(meal_plan)
         
-        return normalized_offers
+        if unmapped:
+            logger.warning(f"No mapping found for {provider} meal_plan values: {sorted(unmapped)}")
+        return result
     
     # ============ Advanced Filtering Methods ============
     
@@ -320,10 +422,9 @@ class MealMapping:
     
     def _extract_meal_from_offer(self, provider_name: str, offer: Dict) -> Optional[str]:
         """Extract meal information from provider-specific offer format"""
-        # Get meal filtering config for this provider
-        meal_config = config.get_meal_filtering_config(provider_name)
-        if meal_config and meal_config.get("response_field"):
-            response_field = meal_config["response_field"]
+        # Response field from provider's meal filtering config (precomputed)
+        response_field = self._meal_fields.get(provider_name)
+        if response_field:
             return offer.get(response_field)
         
         # Fallback to common field names
@@ -342,59 +443,14 @@ class MealMapping:
         """
         if not meal_types or not offers:
             return offers
-            
-        valid_meal_types = [mt.strip() for mt in meal_types if mt and mt.strip()]
-        if not valid_meal_types:
-            return offers
         
-        logger.info(f"Filtering {len(offers)} offers for {provider_name} with meal_types: {valid_meal_types}")
-        
-        # Check if we need response-level filtering
-        needs_response_filtering = any(
-            self.should_filter_at_response_level(provider_name, meal_type) 
-            for meal_type in valid_meal_types
-        )
-        
-        if not needs_response_filtering:
+        filter_values = self._get_filter_values(provider_name, meal_types)
+        if filter_values is None:
             logger.debug(f"No response-level filtering needed for {provider_name}")
             return offers
         
-        # Build combined filter values
-        all_filter_values = set()
-        for meal_type in valid_meal_types:
-            if self.should_filter_at_response_level(provider_name, meal_type):
-                filter_values = self.get_response_filter_values(provider_name, meal_type)
-                for value in filter_values:
-                    all_filter_values.add(value.lower().strip())
-        
-        if not all_filter_values:
-            logger.warning(f"No filter values found for {provider_name} meal_types {valid_meal_types}")
-            return []
-        
-        # Filter offers - show ALL matching offers
-        matching_offers = []
-        
-        for offer in offers:
-            offer_meal = self._extract_meal_from_offer(provider_name, offer)
-            
-            if offer_meal:
-                offer_meal_lower = offer_meal.lower().strip()
-                
-                if offer_meal_lower in all_filter_values:
-                    matching_offers.append(offer)
-        
+        matching_offers = self._fused_pass(provider_name, offers, filter_values, normalize=False)
         logger.info(f"{provider_name}: Filtered {len(offers)} to {len(matching_offers)} offers")
-        
-        # Log sample offers for debugging (first 3 offers)
-        if matching_offers:
-            logger.debug(f"{provider_name}: Sample filtered offers:")
-            for i, offer in enumerate(matching_offers[:3]):
-                meal_plan = offer.get('meal_plan', 'N/A')
-                hotel_name = offer.get('hotel_name', 'N/A')
-                room_name = offer.get('room_name', 'N/A') 
-                total_price = offer.get('total_price', 'N/A')
-                logger.debug(f"  {i+1}. {hotel_name} | {room_name} | {meal_plan} | {total_price}")
-        
         return matching_offers
 
     def validate_meal_type(self, meal_code: str) -> bool:
@@ -0,0 +1,96 @@
+"""
+Compiled offer projections for provider normalizers.
+
+Each adapter declares its offer fields once, as an ordered table of
+`output key -> getter(hotel, item)`. A projection keeps only the getters of
+allowed fields (frozen when the adapter is created), so normalize() builds
+every offer in one loop instead of checking `'field' in allowed_fields` for
+each field of each offer. Getters of fields that are not allowed never run.
+Offers are built as CompactOffer (app/models/compact_offer.py).
+"""
+
+import logging
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Tuple
+
+from app.models.compact_offer import CompactOffer, OFFER_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# getter(hotel, item) -> field value; hotel is the adapter's per-hotel context,
+# item the raw rate/offer/room being normalized
+FieldGetter = Callable[[Any, Any], Any]
+
+
+class OfferProjection:
+    """Allowed subset of a provider's offer field table, in table order"""
+
+    __slots__ = ("provider_name", "allowed_fields", "fields", "omitted_fields")
+
+    def __init__(self, provider_name: str, field_getters: Dict[str, FieldGetter], allowed_fields: FrozenSet[str]):
+        """
+        Compile projection.
+
+        Args:
+            provider_name: Provider the field table belongs to
+            field_getters: Ordered output key -> getter table
+            allowed_fields: Offer fields to include
+        """
+        unknown_fields = set(field_getters) - set(OFFER_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"{provider_name} offer fields not in CompactOffer: {sorted(unknown_fields)}")
+
+        self.provider_name = provider_name
+        self.allowed_fields = allowed_fields
+        self.fields: Tuple[Tuple[str, FieldGetter], ...] = tuple(
+            (key, getter) for key, getter in field_getters.items() if key in allowed_fields
+        )
+        self.omitted_fields: FrozenSet[str] = frozenset(field_getters) - allowed_fields
+
+    def build(self, hotel: Any, item: Any) -> CompactOffer:
+        """
+        Build offer with allowed fields only.
+
+        Args:
+            hotel: Per-hotel context passed to every getter
+            item: Raw rate/offer/room
+
+        Returns:
+            CompactOffer
+        """
+        offer = CompactOffer()
+        for key, getter in self.fields:
+            setattr(offer, key, getter(hotel, item))
+        return offer
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.allowed_fields
+
+
+# (provider, allowed field set) -> compiled projection
+_projections: Dict[Tuple[str, FrozenSet[str]], OfferProjection] = {}
+
+
+def compile_offer_projection(provider_name: str, field_getters: Dict[str, FieldGetter],
+                             allowed_fields: Iterable[str]) -> OfferProjection:
+    """
+    Get compiled projection of a provider's field table for an allowed field set.
+
+    Projections are cached per provider and field set, so adapters created
+    with the same ALLOWED_FIELDS share one.
+
+    Args:
+        provider_name: Provider the field table belongs to
+        field_getters: Ordered output key -> getter table
+        allowed_fields: Offer fields to include
+
+    Returns:
+        OfferProjection
+    """
+    allowed_fields = frozenset(allowed_fields)
+    key = (provider_name, allowed_fields)
+    projection = _projections.get(key)
+    if projection is None:
+        projection = _projections[key] = OfferProjection(provider_name, field_getters, allowed_fields)
+        logger.debug(f"[NORMALIZATION] Compiled {provider_name} offer projection: "
+                     f"{[field for field, _ in projection.fields]} (omitted {sorted(projection.omitted_fields)})")
+    return projection
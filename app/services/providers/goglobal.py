@@ -1,16 +1,255 @@
-import json
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import logging
 import time
 import aiohttp
 
 from app.services.universal_provider import ProviderAdapter
+from app.services.offer_projection import compile_offer_projection
+from app.utils.json_stream import json_loads
 from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Read size for streamed SOAP responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Encoded request bodies kept per credential set for repeated identical searches
+REQUEST_CACHE_SIZE = 256
+
+# Search-specific part of the HOTEL_SEARCH_REQUEST body, between <Main> and </Room>
+_REQUEST_MIDDLE = (
+    '%s\n<Hotels>%s</Hotels>\n'
+    '<ArrivalDate>%s</ArrivalDate>\n'
+    '<Nights>%s</Nights>\n'
+    '<Rooms>\n'
+    '<Room Adults="%s" RoomCount="1" ChildCount="%s">\n'
+    '%s'
+)
+_MEAL_FILTER = "<FilterRoomBasises>\n<FilterRoomBasis>%s</FilterRoomBasis>\n</FilterRoomBasises>"
+
+
+class SoapResultExtractor:
+    """
+    Extracts the JSON payload of MakeRequestResult from a GoGlobal SOAP envelope.
+    
+    Chunks are fed to a pull parser; every element except MakeRequestResult is
+    discarded as soon as it ends, so no DOM of the envelope is kept. The
+    parser unescapes the payload (entities/CDATA) and the text goes straight
+    to the JSON decoder. Parse time and bytes processed are recorded in the
+    result's 'parse_stats'.
+    """
+    
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("end",))
+        self._result_text: Optional[str] = None
+        self._error: Optional[Exception] = None
+        self.bytes_processed = 0
+        self.parse_time = 0.0
+    
+    def feed(self, chunk: bytes) -> None:
+        """Parse next chunk of the response body"""
+        self.bytes_processed += len(chunk)
+        if self._error:
+            return
+        start_time = time.perf_counter()
+        try:
+            self._parser.feed(chunk)
+            self._read_events()
+        except ET.ParseError as e:
+            self._error = e
+        self.parse_time += time.perf_counter() - start_time
+    
+    def _read_events(self) -> None:
+        for _, elem in self._parser.read_events():
+            if elem.tag.endswith('MakeRequestResult') and self._result_text is None:
+                self._result_text = elem.text or ""
+            elem.clear()
+    
+    def close(self) -> Optional[dict]:
+        """
+        Finish parsing.
+        
+        Returns:
+            Parsed JSON response ({"Hotels": []} if no MakeRequestResult), None on parse error
+        """
+        start_time = time.perf_counter()
+        try:
+            if self._error:
+                raise self._error
+            self._parser.close()
+            self._read_events()
+            
+            if self._result_text is None:
+                logger.warning("No MakeRequestResult found in response")
+                parsed_response = {"Hotels": []}
+            elif not self._result_text:
+                logger.warning("MakeRequestResult found but has no text content")
+                parsed_response = {"Hotels": []}
+            else:
+                parsed_response = json_loads(self._result_text)
+        except (ET.ParseError, ValueError) as e:
+            logger.error(f"Response parsing error: {e} ({self.bytes_processed} bytes)")
+            return None
+        finally:
+            self.parse_time += time.perf_counter() - start_time
+            self._result_text = None
+        
+        parsed_response['parse_stats'] = {
+            "bytes": self.bytes_processed,
+            "parse_time_ms": round(self.parse_time * 1000, 2)
+        }
+        logger.debug(f"GoGlobal: parsed {self.bytes_processed} bytes in {self.parse_time * 1000:.1f}ms, "
+                     f"{len(parsed_response.get('Hotels', []))} hotels")
+        return parsed_response
+
+
+class SoapRequestTemplate:
+    """
+    Pre-rendered HOTEL_SEARCH_REQUEST SOAP body for one credential set.
+    
+    Everything up to <Main> (SOAP envelope, <Header> with agency credentials)
+    and everything after the room are encoded once. render() builds only the
+    search-specific middle and joins the three byte fragments in a single
+    allocation. Encoded bodies are kept in a small FIFO cache keyed by the
+    search parameters, so an identical search reuses the same bytes.
+    
+    Output is byte-identical to the previous f-string request builder.
+    """
+    
+    def __init__(self, agency_id: Any, username: Any, password: Any, cache_size: int = REQUEST_CACHE_SIZE):
+        self._head = (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<soap12:Envelope xmlns:soap12="http://www.w3.org/2003/05/soap-envelope">\n'
+            '<soap12:Body>\n'
+            '<MakeRequest xmlns="http://www.goglobal.travel/">\n'
+            '<requestType>11</requestType>\n'
+            '<xmlRequest><![CDATA[<Root>\n'
+            '<Header>\n'
+            f'<Agency>{agency_id}</Agency>\n'
+            f'<User>{username}</User>\n'
+            f'<Password>{password}</Password>\n'
+            '<Operation>HOTEL_SEARCH_REQUEST</Operation>\n'
+            '<OperationType>Request</OperationType>\n'
+            '</Header>\n'
+            '<Main Version="2.3" ResponseFormat="JSON" Currency="EUR">\n'
+        ).encode('utf-8')
+        self._tail = (
+            '\n</Room>\n'
+            '</Rooms>\n'
+            '</Main>\n'
+            '</Root>]]></xmlRequest>\n'
+            '</MakeRequest>\n'
+            '</soap12:Body>\n'
+            '</soap12:Envelope>'
+        ).encode('utf-8')
+        self._cache: Dict[Tuple, bytes] = {}  # insertion ordered - oldest evicted first
+        self._cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def request_key(params: dict) -> Tuple:
+        """Hashable key of everything in params that ends up in the request body"""
+        hotel_ids = params.get('hotel_ids', [params.get('hotel_id')])  # Support both single and multiple
+        children = params["children"]
+        return (
+            tuple(filter(None, hotel_ids)),  # Skip None/empty values
+            params["meal_type"] or None,
+            params["arrival_date"],
+            params["nights"],
+            params["adults"],
+            children,
+            tuple(params["children_ages"][:children]) if children > 0 and params["children_ages"] else ()
+        )
+    
+    def render(self, params: dict) -> bytes:
+        """
+        Encoded SOAP request body for search params.
+        
+        Args:
+            params: Search params from GoGlobalProvider._prepare_search_params
+        
+        Returns:
+            UTF-8 request body
+        """
+        key = self.request_key(params)
+        body = self._cache.get(key)
+        if body is not None:
+            self.hits += 1
+            return body
+        
+        self.misses += 1
+        body = self._assemble(key)
+        if self._cache_size > 0:
+            if len(self._cache) >= self._cache_size:
+                del self._cache[next(iter(self._cache))]  # Evict oldest
+            self._cache[key] = body
+        return body
+    
+    def _assemble(self, key: Tuple) -> bytes:
+        hotel_ids, meal_type, arrival_date, nights, adults, children, children_ages = key
+        hotels = ""
+        if hotel_ids:
+            try:
+                hotels = "<HotelId>%s</HotelId>" % "</HotelId><HotelId>".join(hotel_ids)
+            except TypeError:  # Non-string IDs
+                hotels = "<HotelId>%s</HotelId>" % "</HotelId><HotelId>".join(map(str, hotel_ids))
+        middle = _REQUEST_MIDDLE % (
+            _MEAL_FILTER % meal_type if meal_type else "",
+            hotels,
+            arrival_date, nights, adults, children,
+            "<ChildAge>%s</ChildAge>" % "</ChildAge><ChildAge>".join(map(str, children_ages)) if children_ages else ""
+        )
+        # Single allocation of the final body
+        return b"".join((self._head, middle.encode('utf-8'), self._tail))
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Request body cache statistics"""
+        return {"cached_bodies": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+# One template per credential set (agency_id, username, password)
+_request_templates: Dict[Tuple, SoapRequestTemplate] = {}
+
+
+def get_request_template(credentials: Dict[str, Any]) -> SoapRequestTemplate:
+    """Shared SoapRequestTemplate for a GoGlobal credential set"""
+    key = (credentials['agency_id'], credentials['username'], credentials['password'])
+    template = _request_templates.get(key)
+    if template is None:
+        template = _request_templates[key] = SoapRequestTemplate(*key)
+    return template
+
+
+def _room_name(hotel: dict, offer: dict) -> str:
+    room_names = offer.get("Rooms", [])
+    return room_names[0] if room_names else offer.get("RoomName", "Sztuczna nazwa pokoju")
+
+
+def _room_features(hotel: dict, offer: dict) -> List[str]:
+    special = offer.get("Special", "")
+    return [special.strip()] if special else []
+
+
+# Offer field -> getter(hotel context, GoGlobal offer), in offer key order
+OFFER_FIELDS = {
+    'room_name': _room_name,
+    'room_features': _room_features,
+    'supplier_hotel_id': lambda hotel, offer: hotel["hotel_id"],
+    'hotel_name': lambda hotel, offer: hotel["hotel_name"],
+    'supplier_room_code': lambda hotel, offer: offer.get("HotelSearchCode"),
+    'room_category': lambda hotel, offer: None,  # Will be set by universal provider
+    'room_mapping_id': lambda hotel, offer: None,  # Will be set by universal provider
+    'meal_plan': lambda hotel, offer: offer.get("RoomBasis", "room_only"),
+    'total_price': lambda hotel, offer: str(offer.get("TotalPrice", "0")),
+    'currency': lambda hotel, offer: offer.get("Currency", "EUR"),
+    'amenities': lambda hotel, offer: [],  # GoGlobal doesn't provide detailed amenities
+    # Simple extraction - GoGlobal usually doesn't have complex cancellation data
+    'free_cancellation_until': lambda hotel, offer: offer.get("CancellationDeadline"),
+}
+
 
 class GoGlobalProvider(ProviderAdapter):
     """Simplified GoGlobal Provider - Clean, elegant, minimal"""
@@ -39,6 +278,8 @@ class GoGlobalProvider(ProviderAdapter):
             raise ValueError(f"Missing GoGlobal credentials: {missing}")
             
         self.base_url = goglobal_config.get('base_url', 'https://carter.xml.goglobal.travel/xmlwebservice.asmx')
+        self.request_template = get_request_template(self.credentials)
+        self.offer_projection = compile_offer_projection(self.provider_name, OFFER_FIELDS, Config.get_allowed_fields())
         
         logger.debug(f"[PROVIDERS] GoGlobal Provider initialized - Agency: {self.credentials['agency_id']}")
 
@@ -72,7 +313,7 @@ class GoGlobalProvider(ProviderAdapter):
             hotel_name_to_id_map = {}
             
             for hotel_name in hotel_names:
-                hotel_id = self._get_hotel_id(hotel_name)
+                hotel_id = await self._get_hotel_id(hotel_name, criteria)
                 if hotel_id:
                     hotel_ids.append(hotel_id)
                     hotel_name_to_id_map[hotel_id] = hotel_name
@@ -100,9 +341,13 @@ class GoGlobalProvider(ProviderAdapter):
                 
                 logger.debug(f"[PROVIDERS] GOGLOBAL: Raw response received in {search_time:.0f}ms")
                 
+                parse_stats = result.pop('parse_stats', None)
+                if parse_stats:
+                    logger.debug(f"[PROVIDERS] GOGLOBAL: Parsed {parse_stats['bytes']} bytes in {parse_stats['parse_time_ms']}ms")
+                
                 # Add hotel name mapping to result for normalize() to use
                 result['hotel_name_to_id_map'] = hotel_name_to_id_map
-                return {"status": "success", "data": result, "provider": self.provider_name}
+                return {"status": "success", "data": result, "provider": self.provider_name, "parse_stats": parse_stats}
             else:
                 return {"status": "error", "error": "No data from GoGlobal API"}
                 
@@ -122,7 +367,7 @@ class GoGlobalProvider(ProviderAdapter):
         offers = []
         
         # Debug logging for troubleshooting
-        logger.debug(f"GoGlobal normalize called with raw type: {type(raw)}, value: {raw}")
+        logger.debug(f"GoGlobal normalize called with raw type: {type(raw)}")
         
         # Validate input - handle None case explicitly
         if raw is None:
@@ -169,13 +414,12 @@ class GoGlobalProvider(ProviderAdapter):
 
     # Private helper methods
     
-    def _get_hotel_id(self, hotel_name: str) -> Optional[str]:
-        """Get GoGlobal hotel ID from mapping service"""
+    async def _get_hotel_id(self, hotel_name: str, criteria: dict) -> Optional[str]:
+        """Get GoGlobal hotel ID from resolved IDs or mapping service"""
         if not hotel_name:
             return None
             
-        from app.services.hotel_mapping import hotel_mapping_service
-        return hotel_mapping_service.get_hotel_id(hotel_name, "goglobal")
+        return await self.get_hotel_id(hotel_name, criteria)
     
     def _prepare_search_params(self, criteria: dict, hotel_ids: List[str] = None) -> dict:
         """Prepare search parameters from criteria"""
@@ -205,11 +449,8 @@ class GoGlobalProvider(ProviderAdapter):
     async def _make_api_call(self, params: dict) -> Optional[dict]:
         """Make SOAP API call to GoGlobal"""
         try:
-            # Build XML request
-            xml_request = self._build_xml_request(params)
-            
-            # Wrap in SOAP envelope
-            soap_envelope = self._build_soap_envelope(xml_request)
+            # SOAP envelope with XML request (pre-rendered header, cached per identical search)
+            soap_envelope = self.request_template.render(params)
 
             # Get aiohttp session
             session = await self.get_session()
@@ -226,8 +467,11 @@ class GoGlobalProvider(ProviderAdapter):
             ) as response:
                 
                 if response.status == 200:
-                    response_text = await response.text()
-                    parsed_response = self._parse_response(response_text)
+                    # Stream envelope into the extractor - no full text copy or DOM
+                    extractor = SoapResultExtractor()
+                    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        extractor.feed(chunk)
+                    parsed_response = extractor.close()
                     return parsed_response
                 else:
                     response_text = await response.text()
@@ -238,93 +482,6 @@ class GoGlobalProvider(ProviderAdapter):
             logger.error(f"API call error: {e}")
             return None
     
-    def _build_xml_request(self, params: dict) -> str:
-        """Build XML request for GoGlobal API"""
-        # Build children ages XML
-        children_xml = ""
-        if params["children"] > 0 and params["children_ages"]:
-            for age in params["children_ages"][:params["children"]]:
-                children_xml += f"<ChildAge>{age}</ChildAge>"
-        
-        # Build meal filter XML (if specified)
-        meal_filter_xml = ""
-        if params["meal_type"]:
-            meal_filter_xml = f"""<FilterRoomBasises>
-<FilterRoomBasis>{params['meal_type']}</FilterRoomBasis>
-</FilterRoomBasises>"""
-        
-        # Build hotels XML - support multiple hotel IDs
-        hotels_xml = "<Hotels>"
-        hotel_ids = params.get('hotel_ids', [params.get('hotel_id')])  # Support both single and multiple
-        for hotel_id in hotel_ids:
-            if hotel_id:  # Skip None/empty values
-                hotels_xml += f"<HotelId>{hotel_id}</HotelId>"
-        hotels_xml += "</Hotels>"
-        
-        return f'''<Root>
-<Header>
-<Agency>{self.credentials['agency_id']}</Agency>
-<User>{self.credentials['username']}</User>
-<Password>{self.credentials['password']}</Password>
-<Operation>HOTEL_SEARCH_REQUEST</Operation>
-<OperationType>Request</OperationType>
-</Header>
-<Main Version="2.3" ResponseFormat="JSON" Currency="EUR">
-{meal_filter_xml}
-{hotels_xml}
-<ArrivalDate>{params['arrival_date']}</ArrivalDate>
-<Nights>{params['nights']}</Nights>
-<Rooms>
-<Room Adults="{params['adults']}" RoomCount="1" ChildCount="{params['children']}">
-{children_xml}
-</Room>
-</Rooms>
-</Main>
-</Root>'''
-    
-    def _build_soap_envelope(self, xml_request: str) -> str:
-        """Wrap XML in SOAP envelope"""
-        return f'''<?xml version="1.0" encoding="utf-8"?>
-<soap12:Envelope xmlns:soap12="http://www.w3.org/2003/05/soap-envelope">
-<soap12:Body>
-<MakeRequest xmlns="http://www.goglobal.travel/">
-<requestType>11</requestType>
-<xmlRequest><![CDATA[{xml_request}]]></xmlRequest>
-</MakeRequest>
-</soap12:Body>
-</soap12:Envelope>'''
-    
-    def _parse_response(self, response_text: str) -> Optional[dict]:
-        """Parse SOAP response and extract JSON"""
-        try:
-            # Debug: log raw response
-            logger.debug(f"GoGlobal raw response length: {len(response_text)}")
-            logger.debug(f"GoGlobal raw response first 500 chars: {response_text[:500]}")
-            
-            # Parse XML and find JSON data
-            root = ET.fromstring(response_text)
-            
-            # Find MakeRequestResult element
-            for elem in root.iter():
-                if 'MakeRequestResult' in elem.tag:
-                    logger.debug(f"Found MakeRequestResult: {elem.tag}, text: {elem.text}")
-                    if elem.text:
-                        logger.debug(f"GoGlobal DEBUG: Parsing JSON response length: {len(elem.text)}")
-                        logger.debug(f"Parsing JSON from MakeRequestResult: {elem.text[:200]}...")
-                        parsed_response = json.loads(elem.text)
-                        logger.debug(f"GoGlobal DEBUG: Parsed response has Hotels: {len(parsed_response.get('Hotels', []))}")
-                        return parsed_response
-                    else:
-                        logger.warning("MakeRequestResult found but has no text content")
-            
-            logger.warning("No MakeRequestResult found in response")
-            return {"Hotels": []}
-            
-        except (ET.ParseError, json.JSONDecodeError) as e:
-            logger.error(f"Response parsing error: {e}")
-            logger.error(f"Problematic response text: {response_text[:1000]}")
-            return None
-    
     def _process_hotel_offers(self, hotel: dict, criteria: dict) -> List[dict]:
         """Process single hotel's offers into standardized format"""
         offers = []
@@ -347,46 +504,13 @@ class GoGlobalProvider(ProviderAdapter):
             
         logger.debug(f"GoGlobal: Processing hotel {hotel_id} -> '{hotel_name}'")
         
-        # Get allowed fields once per hotel (not per offer - optimization)
-        allowed_fields = Config.get_allowed_fields()
+        hotel_context = {"hotel_id": hotel_id, "hotel_name": hotel_name}
+        build_offer = self.offer_projection.build
         
         for offer in hotel.get("Offers", []):
             try:
-                # Buduj ofertę selektywnie
-                standardized_offer = {}
-                
-                # Extract data ONLY if field is needed
-                if 'room_name' in allowed_fields:
-                    room_names = offer.get("Rooms", [])
-                    room_name = room_names[0] if room_names else offer.get("RoomName", "Sztuczna nazwa pokoju")
-                    standardized_offer['room_name'] = room_name
-                    
-                if 'room_features' in allowed_fields:
-                    special = offer.get("Special", "")
-                    standardized_offer['room_features'] = [special.strip()] if special else []
-                
-                # Map other allowed fields
-                if 'supplier_hotel_id' in allowed_fields:
-                    standardized_offer['supplier_hotel_id'] = hotel_id
-                if 'hotel_name' in allowed_fields:
-                    standardized_offer['hotel_name'] = hotel_name
-                if 'supplier_room_code' in allowed_fields:
-                    standardized_offer['supplier_room_code'] = offer.get("HotelSearchCode")
-                if 'room_category' in allowed_fields:
-                    standardized_offer['room_category'] = None  # Will be set by universal provider
-                if 'room_mapping_id' in allowed_fields:
-                    standardized_offer['room_mapping_id'] = None  # Will be set by universal provider
-                if 'meal_plan' in allowed_fields:
-                    standardized_offer['meal_plan'] = offer.get("RoomBasis", "room_only")
-                if 'total_price' in allowed_fields:
-                    standardized_offer['total_price'] = str(offer.get("TotalPrice", "0"))
-                if 'currency' in allowed_fields:
-                    standardized_offer['currency'] = offer.get("Currency", "EUR")
-                if 'amenities' in allowed_fields:
-                    standardized_offer['amenities'] = []  # GoGlobal doesn't provide detailed amenities
-                if 'free_cancellation_until' in allowed_fields:
-                    # Simple extraction - GoGlobal usually doesn't have complex cancellation data
-                    standardized_offer['free_cancellation_until'] = offer.get("CancellationDeadline")
+                # Buduj ofertę selektywnie - only allowed fields are extracted
+                standardized_offer = build_offer(hotel_context, offer)
                 
                 # Add required system fields
                 standardized_offer['provider'] = 'goglobal'
@@ -4,15 +4,105 @@ import aiohttp
 import asyncio
 import logging
 import time
-import json
-from typing import Dict, Any
-from app.services.universal_provider import ProviderAdapter
-from app.services.hotel_mapping import hotel_mapping_service
+from decimal import Decimal
+from typing import Dict, Any, Tuple
+from app.services.universal_provider import ProviderAdapter, normalization_executor
+from app.services.offer_projection import compile_offer_projection
 from app.utils.logger import hotel_logger
+from app.utils.json_stream import StreamingArrayDecoder, json_loads, JSON_BACKEND
 from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Read size for streamed SERP responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _first_payment(rate: dict) -> dict:
+    # Validated in _normalize_hotel: payment_types is a non-empty list
+    return rate["payment_options"]["payment_types"][0]
+
+
+def _free_cancellation_until(hotel: dict, rate: dict):
+    cancellation_penalties = _first_payment(rate).get("cancellation_penalties")
+    if cancellation_penalties:
+        return cancellation_penalties.get("free_cancellation_before")
+    return None
+
+
+def _room_features(hotel: dict, rate: dict) -> list:
+    room_features = []
+    
+    # Extract basic room features from serp_filters
+    serp_filters = rate.get("serp_filters", [])
+    for feature in serp_filters:
+        if feature == "has_bathroom":
+            room_features.append("bathroom")
+        elif feature == "has_internet":
+            room_features.append("internet")
+        elif feature == "has_wifi" or feature == "wifi":
+            room_features.append("wifi")
+        else:
+            clean_feature = feature.replace("has_", "").replace("_", " ")
+            room_features.append(clean_feature)
+    
+    # Extract detailed room characteristics from rg_ext
+    rg_ext = rate.get("rg_ext", {})
+    if rg_ext:
+        # Bathroom types
+        bathroom = rg_ext.get("bathroom", 0)
+        if bathroom == 2:
+            room_features.append("private bathroom")
+        elif bathroom == 1:
+            room_features.append("shared bathroom")
+        
+        # View information
+        view_code = rg_ext.get("view", 0)
+        if view_code > 0:
+            room_features.append("room with view")
+        
+        # Balcony
+        if rg_ext.get("balcony", 0) > 0:
+            room_features.append("balcony")
+        
+        # Club access
+        if rg_ext.get("club", 0) > 0:
+            room_features.append("club access")
+        
+        # Family friendly
+        if rg_ext.get("family", 0) > 0:
+            room_features.append("family friendly")
+    
+    # Extract specific amenities from amenities_data
+    amenities_data = rate.get("amenities_data", [])
+    for amenity in amenities_data:
+        # Clean amenity names
+        clean_amenity = amenity.replace("-", " ").replace("_", " ")
+        if clean_amenity not in room_features:
+            room_features.append(clean_amenity)
+    
+    # Remove duplicates while preserving order
+    return list(dict.fromkeys(room_features))
+
+
+# Offer field -> getter(hotel context, Rate Hawk rate), in offer key order
+OFFER_FIELDS = {
+    'supplier_hotel_id': lambda hotel, rate: hotel["hotel_id"],
+    'hotel_id': lambda hotel, rate: hotel["hotel_key"],
+    'hotel_name': lambda hotel, rate: hotel["hotel_name"],
+    'supplier_room_code': lambda hotel, rate: rate.get('match_hash', ''),
+    'room_name': lambda hotel, rate: rate.get("room_name", ""),
+    'room_category': lambda hotel, rate: None,  # Will be set by universal provider
+    'room_mapping_id': lambda hotel, rate: None,  # Will be set by universal provider
+    'meal_plan': lambda hotel, rate: rate.get("meal"),
+    # Decimal as required by Offer model
+    'total_price': lambda hotel, rate: Decimal(str(float(_first_payment(rate).get("amount", 0)))),
+    'currency': lambda hotel, rate: _first_payment(rate).get("currency_code", "EUR"),
+    'room_features': _room_features,
+    'amenities': lambda hotel, rate: rate.get("amenities_data", []) if isinstance(rate.get("amenities_data"), list) else [],
+    'free_cancellation_until': _free_cancellation_until,
+}
+
 class RateHawkProvider(ProviderAdapter):
     """
     Rate Hawk API provider adapter.
@@ -26,6 +116,9 @@ class RateHawkProvider(ProviderAdapter):
         super().__init__(provider_name)
         # Get base URL from configuration
         self.base_url = self.config.get('base_url', "https://api.worldota.net/api/b2b/v3/search/serp/hotels/")
+        # Rate Hawk offers carry every Offer model field
+        from app.models.response import Offer
+        self.offer_projection = compile_offer_projection(self.provider_name, OFFER_FIELDS, Offer.__fields__.keys())
     
     def prepare_meal_type_criteria(self, criteria: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -125,7 +218,7 @@ class RateHawkProvider(ProviderAdapter):
         hotel_id_to_name_map = {}  # Map Rate Hawk ID to original hotel name
         
         for hotel_name in hotel_names:
-            rate_hawk_hotel_id = hotel_mapping_service.get_hotel_id(hotel_name, "rate_hawk")
+            rate_hawk_hotel_id = await self.get_hotel_id(hotel_name, criteria)
             if rate_hawk_hotel_id:
                 rate_hawk_hotel_ids.append(rate_hawk_hotel_id)
                 hotel_id_to_name_map[rate_hawk_hotel_id] = hotel_name
@@ -190,19 +283,13 @@ class RateHawkProvider(ProviderAdapter):
                 timeout=aiohttp.ClientTimeout(total=self.config.get('timeout', 30))
             ) as resp:
                 logger.info(f"[PROVIDERS] RATE_HAWK API Status Code: {resp.status}")
-                response_text = await resp.text()
-                logger.debug(f"Rate Hawk Response body: {response_text[:1000]}...")  # Log first 1000 chars
-                # Log parsed JSON response
-                try:
-                    response_json = await resp.json()
-                    logger.debug(f"Rate Hawk Response JSON: {json.dumps(response_json, indent=2)}")
-                except Exception as e:
-                    logger.warning(f"Could not parse Rate Hawk response as JSON: {e}")
                 
                 if resp.status != 200:
+                    response_body = await resp.read()
+                    response_text = response_body.decode('utf-8', errors='replace')
                     error_data = None
                     try:
-                        error_data = await resp.json()
+                        error_data = json_loads(response_body)
                     except Exception as parse_error:
                         logger.warning(f"Could not parse error response as JSON: {parse_error}")
                         pass
@@ -224,7 +311,43 @@ class RateHawkProvider(ProviderAdapter):
                     
                     resp.raise_for_status()
                 
-                data = await resp.json()
+                # Body is decoded exactly once - streamed hotel by hotel, or in one pass
+                normalized_offers = None
+                total_offers = 0
+                if self.config.get('streaming_parse', False):
+                    normalized_offers = []
+                    decoder = StreamingArrayDecoder("hotels", path=("data",))
+                    loop = asyncio.get_running_loop()
+                    
+                    def normalize_hotels(hotels: list) -> int:
+                        rates_count = 0
+                        for hotel in hotels:
+                            rates_count += len(hotel.get('rates', []))
+                            try:
+                                hotel_offers, _ = self._normalize_hotel(hotel, hotel_id_to_name_map)
+                                normalized_offers.extend(hotel_offers)
+                            except Exception as e:
+                                logger.error(f"Error normalizing Rate Hawk hotel {hotel.get('id')}: {e}")
+                        return rates_count
+                    
+                    # Hotels decoded from each chunk are normalized on the normalization executor
+                    # (off the event loop) before the next chunk is read - memory stays bounded by a chunk
+                    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        hotels = decoder.feed(chunk)
+                        if hotels:
+                            total_offers += await loop.run_in_executor(normalization_executor, normalize_hotels, hotels)
+                    hotels = decoder.close()
+                    if hotels:
+                        total_offers += await loop.run_in_executor(normalization_executor, normalize_hotels, hotels)
+                    data = decoder.envelope
+                    response_bytes = decoder.bytes_received
+                else:
+                    response_body = await resp.read()
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Rate Hawk Response body: {response_body[:1000].decode('utf-8', errors='replace')}...")
+                    data = json_loads(response_body)
+                    response_bytes = len(response_body)
+                    total_offers = sum(len(hotel.get('rates', [])) for hotel in (data.get('data') or {}).get('hotels', []))
                 
                 # Check for ETG API specific error responses
                 if data.get("error"):
@@ -240,12 +363,15 @@ class RateHawkProvider(ProviderAdapter):
                 
                 # Log results summary
                 search_time = (time.time() - start_time) * 1000
-                total_offers = sum(len(hotel.get('rates', [])) for hotel in data.get('data', {}).get('hotels', []))
                 
-                logger.info(f"[PROVIDERS] RATE_HAWK: {total_offers} offers in {search_time:.0f}ms")
+                logger.info(f"[PROVIDERS] RATE_HAWK: {total_offers} offers in {search_time:.0f}ms "
+                            f"({response_bytes} bytes, {'streamed' if normalized_offers is not None else 'buffered'} {JSON_BACKEND} parse)")
                 
                 # Add hotel_id_to_name_map for normalization
                 data['hotel_id_to_name_map'] = hotel_id_to_name_map
+                if normalized_offers is not None:
+                    # Already normalized while streaming - normalize() returns these as is
+                    data['normalized_offers'] = normalized_offers
                 return data
                 
         except aiohttp.ClientResponseError as e:
@@ -275,6 +401,11 @@ class RateHawkProvider(ProviderAdapter):
         Returns:
             List of normalized hotel offers
         """
+        # Streaming search() already normalized hotels as they were decoded
+        if raw and raw.get("normalized_offers") is not None:
+            logger.info(f"[NORMALIZATION] Successfully normalized {len(raw['normalized_offers'])} offers from Rate Hawk (streamed)")
+            return raw["normalized_offers"]
+        
         start_time = time.time()
         offers = []
         skipped_rates = 0
@@ -301,270 +432,183 @@ class RateHawkProvider(ProviderAdapter):
                 logger.warning("No hotels found in Rate Hawk response")
                 return offers
             
-            # Get allowed fields from Offer model
-            from app.models.response import Offer
-            allowed_fields = set(Offer.__fields__.keys())
-            
             logger.debug(f"[PROVIDERS] Found {len(hotels)} hotels in Rate Hawk response")
             
             # Parse hotels and their rates
             for hotel in hotels:
-                # Rate Hawk API structure: 'id' (internal), 'hid' (identifier)
-                hotel_id = hotel.get("id")  # Rate Hawk internal ID
-                hotel_hid = hotel.get("hid", hotel_id)  # Hotel identifier (fallback to id)
+                hotel_offers, hotel_skipped_rates = self._normalize_hotel(
+                    hotel, raw.get('hotel_id_to_name_map', {})
+                )
+                offers.extend(hotel_offers)
+                skipped_rates += hotel_skipped_rates
+        
+        except Exception as e:
+            logger.error(f"Error normalizing Rate Hawk response: {e}")
+            hotel_logger.general_logger.error(f"Rate Hawk normalization failed: {e}")
+        
+        # Log normalization summary
+        processing_time = (time.time() - start_time) * 1000
+        logger.info(f"[NORMALIZATION] Successfully normalized {len(offers)} offers from Rate Hawk in {processing_time:.0f}ms")
+        return offers
+    
+    def _normalize_hotel(self, hotel: dict, hotel_id_to_name_map: dict) -> Tuple[list, int]:
+        """
+        Normalize rates of a single Rate Hawk hotel.
+        
+        Args:
+            hotel: Hotel object from SERP response (id, hid, rates)
+            hotel_id_to_name_map: Rate Hawk hotel ID -> hotel name from request
+            
+        Returns:
+            Tuple (offers, number of skipped rates)
+        """
+        offers = []
+        skipped_rates = 0
+        
+        # Rate Hawk API structure: 'id' (internal), 'hid' (identifier)
+        hotel_id = hotel.get("id")  # Rate Hawk internal ID
+        hotel_hid = hotel.get("hid", hotel_id)  # Hotel identifier (fallback to id)
+        
+        # Map hotel ID to original hotel name from request
+        hotel_name = None
+        
+        # Try to find original hotel name using both id and hid
+        for mapped_id, original_name in hotel_id_to_name_map.items():
+            if str(mapped_id) == str(hotel_id) or str(mapped_id) == str(hotel_hid):
+                hotel_name = original_name
+                break
+        
+        # Fallback to ID if mapping not found
+        if not hotel_name:
+            hotel_name = str(hotel_hid) if hotel_hid else str(hotel_id)
+            logger.warning(f"Rate Hawk: No hotel name mapping found for ID {hotel_id}/{hotel_hid}, using ID as name")
+        
+        if not hotel_id:
+            logger.warning("Hotel missing id, skipping")
+            hotel_logger.log_skipped_item("rate_hawk", 0, "Hotel missing id")
+            return offers, skipped_rates
+        
+        rates = hotel.get("rates", [])
+        logger.debug(f"[PROVIDERS] Hotel {hotel_name} (id: {hotel_id}, hid: {hotel_hid}) has {len(rates)} rates")
+        
+        hotel_context = {
+            "hotel_id": hotel_id,
+            # Include both id and hid for mapping purposes
+            "hotel_key": str(hotel_hid) if hotel_hid else str(hotel_id),
+            # Use the actual hotel identifier from response (hid or id)
+            # This will be mapped to friendly name later by universal_provider
+            "hotel_name": hotel_name
+        }
+        build_offer = self.offer_projection.build
+        
+        for rate_index, rate in enumerate(rates):
+            # Log every rate for transparency
+            hotel_logger.debug_logger.debug(f"Processing rate {rate_index + 1}/{len(rates)}: keys={list(rate.keys())}")
+            
+            try:
+                # Check for completely empty rates
+                if not rate or len(rate) == 0:
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                "Completely empty rate", 
+                                                rate, f"rate_{rate_index}")
+                    skipped_rates += 1
+                    continue
+                    
+                # Check for rates with only legal_info field
+                if len(rate.keys()) <= 1 and "legal_info" in rate:
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                "Rate contains only legal_info field", 
+                                                rate, f"rate_{rate_index}")
+                    skipped_rates += 1
+                    continue
                 
-                # Map hotel ID to original hotel name from request
-                hotel_id_to_name_map = raw.get('hotel_id_to_name_map', {})
-                hotel_name = None
+                # Check for rates with only metadata fields
+                if len(rate.keys()) <= 2 and all(key in ["legal_info", "id", "rate_id"] for key in rate.keys()):
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                "Rate contains only metadata fields", 
+                                                rate, f"rate_{rate_index}")
+                    skipped_rates += 1
+                    continue
+                
+                # Check for rates missing all essential fields
+                essential_fields = ['match_hash', 'room_name', 'payment_options', 'daily_prices']
+                present_essential = [field for field in essential_fields if rate.get(field)]
                 
-                # Try to find original hotel name using both id and hid
-                for mapped_id, original_name in hotel_id_to_name_map.items():
-                    if str(mapped_id) == str(hotel_id) or str(mapped_id) == str(hotel_hid):
-                        hotel_name = original_name
-                        break
+                if len(present_essential) == 0:
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                f"Rate missing all essential fields {essential_fields}", 
+                                                rate, f"rate_{rate_index}")
+                    skipped_rates += 1
+                    continue
                 
-                # Fallback to ID if mapping not found
-                if not hotel_name:
-                    hotel_name = str(hotel_hid) if hotel_hid else str(hotel_id)
-                    logger.warning(f"Rate Hawk: No hotel name mapping found for ID {hotel_id}/{hotel_hid}, using ID as name")
+                # Validate essential fields
+                match_hash = rate.get("match_hash")
+                if not match_hash:
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                "Missing match_hash", 
+                                                rate, f"rate_{rate_index}")
+                    skipped_rates += 1
+                    continue
                 
-                if not hotel_id:
-                    logger.warning("Hotel missing id, skipping")
-                    hotel_logger.log_skipped_item("rate_hawk", 0, "Hotel missing id")
+                room_name = rate.get("room_name")
+                if not room_name:
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                "Missing room_name", 
+                                                rate, match_hash)
+                    skipped_rates += 1
                     continue
                 
-                rates = hotel.get("rates", [])
-                logger.debug(f"[PROVIDERS] Hotel {hotel_name} (id: {hotel_id}, hid: {hotel_hid}) has {len(rates)} rates")
+                payment_options = rate.get("payment_options", {})
+                payment_types = payment_options.get("payment_types", [])
                 
-                for rate_index, rate in enumerate(rates):
-                    # Log every rate for transparency
-                    hotel_logger.debug_logger.debug(f"Processing rate {rate_index + 1}/{len(rates)}: keys={list(rate.keys())}")
+                # Validate payment_options
+                if not payment_options or not isinstance(payment_options, dict):
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                "Missing or invalid payment_options", 
+                                                rate, match_hash)
+                    skipped_rates += 1
+                    continue
                     
-                    try:
-                        # Check for completely empty rates
-                        if not rate or len(rate) == 0:
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        "Completely empty rate", 
-                                                        rate, f"rate_{rate_index}")
-                            skipped_rates += 1
-                            continue
-                            
-                        # Check for rates with only legal_info field
-                        if len(rate.keys()) <= 1 and "legal_info" in rate:
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        "Rate contains only legal_info field", 
-                                                        rate, f"rate_{rate_index}")
-                            skipped_rates += 1
-                            continue
-                        
-                        # Check for rates with only metadata fields
-                        if len(rate.keys()) <= 2 and all(key in ["legal_info", "id", "rate_id"] for key in rate.keys()):
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        "Rate contains only metadata fields", 
-                                                        rate, f"rate_{rate_index}")
-                            skipped_rates += 1
-                            continue
-                        
-                        # Check for rates missing all essential fields
-                        essential_fields = ['match_hash', 'room_name', 'payment_options', 'daily_prices']
-                        present_essential = [field for field in essential_fields if rate.get(field)]
-                        
-                        if len(present_essential) == 0:
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        f"Rate missing all essential fields {essential_fields}", 
-                                                        rate, f"rate_{rate_index}")
-                            skipped_rates += 1
-                            continue
-                        
-                        # Validate essential fields
-                        match_hash = rate.get("match_hash")
-                        if not match_hash:
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        "Missing match_hash", 
-                                                        rate, f"rate_{rate_index}")
-                            skipped_rates += 1
-                            continue
-                        
-                        room_name = rate.get("room_name")
-                        if not room_name:
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        "Missing room_name", 
-                                                        rate, match_hash)
-                            skipped_rates += 1
-                            continue
-                        
-                        payment_options = rate.get("payment_options", {})
-                        payment_types = payment_options.get("payment_types", [])
-                        
-                        # Validate payment_options
-                        if not payment_options or not isinstance(payment_options, dict):
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        "Missing or invalid payment_options", 
-                                                        rate, match_hash)
-                            skipped_rates += 1
-                            continue
-                            
-                        # Validate payment_types array
-                        if not payment_types or len(payment_types) == 0:
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        "Empty payment_types array", 
-                                                        rate, match_hash)
-                            skipped_rates += 1
-                            continue
-                        
-                        daily_prices = rate.get("daily_prices", [])
-                        if not daily_prices or len(daily_prices) == 0:
-                            hotel_logger.log_skipped_item("rate_hawk", rate_index, 
-                                                        "Missing or empty daily_prices", 
-                                                        rate, match_hash)
-                            skipped_rates += 1
-                            continue
-                        
-                        # Extract price and currency from payment_types
-                        payment_options = rate.get("payment_options", {})
-                        payment_types = payment_options.get("payment_types", [])
-                        
-                        total_amount = 0
-                        currency = "EUR"
-                        if payment_types:
-                            first_payment = payment_types[0]
-                            total_amount = float(first_payment.get("amount", 0))
-                            currency = first_payment.get("currency_code", "EUR")
-                        
-                        # Extract room name
-                        room_name = rate.get("room_name", "")
-                        
-                        # Extract free cancellation date
-                        free_cancellation_until = None
-                        if payment_types:
-                            first_payment = payment_types[0]
-                            cancellation_penalties = first_payment.get("cancellation_penalties")
-                            if cancellation_penalties:
-                                free_cancellation_until = cancellation_penalties.get("free_cancellation_before")
-                        
-                        # Extract room features
-                        room_features = []
-                        
-                        # Extract basic room features from serp_filters
-                        serp_filters = rate.get("serp_filters", [])
-                        for feature in serp_filters:
-                            if feature == "has_bathroom":
-                                room_features.append("bathroom")
-                            elif feature == "has_internet":
-                                room_features.append("internet")
-                            elif feature == "has_wifi" or feature == "wifi":
-                                room_features.append("wifi")
-                            else:
-                                clean_feature = feature.replace("has_", "").replace("_", " ")
-                                room_features.append(clean_feature)
-                        
-                        # Extract detailed room characteristics from rg_ext
-                        rg_ext = rate.get("rg_ext", {})
-                        if rg_ext:
-                            # Bathroom types
-                            bathroom = rg_ext.get("bathroom", 0)
-                            if bathroom == 2:
-                                room_features.append("private bathroom")
-                            elif bathroom == 1:
-                                room_features.append("shared bathroom")
-                            
-                            # View information
-                            view_code = rg_ext.get("view", 0)
-                            if view_code > 0:
-                                room_features.append("room with view")
-                            
-                            # Balcony
-                            if rg_ext.get("balcony", 0) > 0:
-                                room_features.append("balcony")
-                            
-                            # Club access
-                            if rg_ext.get("club", 0) > 0:
-                                room_features.append("club access")
-                            
-                            # Family friendly
-                            if rg_ext.get("family", 0) > 0:
-                                room_features.append("family friendly")
-                        
-                        # Extract specific amenities from amenities_data
-                        amenities_data = rate.get("amenities_data", [])
-                        for amenity in amenities_data:
-                            # Clean amenity names
-                            clean_amenity = amenity.replace("-", " ").replace("_", " ")
-                            if clean_amenity not in room_features:
-                                room_features.append(clean_amenity)
-                        
-                        # Validate room_features and remove duplicates
-                        if not isinstance(room_features, list):
-                            room_features = []
-                        else:
-                            # Remove duplicates while preserving order
-                            room_features = list(dict.fromkeys(room_features))
-                        
-                        # Get meal plan
-                        offer_meal_plan = rate.get("meal")
-                        
-                        # Build offer dict with allowed fields only
-                        offer = {}
-                        
-                        # Map only allowed fields
-                        if 'supplier_hotel_id' in allowed_fields:
-                            offer['supplier_hotel_id'] = hotel_id
-                        if 'hotel_id' in allowed_fields:
-                            # Include both id and hid for mapping purposes
-                            offer['hotel_id'] = str(hotel_hid) if hotel_hid else str(hotel_id)
-                        if 'hotel_name' in allowed_fields:
-                            # Use the actual hotel identifier from response (hid or id)
-                            # This will be mapped to friendly name later by universal_provider
-                            offer['hotel_name'] = hotel_name
-                        if 'supplier_room_code' in allowed_fields:
-                            offer['supplier_room_code'] = rate.get('match_hash', '')
-                        if 'room_name' in allowed_fields:
-                            offer['room_name'] = room_name
-                        if 'room_category' in allowed_fields:
-                            offer['room_category'] = None  # Will be set by universal provider
-                        if 'room_mapping_id' in allowed_fields:
-                            offer['room_mapping_id'] = None  # Will be set by universal provider
-                        if 'meal_plan' in allowed_fields:
-                            offer['meal_plan'] = offer_meal_plan
-                        if 'total_price' in allowed_fields:
-                            # Convert to Decimal as required by Offer model
-                            from decimal import Decimal
-                            offer['total_price'] = Decimal(str(total_amount))
-                        if 'currency' in allowed_fields:
-                            offer['currency'] = currency
-                        if 'room_features' in allowed_fields and room_features:
-                            offer['room_features'] = room_features
-                        if 'amenities' in allowed_fields:
-                            offer['amenities'] = rate.get("amenities_data", []) if isinstance(rate.get("amenities_data"), list) else []
-                        if 'free_cancellation_until' in allowed_fields:
-                            offer['free_cancellation_until'] = free_cancellation_until
-                        
-                        # Add required system fields
-                        offer['provider'] = self.provider_name  # System needs this
-                        
-                        logger.debug(f"RateHawk: Built offer with only {len(offer)} required fields (skipped {len(allowed_fields) - len(offer)} unnecessary mappings)")
-                        
-                        # Try to append the offer
-                        try:
-                            offers.append(offer)
-                            logger.debug(f"RateHawk: Added optimized offer - total: {len(offers)}")
-                            hotel_logger.log_offer_creation_attempt("rate_hawk", offer, True)
-                        except Exception as creation_error:
-                            logger.warning(f"RateHawk: Failed to add offer - error: {creation_error}")
-                            hotel_logger.log_offer_creation_attempt("rate_hawk", offer, False, str(creation_error))
-                            skipped_rates += 1
-                        
-                    except Exception as e:
-                        hotel_logger.log_validation_error("rate_hawk", rate_index, [str(e)], 
-                                                        rate, rate.get('match_hash'))
-                        skipped_rates += 1
-                        continue
-        
-        except Exception as e:
-            logger.error(f"Error normalizing Rate Hawk response: {e}")
-            hotel_logger.general_logger.error(f"Rate Hawk normalization failed: {e}")
+                # Validate payment_types array
+                if not payment_types or len(payment_types) == 0:
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                "Empty payment_types array", 
+                                                rate, match_hash)
+                    skipped_rates += 1
+                    continue
+                
+                daily_prices = rate.get("daily_prices", [])
+                if not daily_prices or len(daily_prices) == 0:
+                    hotel_logger.log_skipped_item("rate_hawk", rate_index, 
+                                                "Missing or empty daily_prices", 
+                                                rate, match_hash)
+                    skipped_rates += 1
+                    continue
+                
+                # Build offer dict with allowed fields only (compiled projection)
+                offer = build_offer(hotel_context, rate)
+                if offer.get('room_features') == []:
+                    del offer['room_features']  # Empty features are omitted
+                
+                # Add required system fields
+                offer['provider'] = self.provider_name  # System needs this
+                
+                logger.debug(f"RateHawk: Built offer with only {len(self.offer_projection.fields)} projected fields (skipped {len(self.offer_projection.omitted_fields)} unnecessary mappings)")
+                
+                # Try to append the offer
+                try:
+                    offers.append(offer)
+                    logger.debug(f"RateHawk: Added optimized offer - total: {len(offers)}")
+                    hotel_logger.log_offer_creation_attempt("rate_hawk", offer, True)
+                except Exception as creation_error:
+                    logger.warning(f"RateHawk: Failed to add offer - error: {creation_error}")
+                    hotel_logger.log_offer_creation_attempt("rate_hawk", offer, False, str(creation_error))
+                    skipped_rates += 1
+                
+            except Exception as e:
+                hotel_logger.log_validation_error("rate_hawk", rate_index, [str(e)], 
+                                                rate, rate.get('match_hash'))
+                skipped_rates += 1
+                continue
         
-        # Log normalization summary
-        processing_time = (time.time() - start_time) * 1000
-        logger.info(f"[NORMALIZATION] Successfully normalized {len(offers)} offers from Rate Hawk in {processing_time:.0f}ms")
-        return offers
\ No newline at end of file
+        return offers, skipped_rates
@@ -13,11 +13,35 @@ import asyncio
 import time
 
 from app.services.universal_provider import ProviderAdapter
+from app.services.offer_projection import compile_offer_projection
 from app.services.hotel_mapping import hotel_mapping_service
 from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+
+def _room_name(hotel: Dict[str, Any], room: Dict[str, Any]) -> str:
+    room_names = room.get('Name', ['Standard Room'])
+    return room_names[0] if room_names else 'Standard Room'
+
+
+# Offer field -> getter(hotel context, TBO room), in offer key order
+OFFER_FIELDS = {
+    'supplier_hotel_id': lambda hotel, room: hotel["hotel_code"],
+    'hotel_name': lambda hotel, room: hotel["hotel_name"],
+    'supplier_room_code': lambda hotel, room: room.get('BookingCode', ''),
+    'room_name': _room_name,
+    'room_category': lambda hotel, room: None,  # Will be set by universal provider
+    'room_mapping_id': lambda hotel, room: None,  # Will be set by universal provider
+    'meal_plan': lambda hotel, room: room.get('MealType', 'Room_Only'),
+    'total_price': lambda hotel, room: float(room.get('TotalFare', 0)),
+    'currency': lambda hotel, room: hotel["currency"],
+    'room_features': lambda hotel, room: [],  # TBO doesn't provide detailed room features
+    'amenities': lambda hotel, room: [],  # TBO doesn't provide detailed amenities
+    # Free cancellation date from CancelPolicies
+    'free_cancellation_until': lambda hotel, room: TBOProvider._extract_free_cancellation_date(room),
+}
+
 class TBOProvider(ProviderAdapter):
     """TBO API Provider for hotel search"""
     
@@ -31,6 +55,8 @@ class TBOProvider(ProviderAdapter):
                 'base_url': 'http://api.tbotechnology.in/TBOHolidays_HotelAPI/search',
                 'timeout': 25
             }
+        
+        self.offer_projection = compile_offer_projection(self.provider_name, OFFER_FIELDS, Config.get_allowed_fields())
 
     def _get_config_value(self, key: str, default: Any = None) -> Any:
         """Safely get configuration value with fallback"""
@@ -63,7 +89,7 @@ class TBOProvider(ProviderAdapter):
             hotel_id_to_name_map = {}  # Mapowanie TBO hotel_code -> original hotel_name
             
             for hotel_name in hotel_names:
-                tbo_hotel_code = hotel_mapping_service.get_hotel_id(hotel_name, "tbo")
+                tbo_hotel_code = await self.get_hotel_id(hotel_name, search_params)
                 if tbo_hotel_code:
                     hotel_codes.append(tbo_hotel_code)
                     hotel_id_to_name_map[tbo_hotel_code] = hotel_name
@@ -144,11 +170,19 @@ class TBOProvider(ProviderAdapter):
                     
                     logger.info(f"[PROVIDERS] TBO: {total_offers} offers in {search_time:.0f}ms")
                     
+                    # Reverse-map hotel codes not sent in request here (async), so normalize() does no DB lookups
+                    ref_hotel_names = {}
+                    for hotel in tbo_response.get('HotelResult', []):
+                        hotel_code = str(hotel.get('HotelCode', ''))
+                        if hotel_code and hotel_code not in hotel_id_to_name_map and hotel_code not in ref_hotel_names:
+                            ref_hotel_names[hotel_code] = await hotel_mapping_service.get_ref_hotel_name_by_provider_id_async(hotel_code, "tbo")
+                    
                     return {
                         'success': True,
                         'data': tbo_response,
                         'provider': 'tbo',
-                        'hotel_id_to_name_map': hotel_id_to_name_map  # Dodaj mapowanie
+                        'hotel_id_to_name_map': hotel_id_to_name_map,  # Dodaj mapowanie
+                        'ref_hotel_names': ref_hotel_names
                     }
                 elif status_code == 201:  # NO_AVAILABILITY
                     logger.info(f"[PROVIDERS] TBO search completed - No availability for given criteria")
@@ -212,6 +246,7 @@ class TBOProvider(ProviderAdapter):
                 return []
             
             offers = []
+            build_offer = self.offer_projection.build
             
             # Process each hotel and flatten rooms into individual offers
             for hotel_data in hotel_results:
@@ -232,8 +267,12 @@ class TBOProvider(ProviderAdapter):
                         hotel_name = original_hotel_name  # Use original name from request
                         logger.debug(f"TBO: Mapped hotel code {hotel_code} to original name '{original_hotel_name}'")
                     else:
-                        # Fallback to ref_hotel_name from mapping service
-                        ref_hotel_name = self._get_ref_hotel_name_from_tbo_id(hotel_code)
+                        # Fallback to ref_hotel_name from mapping service (resolved in search() when possible)
+                        ref_hotel_names = raw_response.get('ref_hotel_names', {})
+                        if hotel_code in ref_hotel_names:
+                            ref_hotel_name = ref_hotel_names[hotel_code]
+                        else:
+                            ref_hotel_name = self._get_ref_hotel_name_from_tbo_id(hotel_code)
                         if not ref_hotel_name:
                             logger.debug(f"TBO hotel {hotel_code} not found in mappings")
                             continue
@@ -242,61 +281,26 @@ class TBOProvider(ProviderAdapter):
                         if not hotel_name:
                             hotel_name = ref_hotel_name
                     
+                    # Currency is at hotel level
+                    hotel_context = {
+                        "hotel_code": hotel_code,
+                        "hotel_name": hotel_name,
+                        "currency": hotel_data.get('Currency', 'USD')
+                    }
+                    
                     # Process each room as separate offer (like Rate Hawk does)
                     room_results = hotel_data.get('Rooms', [])  # FIX: TBO uses 'Rooms' not 'RoomResult'
                     for room_data in room_results:
                         try:
-                            # Extract room details - TBO format
-                            room_names = room_data.get('Name', ['Standard Room'])
-                            room_type = room_names[0] if room_names else 'Standard Room'
-                            meal_type_raw = room_data.get('MealType', 'Room_Only') 
-                            booking_code = room_data.get('BookingCode', '')
-                            
                             # Keep original meal type for response-level filtering
                             # Mapping to standard codes will be done later in universal_provider
                             
-                            # Extract pricing - TBO format
-                            total_price = float(room_data.get('TotalFare', 0))
-                            currency = hotel_data.get('Currency', 'USD')  # Currency is at hotel level
-                            
-                            # Validate
-                            allowed_fields = Config.get_allowed_fields()
-                            
-                            # Rozpocznij z pustą ofertą i dodawaj tylko potrzebne pola
-                            offer = {}
-                            
-                            # Mapuj tylko jeśli pole jest dozwolone
-                            if 'supplier_hotel_id' in allowed_fields:
-                                offer['supplier_hotel_id'] = hotel_code
-                            if 'hotel_name' in allowed_fields:
-                                offer['hotel_name'] = hotel_name
-                            if 'supplier_room_code' in allowed_fields:
-                                offer['supplier_room_code'] = booking_code
-                            if 'room_name' in allowed_fields:
-                                offer['room_name'] = room_type
-                            if 'room_category' in allowed_fields:
-                                offer['room_category'] = None  # Will be set by universal provider
-                            if 'room_mapping_id' in allowed_fields:
-                                offer['room_mapping_id'] = None  # Will be set by universal provider
-                            if 'meal_plan' in allowed_fields:
-                                offer['meal_plan'] = meal_type_raw
-                            if 'total_price' in allowed_fields:
-                                offer['total_price'] = total_price
-                            if 'currency' in allowed_fields:
-                                offer['currency'] = currency
-                            if 'room_features' in allowed_fields:
-                                offer['room_features'] = []  # TBO doesn't provide detailed room features
-                            if 'amenities' in allowed_fields:
-                                offer['amenities'] = []  # TBO doesn't provide detailed amenities
-                            if 'free_cancellation_until' in allowed_fields:
-                                # Extract free cancellation date from CancelPolicies
-                                free_cancellation_date = self._extract_free_cancellation_date(room_data)
-                                offer['free_cancellation_until'] = free_cancellation_date
-                                logger.debug(f"TBO: Added free_cancellation_until={free_cancellation_date} to offer")
+                            # Offer with allowed fields only (compiled projection)
+                            offer = build_offer(hotel_context, room_data)
                             
                             # Dodaj pola systemowe (zawsze potrzebne)
                             offer['provider'] = "tbo"
-                            offer['offer_id'] = booking_code
+                            offer['offer_id'] = room_data.get('BookingCode', '')
                             
                             offers.append(offer)
                             
@@ -444,7 +448,8 @@ class TBOProvider(ProviderAdapter):
         timeout = self._get_config_value('timeout', 25)
         return f"TBOProvider(base_url={base_url}, timeout={timeout})"
 
-    def _extract_free_cancellation_date(self, room_data: Dict[str, Any]) -> Optional[str]:
+    @staticmethod
+    def _extract_free_cancellation_date(room_data: Dict[str, Any]) -> Optional[str]:
         """
         Extract free cancellation date from TBO CancelPolicies
         
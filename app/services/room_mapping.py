@@ -3,7 +3,7 @@ Room Categorization Service - Simple Room Category Assignment
 Assigns categories to rooms based on room name using YAML configuration.
 """
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -32,15 +32,8 @@ class RoomCategorizerService:
             # Get or create parser (cached for performance)
             parser = self._get_parser()
             
-            # Parse room_class directly from room name using YAML patterns
-            room_class = parser.parse_room_class(room_name)
-            
-            if room_class:
-                self.logger.debug(f"Categorized '{room_name}' as '{room_class}'")
-                return room_class
-            else:
-                self.logger.debug(f"No category found for '{room_name}'")
-                return None
+            # Parse room_class directly from room name using YAML patterns (memoized per room name)
+            return parser.parse_room_class(room_name) or None
                 
         except Exception as e:
             self.logger.error(f"Error categorizing room '{room_name}': {e}")
@@ -58,6 +51,12 @@ class RoomCategorizerService:
                 raise
         
         return self._parser_cache['parser']
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get room categorization memoization statistics"""
+        if 'parser' not in self._parser_cache:
+            return {"entries": 0, "hits": 0, "misses": 0, "hit_rate": 0.0}
+        return self._parser_cache['parser'].get_room_class_cache_stats()
 
 
 # Global instance for compatibility with existing code
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from app.config import config
+from app.models.compact_offer import json_default
+
+logger = logging.getLogger(__name__)
+
+# Criteria keys that do not change what a provider returns
+IGNORED_CRITERIA_KEYS = {"providers", "search_timeout", "search_deadline", "resolved_hotel_ids", "user"}
+
+# Criteria keys whose list order does not matter
+UNORDERED_CRITERIA_KEYS = {"hotel_names", "meal_types"}
+
+
+def normalize_search_criteria(criteria: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop keys irrelevant for provider results and sort unordered lists"""
+    normalized = {}
+    for key, value in criteria.items():
+        if key in IGNORED_CRITERIA_KEYS or value is None:
+            continue
+        if key in UNORDERED_CRITERIA_KEYS and isinstance(value, list):
+            value = sorted(str(item) for item in value)
+        elif isinstance(value, str):
+            value = value.strip().upper() if key in ("currency", "nationality") else value.strip()
+        normalized[key] = value
+    return normalized
+
+
+def make_search_key(provider_name: str, criteria: Dict[str, Any]) -> str:
+    """Build canonical key for provider + criteria (identical searches get identical keys)"""
+    payload = json.dumps(
+        {"provider": provider_name, "criteria": normalize_search_criteria(criteria)},
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchResultCache:
+    """
+    In-memory LRU cache for per-provider search results.
+
+    Entries are keyed by a canonical hash of provider name + normalized criteria,
+    expire after the provider's TTL and are evicted least-recently-used first
+    once the approximate memory budget is exceeded. Within the provider's
+    stale_while_revalidate_seconds window an expired entry is still returned
+    (marked stale) so the caller can refresh it in the background. Because every
+    provider is cached separately, a search where only some providers are cached
+    calls only the missing ones.
+    """
+
+    def __init__(self, max_memory_bytes: int, default_ttl: float):
+        """
+        Initialize cache.
+
+        Args:
+            max_memory_bytes: Approximate memory budget for cached results
+            default_ttl: TTL in seconds for providers without own result_cache config
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.default_ttl = default_ttl
+
+        # key -> (stored_at, size_bytes, result)
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._memory_bytes = 0
+
+        # Statistics
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_ttl(self, provider_name: str) -> float:
+        """Get result TTL in seconds for provider (0 disables caching)"""
+        cache_config = config.get_result_cache_config(provider_name) or {}
+        return cache_config.get("ttl_seconds", self.default_ttl)
+
+    def get_stale_window(self, provider_name: str) -> float:
+        """Get seconds after TTL during which an expired result may still be served"""
+        cache_config = config.get_result_cache_config(provider_name) or {}
+        return cache_config.get("stale_while_revalidate_seconds", 0)
+
+    def make_key(self, provider_name: str, criteria: Dict[str, Any]) -> str:
+        """Build canonical cache key for provider + criteria"""
+        return make_search_key(provider_name, criteria)
+
+    def get(self, provider_name: str, criteria: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], float, bool]]:
+        """
+        Get cached result for provider + criteria.
+
+        Results older than TTL are still returned (marked stale) within the
+        provider's stale_while_revalidate_seconds window.
+
+        Returns:
+            Tuple (result copy, age in seconds, is_stale) or None on miss/expired entry
+        """
+        ttl = self.get_ttl(provider_name)
+        if ttl <= 0:
+            return None
+
+        key = self.make_key(provider_name, criteria)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        stored_at, size_bytes, result = entry
+        age = time.time() - stored_at
+        is_stale = age >= ttl
+        if is_stale and age >= ttl + self.get_stale_window(provider_name):
+            self._remove(key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if is_stale:
+            self._stale_hits += 1
+        else:
+            self._hits += 1
+        # Offers are copied so callers can't modify cached data
+        result_copy = dict(result)
+        result_copy["offers"] = [offer.copy() for offer in result.get("offers", [])]
+        return result_copy, age, is_stale
+
+    def set(self, provider_name: str, criteria: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store successful provider result"""
+        if result.get("status") != "success" or self.get_ttl(provider_name) <= 0:
+            return
+
+        try:
+            # Approximate memory footprint by serialized size
+            size_bytes = len(json.dumps(result, default=json_default))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"[CACHE] Result for {provider_name} not cacheable: {e}")
+            return
+
+        if size_bytes > self.max_memory_bytes:
+            return
+
+        key = self.make_key(provider_name, criteria)
+        self._remove(key)
+        stored = dict(result)
+        stored["offers"] = [offer.copy() for offer in result.get("offers", [])]
+        self._entries[key] = (time.time(), size_bytes, stored)
+        self._memory_bytes += size_bytes
+
+        while self._memory_bytes > self.max_memory_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """Remove entry and release its memory"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._entries.clear()
+        self._memory_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for monitoring"""
+        lookups = self._hits + self._stale_hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "memory_bytes": self._memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+            "hits": self._hits,
+            "stale_hits": self._stale_hits,
+            "misses": self._misses,
+            "hit_rate": round((self._hits + self._stale_hits) / lookups, 3) if lookups else 0.0,
+            "evictions": self._evictions
+        }
+
+
+# Global instance (None when caching is disabled)
+search_result_cache: Optional[SearchResultCache] = (
+    SearchResultCache(
+        max_memory_bytes=config.SEARCH_CACHE_MAX_MEMORY_MB * 1024 * 1024,
+        default_ttl=config.SEARCH_CACHE_DEFAULT_TTL
+    )
+    if config.SEARCH_CACHE_ENABLED else None
+)
@@ -6,56 +6,115 @@ Centralized session management with connection pooling and optimization
 import aiohttp
 import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Any
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+# Connector settings for providers without own connection_pool config
+DEFAULT_CONNECTION_POOL = {
+    "limit": 50,
+    "limit_per_host": 20,
+    "keepalive_timeout": 30,
+    "ttl_dns_cache": 300,
+    "force_close": False,
+    "prewarm_connections": 0
+}
+
+
 class SessionManager:
     """
     Centralized HTTP session manager with optimizations:
-    - Connection pooling per provider
+    - Dedicated session and connection pool per provider (Config.PROVIDERS connection_pool)
     - DNS caching
-    - Keep-alive connections
-    - Auth-specific session reuse
+    - Keep-alive connections, optionally pre-warmed on startup
+    - Lock-free lookup of existing sessions
     """
     
     def __init__(self):
         """Initialize the session manager"""
         self._sessions: Dict[str, aiohttp.ClientSession] = {}
-        self._global_session: Optional[aiohttp.ClientSession] = None
-        self._lock = asyncio.Lock()  # Prevent race conditions
-        
+        self._pool_counters: Dict[str, Dict[str, int]] = {}
+        self._lock = asyncio.Lock()  # Serializes session creation only
+    
     async def get_session(self, provider_name: str) -> aiohttp.ClientSession:
         """
         Get optimized HTTP session for provider.
         
+        Existing open sessions are returned without locking; the lock is only
+        taken when a session has to be created or recreated.
+        
         Args:
             provider_name: Name of the provider (tbo, rate_hawk, goglobal)
-            
+        
         Returns:
             aiohttp.ClientSession: Optimized session for the provider
         """
-        async with self._lock:  # Thread-safe session creation
-            if provider_name not in self._sessions:
-                await self._create_provider_session(provider_name)
-                
-            session = self._sessions[provider_name]
+        session = self._sessions.get(provider_name)
+        if session is not None and not session.closed:
+            return session
+        
+        async with self._lock:
+            # Another coroutine may have created it while we waited
+            session = self._sessions.get(provider_name)
+            if session is not None and not session.closed:
+                return session
             
-            # Check if session is still valid
-            if session.closed:
+            if session is not None:
                 logger.warning(f"Session for {provider_name} was closed, recreating")
-                await self._create_provider_session(provider_name)
-                session = self._sessions[provider_name]
-                
-            return session
+            return self._create_provider_session(provider_name)
     
-    async def _create_provider_session(self, provider_name: str):
+    def _get_pool_config(self, provider_name: str) -> Dict[str, Any]:
+        """Provider connection pool config merged over defaults"""
+        return {**DEFAULT_CONNECTION_POOL, **(config.get_connection_pool_config(provider_name) or {})}
+    
+    def _create_connector(self, pool_config: Dict[str, Any]) -> aiohttp.TCPConnector:
+        """Create TCP connector from connection pool config"""
+        connector_args = {
+            "limit": pool_config["limit"],
+            "limit_per_host": pool_config["limit_per_host"],
+            "ttl_dns_cache": pool_config["ttl_dns_cache"],
+            "use_dns_cache": True,
+            "force_close": pool_config["force_close"],
+            "enable_cleanup_closed": True  # Clean up closed connections
+        }
+        # aiohttp rejects keepalive_timeout together with force_close
+        if not pool_config["force_close"]:
+            connector_args["keepalive_timeout"] = pool_config["keepalive_timeout"]
+        return aiohttp.TCPConnector(**connector_args)
+    
+    def _create_trace_config(self, provider_name: str) -> aiohttp.TraceConfig:
+        """Trace config counting created/reused connections and requests waiting for a free one"""
+        counters = self._pool_counters.setdefault(provider_name, {"created": 0, "reused": 0, "waiting": 0})
+        
+        async def on_connection_create_end(session, context, params):
+            counters["created"] += 1
+        
+        async def on_connection_reuseconn(session, context, params):
+            counters["reused"] += 1
+        
+        async def on_connection_queued_start(session, context, params):
+            counters["waiting"] += 1
+        
+        async def on_connection_queued_end(session, context, params):
+            counters["waiting"] -= 1
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        return trace_config
+    
+    def _create_provider_session(self, provider_name: str) -> aiohttp.ClientSession:
         """
         Create optimized session for specific provider.
         
         Args:
             provider_name: Provider name to create session for
+        
+        Returns:
+            aiohttp.ClientSession: New session (also stored for reuse)
         """
         try:
             provider_config = config.get_provider_config(provider_name)
@@ -63,15 +122,7 @@ class SessionManager:
             if not provider_config:
                 raise ValueError(f"No configuration found for provider: {provider_name}")
             
-            # Create optimized connector with connection pooling
-            connector = aiohttp.TCPConnector(
-                limit=50,              # Total connection pool size
-                limit_per_host=20,     # Max connections per host
-                ttl_dns_cache=300,     # DNS cache TTL (5 minutes)
-                use_dns_cache=True,    # Enable DNS caching
-                keepalive_timeout=30,  # Keep connections alive for 30s
-                enable_cleanup_closed=True  # Clean up closed connections
-            )
+            pool_config = self._get_pool_config(provider_name)
             
             # Configure timeout
             timeout = aiohttp.ClientTimeout(
@@ -79,44 +130,72 @@ class SessionManager:
                 connect=30  # Connection timeout
             )
             
-            # Check authentication type
-            auth_type = provider_config.get('auth_type')
-            
-            if auth_type == 'basic':
-                # Provider needs Basic Auth - create dedicated session
+            # Basic Auth providers get credentials attached to the session
+            auth = None
+            if provider_config.get('auth_type') == 'basic':
                 auth = aiohttp.BasicAuth(
-                    provider_config['username'], 
+                    provider_config['username'],
                     provider_config['password']
                 )
-                
-                session = aiohttp.ClientSession(
-                    connector=connector,
-                    auth=auth,
-                    timeout=timeout
-                )
-                
-                logger.debug(f"Created Basic Auth session for {provider_name}")
-                
-            else:
-                # No auth or API key auth - can reuse global session
-                if not self._global_session or self._global_session.closed:
-                    self._global_session = aiohttp.ClientSession(
-                        connector=connector,
-                        timeout=timeout
-                    )
-                    logger.debug("Created global session for non-auth providers")
-                
-                session = self._global_session
-                logger.debug(f"Reusing global session for {provider_name}")
             
-            self._sessions[provider_name] = session
+            session = aiohttp.ClientSession(
+                connector=self._create_connector(pool_config),
+                auth=auth,
+                timeout=timeout,
+                trace_configs=[self._create_trace_config(provider_name)]
+            )
             
+            logger.debug(f"Created session for {provider_name} (limit={pool_config['limit']}, "
+                         f"per_host={pool_config['limit_per_host']}, force_close={pool_config['force_close']})")
+        
         except Exception as e:
             logger.error(f"Failed to create session for {provider_name}: {e}")
             # Fallback to basic session
-            self._sessions[provider_name] = aiohttp.ClientSession(
+            session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=30)
             )
+        
+        self._sessions[provider_name] = session
+        return session
+    
+    async def prewarm(self, provider_names: List[str]) -> Dict[str, int]:
+        """
+        Open keep-alive connections to suppliers ahead of the first search.
+        
+        Sends `prewarm_connections` concurrent HEAD requests to each provider's
+        base_url; the connections stay in the pool for reuse. Failures are
+        ignored - the pool simply starts cold.
+        
+        Args:
+            provider_names: Providers to pre-warm
+        
+        Returns:
+            Dict provider -> number of connections opened
+        """
+        async def open_connection(session: aiohttp.ClientSession, url: str) -> bool:
+            try:
+                async with session.head(url, allow_redirects=False, timeout=aiohttp.ClientTimeout(total=5)):
+                    return True
+            except Exception as e:
+                logger.debug(f"Pre-warm request to {url} failed: {e}")
+                return False
+        
+        async def prewarm_provider(provider_name: str) -> int:
+            pool_config = self._get_pool_config(provider_name)
+            provider_config = config.get_provider_config(provider_name) or {}
+            count = pool_config["prewarm_connections"]
+            url = provider_config.get("base_url")
+            if count <= 0 or not url or pool_config["force_close"]:
+                return 0
+            
+            session = await self.get_session(provider_name)
+            results = await asyncio.gather(*(open_connection(session, url) for _ in range(count)))
+            return sum(results)
+        
+        counts = await asyncio.gather(*(prewarm_provider(name) for name in provider_names))
+        warmed = dict(zip(provider_names, counts))
+        logger.info(f"[PROVIDERS] Pre-warmed connections: {warmed}")
+        return warmed
     
     async def close_all_sessions(self):
         """
@@ -131,14 +210,8 @@ class SessionManager:
                 await session.close()
                 logger.debug(f"Closed session for {provider_name}")
         
-        # Close global session
-        if self._global_session and not self._global_session.closed:
-            await self._global_session.close()
-            logger.debug("Closed global session")
-        
         # Clear references
         self._sessions.clear()
-        self._global_session = None
     
     async def close_provider_session(self, provider_name: str):
         """
@@ -156,29 +229,33 @@ class SessionManager:
     
     def get_session_stats(self) -> Dict[str, Dict]:
         """
-        Get statistics about current sessions.
+        Get statistics about current sessions and live connection pool usage.
         Useful for monitoring and debugging.
         
         Returns:
-            Dict with session statistics
+            Dict with session statistics per provider:
+            acquired (in use), available (idle keep-alive), waiting (requests
+            queued for a free connection), created/reused totals
         """
         stats = {}
         
         for provider_name, session in self._sessions.items():
+            connector = session.connector
+            counters = self._pool_counters.get(provider_name, {})
+            idle_connections = getattr(connector, '_conns', None) or {}
             stats[provider_name] = {
                 'closed': session.closed,
-                'connector_limit': getattr(session.connector, 'limit', 'unknown'),
-                'connector_limit_per_host': getattr(session.connector, 'limit_per_host', 'unknown')
-            }
-        
-        if self._global_session:
-            stats['global_session'] = {
-                'closed': self._global_session.closed,
-                'connector_limit': getattr(self._global_session.connector, 'limit', 'unknown'),
-                'connector_limit_per_host': getattr(self._global_session.connector, 'limit_per_host', 'unknown')
+                'connector_limit': getattr(connector, 'limit', 'unknown'),
+                'connector_limit_per_host': getattr(connector, 'limit_per_host', 'unknown'),
+                'force_close': getattr(connector, 'force_close', 'unknown'),
+                'acquired': len(getattr(connector, '_acquired', ()) or ()),
+                'available': sum(len(connections) for connections in idle_connections.values()),
+                'waiting': counters.get('waiting', 0),
+                'created': counters.get('created', 0),
+                'reused': counters.get('reused', 0)
             }
         
         return stats
 
 # Global instance
-session_manager = SessionManager()
\ No newline at end of file
+session_manager = SessionManager()
@@ -3,15 +3,23 @@ import asyncio
 import time
 import logging
 import importlib
-from typing import Dict, Any, List, Optional
+import concurrent.futures
+from typing import Dict, Any, List, Optional, AsyncIterator
 from abc import ABC, abstractmethod
 from app.config import config
 from app.services.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitState
 from app.services.session_manager import session_manager
+from app.services.latency_tracker import latency_tracker
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Shared executor for CPU-heavy response normalization (keeps the event loop free)
+normalization_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=config.NORMALIZATION_WORKERS,
+    thread_name_prefix="normalize"
+)
+
 class ProviderAdapter(ABC):
     """Abstract base for all provider adapters"""
     
@@ -61,7 +69,26 @@ class ProviderAdapter(ABC):
         """
         # Default implementation - no modification (response-level filtering)
         return criteria
-    
+
+    async def get_hotel_id(self, hotel_name: str, criteria: Dict[str, Any]) -> Optional[str]:
+        """
+        Get this provider's hotel ID for a ref_hotel_name.
+        Uses IDs resolved once per search by UniversalProvider.search_all when present,
+        otherwise falls back to the hotel mapping service.
+
+        Args:
+            hotel_name: Exact ref_hotel_name
+            criteria: Search criteria (may contain 'resolved_hotel_ids')
+        Returns:
+            Optional[str]: Provider hotel ID or None if not mapped
+        """
+        resolved_hotel_ids = criteria.get("resolved_hotel_ids")
+        if resolved_hotel_ids is not None and hotel_name in resolved_hotel_ids:
+            return resolved_hotel_ids[hotel_name].get(self.provider_name)
+
+        from app.services.hotel_mapping import hotel_mapping_service
+        return await hotel_mapping_service.get_hotel_id_async(hotel_name, self.provider_name)
+
     async def get_session(self) -> aiohttp.ClientSession:
         """
         Get HTTP session using centralized SessionManager.
@@ -88,6 +115,10 @@ class UniversalProvider:
         """
         self.adapters: Dict[str, ProviderAdapter] = {}
         self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        # Single-flight state: in-flight provider calls by search key
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background_tasks = set()
+        self._coalesced_requests = 0
         self._load_adapters()
     
     def get_circuit_breaker(self, provider_name: str):
@@ -147,6 +178,103 @@ class UniversalProvider:
             raise RuntimeError("No providers could be loaded! Check your configuration.")
     
     async def search_single(self, provider_name: str, criteria: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Search using a single provider.
+        
+        Served from the result cache when enabled (stale results are returned
+        immediately and refreshed in background), otherwise concurrent identical
+        searches share one in-flight provider call.
+        Args:
+            provider_name (str): Name of the provider
+            criteria (Dict[str, Any]): Search parameters
+        Returns:
+            Dict[str, Any]: Search result including offers, status and cache info
+        """
+        if provider_name not in self.adapters:
+            return await self._search_single_uncached(provider_name, criteria)
+        
+        from app.services.search_cache import search_result_cache
+        if search_result_cache is not None:
+            cached = search_result_cache.get(provider_name, criteria)
+            if cached is not None:
+                result, age, is_stale = cached
+                if is_stale:
+                    logger.debug(f"[CACHE] {provider_name}: stale hit ({age:.1f}s old) - revalidating in background")
+                    self._revalidate_in_background(provider_name, criteria)
+                else:
+                    logger.debug(f"[CACHE] {provider_name}: hit ({age:.1f}s old)")
+                result["cache"] = {"status": "stale" if is_stale else "hit", "age_seconds": round(age, 1)}
+                return result
+        
+        result, coalesced = await self._search_single_shared(provider_name, criteria)
+        if coalesced:
+            result["coalesced"] = True
+        if search_result_cache is not None:
+            result["cache"] = {"status": "miss", "age_seconds": 0.0}
+        return result
+    
+    def _is_coalescing_enabled(self, provider_name: str) -> bool:
+        """Check if identical concurrent searches should share one provider call"""
+        cache_config = config.get_result_cache_config(provider_name) or {}
+        return cache_config.get("coalesce_requests", False)
+    
+    async def _fetch_and_cache(self, provider_name: str, criteria: Dict[str, Any]) -> Dict[str, Any]:
+        """Call provider and store successful result in the result cache"""
+        from app.services.search_cache import search_result_cache
+        result = await self._search_single_uncached(provider_name, criteria)
+        if search_result_cache is not None:
+            search_result_cache.set(provider_name, criteria, result)
+        return result
+    
+    async def _search_single_shared(self, provider_name: str, criteria: Dict[str, Any]):
+        """
+        Single-flight provider call - concurrent identical (provider, criteria)
+        searches await the same in-flight task instead of calling the supplier again.
+        Returns:
+            Tuple (result copy, coalesced flag)
+        """
+        if not self._is_coalescing_enabled(provider_name):
+            return await self._fetch_and_cache(provider_name, criteria), False
+        
+        from app.services.search_cache import make_search_key
+        key = make_search_key(provider_name, criteria)
+        task = self._inflight.get(key)
+        coalesced = task is not None
+        
+        if task is None:
+            task = asyncio.create_task(
+                self._fetch_and_cache(provider_name, criteria),
+                name=f"fetch_{provider_name}"
+            )
+            self._inflight[key] = task
+            
+            def _forget(done_task, key=key):
+                if self._inflight.get(key) is done_task:
+                    del self._inflight[key]
+            task.add_done_callback(_forget)
+        else:
+            self._coalesced_requests += 1
+            logger.info(f"[PROVIDERS] {provider_name}: joined in-flight identical search")
+        
+        # Shield so a cancelled waiter (e.g. search_all timeout) doesn't cancel the shared call
+        result = await asyncio.shield(task)
+        result_copy = dict(result)
+        result_copy["offers"] = list(result.get("offers", []))
+        return result_copy, coalesced
+    
+    def _revalidate_in_background(self, provider_name: str, criteria: Dict[str, Any]) -> None:
+        """Refresh stale cached result without blocking the current search"""
+        async def revalidate():
+            try:
+                await self._search_single_shared(provider_name, criteria)
+            except Exception as e:
+                logger.warning(f"[CACHE] Background refresh for {provider_name} failed: {e}")
+        
+        task = asyncio.create_task(revalidate(), name=f"revalidate_{provider_name}")
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _search_single_uncached(self, provider_name: str, criteria: Dict[str, Any]) -> Dict[str, Any]:
         """
         Search using a single provider with circuit breaker and retry logic.
         Args:
@@ -177,9 +305,11 @@ class UniversalProvider:
                 "circuit_breaker_state": circuit_breaker.state.value
             }
         
-        # Retry logic with exponential backoff
+        # Retry logic with exponential backoff, bounded by the search deadline
         max_retries = config.MAX_RETRIES
         base_delay = config.RETRY_BASE_DELAY
+        deadline = criteria.get("search_deadline")
+        attempt_stats = {"retries": 0, "retries_skipped": 0, "hedged_requests": 0}
         
         for attempt in range(max_retries):
             try:
@@ -188,67 +318,15 @@ class UniversalProvider:
                 
                 # Note: Provider-specific hotel mapping is now handled directly in each provider's search() method
                 
-                if circuit_breaker:
-                    # Use circuit breaker for the call
-                    async def provider_call():
-                        return await adapter.search(provider_criteria)
-                    
-                    raw_response = await circuit_breaker.call(provider_call)
-                else:
-                    # Direct call without circuit breaker
-                    raw_response = await adapter.search(provider_criteria)
-                
-                normalized_offers = adapter.normalize(raw_response, criteria)
-                
-                # Apply meal_types filtering if specified
-                meal_types = criteria.get("meal_types")
-                logger.debug(f"DEBUG: meal_types from criteria = '{meal_types}' (type: {type(meal_types)}, bool: {bool(meal_types)})")
-                
-                if meal_types:
-                    # Import here to avoid circular imports
-                    from app.services.meal_mapping import meal_mapping_service as meal_type_service
-                    
-                    logger.debug(f"DEBUG: Checking should_filter_at_response_level for {provider_name}")
-                    
-                    # Apply response-level filtering if required by provider
-                    # Check if any of the meal types requires response-level filtering
-                    needs_response_filtering = any(
-                        meal_type_service.should_filter_at_response_level(provider_name, meal_type) 
-                        for meal_type in meal_types if meal_type
-                    )
-                    
-                    if needs_response_filtering:
-                        logger.debug(f"DEBUG: APPLYING response-level filtering for {provider_name}")
-                        normalized_offers = meal_type_service.filter_offers_by_any_meal_type(
-                            provider_name, normalized_offers, meal_types
-                        )
-                        logger.debug(f"{provider_name}: Applied response-level meal_types filtering for {meal_types}")
-                    else:
-                        logger.debug(f"DEBUG: should_filter_at_response_level returned False for {provider_name}")
-                else:
-                    logger.debug(f"DEBUG: No meal_types in criteria - skipping filtering")
-                
-                # Apply room_category filtering if specified
-                room_category = criteria.get("room_category")
-                logger.debug(f"DEBUG: room_category from criteria = '{room_category}' (type: {type(room_category)}, bool: {bool(room_category)})")
-                
-                if room_category:
-                    initial_count = len(normalized_offers)
-                    # Filter offers by room_category (case-insensitive matching)
-                    filtered_offers = []
-                    for offer in normalized_offers:
-                        offer_category = offer.get('room_category', '').strip()
-                        if offer_category.lower() == room_category.lower():
-                            filtered_offers.append(offer)
-                    
-                    normalized_offers = filtered_offers
-                    logger.debug(f"{provider_name}: Applied room_category filtering for '{room_category}' - {initial_count} -> {len(normalized_offers)} offers")
-                else:
-                    logger.debug(f"DEBUG: No room_category in criteria - skipping filtering")
+                raw_response = await self._call_provider(
+                    provider_name, adapter, circuit_breaker, provider_criteria, deadline, attempt_stats
+                )
                 
-                # Normalize meal_plan values to standard codes for final response
-                from app.services.meal_mapping import meal_mapping_service as meal_type_service
-                normalized_offers = meal_type_service.normalize_offers_meal_plans(normalized_offers, provider_name)
+                # Normalization and filtering are CPU-bound - run on shared executor, not the event loop
+                loop = asyncio.get_running_loop()
+                normalized_offers = await loop.run_in_executor(
+                    normalization_executor, self._process_response, adapter, provider_name, raw_response, criteria
+                )
                 
                 return {
                     "status": "success",
@@ -257,7 +335,8 @@ class UniversalProvider:
                     "offer_count": len(normalized_offers),
                     "processing_time_ms": int((time.time() - start_time) * 1000),
                     "attempts": attempt + 1,
-                    "circuit_breaker_state": circuit_breaker.state.value if circuit_breaker else "disabled"
+                    "circuit_breaker_state": circuit_breaker.state.value if circuit_breaker else "disabled",
+                    **attempt_stats
                 }
                 
             except CircuitBreakerOpenError as e:
@@ -267,38 +346,175 @@ class UniversalProvider:
                     "error": f"Connection protection triggered: The {provider_name} booking service has been automatically disabled due to repeated connection issues (circuit breaker activated). We're monitoring the situation and will restore service automatically. Please try again in a few minutes or contact support if issues persist.",
                     "offers": [],
                     "processing_time_ms": int((time.time() - start_time) * 1000),
-                    "circuit_breaker_state": "open"
+                    "circuit_breaker_state": "open",
+                    "attempts": attempt + 1,
+                    **attempt_stats
                 }
                 
             except asyncio.TimeoutError:
                 if attempt < max_retries - 1:
                     delay = base_delay * (2 ** attempt)
-                    logger.warning(f"Timeout on {provider_name}, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
-                    await asyncio.sleep(delay)
-                    continue
+                    if self._can_retry_before_deadline(provider_name, delay, deadline):
+                        attempt_stats["retries"] += 1
+                        logger.warning(f"Timeout on {provider_name}, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
+                        await asyncio.sleep(delay)
+                        continue
+                    attempt_stats["retries_skipped"] += 1
+                    logger.warning(f"Timeout on {provider_name}, skipping retry - it cannot finish before the search deadline")
                 return {
                     "status": "error",
                     "provider": provider_name,
-                    "error": f"Response timeout occurred: The {provider_name} service did not respond within the expected time limit after {max_retries} attempts. This may indicate high server load or network issues. Please try again later or contact support if the problem persists.",
+                    "error": f"Response timeout occurred: The {provider_name} service did not respond within the expected time limit after {attempt + 1} attempts. This may indicate high server load or network issues. Please try again later or contact support if the problem persists.",
                     "offers": [],
                     "processing_time_ms": int((time.time() - start_time) * 1000),
-                    "circuit_breaker_state": circuit_breaker.state.value if circuit_breaker else "disabled"
+                    "circuit_breaker_state": circuit_breaker.state.value if circuit_breaker else "disabled",
+                    "attempts": attempt + 1,
+                    **attempt_stats
                 }
             except Exception as e:
                 if attempt < max_retries - 1:
                     delay = base_delay * (2 ** attempt)
-                    logger.warning(f"Error on {provider_name}: {e}, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
-                    await asyncio.sleep(delay)
-                    continue
+                    if self._can_retry_before_deadline(provider_name, delay, deadline):
+                        attempt_stats["retries"] += 1
+                        logger.warning(f"Error on {provider_name}: {e}, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
+                        await asyncio.sleep(delay)
+                        continue
+                    attempt_stats["retries_skipped"] += 1
+                    logger.warning(f"Error on {provider_name}: {e}, skipping retry - it cannot finish before the search deadline")
                 return {
                     "status": "error",
                     "provider": provider_name,
-                    "error": f"Service error encountered: We experienced technical difficulties while connecting to the {provider_name} booking service after {max_retries} retry attempts. This could be due to temporary server issues or network problems. Please try again later or contact support for assistance.",
+                    "error": f"Service error encountered: We experienced technical difficulties while connecting to the {provider_name} booking service after {attempt + 1} attempts. This could be due to temporary server issues or network problems. Please try again later or contact support for assistance.",
                     "offers": [],
                     "processing_time_ms": int((time.time() - start_time) * 1000),
-                    "circuit_breaker_state": circuit_breaker.state.value if circuit_breaker else "disabled"
+                    "circuit_breaker_state": circuit_breaker.state.value if circuit_breaker else "disabled",
+                    "attempts": attempt + 1,
+                    **attempt_stats
                 }
     
+    def _process_response(self,
+                          adapter: ProviderAdapter,
+                          provider_name: str,
+                          raw_response: Dict[str, Any],
+                          criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Normalize raw provider response, apply meal/room filtering and
+        standard meal codes. Runs on the shared normalization executor.
+        Args:
+            adapter (ProviderAdapter): Provider adapter
+            provider_name (str): Name of the provider
+            raw_response (Dict[str, Any]): Raw provider response
+            criteria (Dict[str, Any]): Search parameters
+        Returns:
+            List[Dict[str, Any]]: Normalized, filtered offers
+        """
+        normalized_offers = adapter.normalize(raw_response, criteria)
+        
+        # Filter by meal_types (response-level providers) and normalize meal_plan
+        # values to standard codes for final response - one pass over the offers
+        from app.services.meal_mapping import meal_mapping_service as meal_type_service
+        normalized_offers = meal_type_service.apply(provider_name, normalized_offers, criteria.get("meal_types"))
+        
+        # Apply room_category filtering if specified
+        room_category = criteria.get("room_category")
+        logger.debug(f"DEBUG: room_category from criteria = '{room_category}' (type: {type(room_category)}, bool: {bool(room_category)})")
+        
+        if room_category:
+            initial_count = len(normalized_offers)
+            # Filter offers by room_category (case-insensitive matching)
+            filtered_offers = []
+            for offer in normalized_offers:
+                offer_category = offer.get('room_category', '').strip()
+                if offer_category.lower() == room_category.lower():
+                    filtered_offers.append(offer)
+            
+            normalized_offers = filtered_offers
+            logger.debug(f"{provider_name}: Applied room_category filtering for '{room_category}' - {initial_count} -> {len(normalized_offers)} offers")
+        else:
+            logger.debug(f"DEBUG: No room_category in criteria - skipping filtering")
+        
+        return normalized_offers
+    
+    def _can_retry_before_deadline(self, provider_name: str, delay: float, deadline: Optional[float]) -> bool:
+        """
+        Check if a retry after `delay` can still finish before the search deadline,
+        assuming it takes the provider's median (p50) latency.
+        """
+        if deadline is None:
+            return True
+        expected_latency = latency_tracker.percentile(provider_name, 50) or 0.0
+        return time.monotonic() + delay + expected_latency < deadline
+    
+    def _get_hedge_delay(self, provider_name: str, deadline: Optional[float]) -> Optional[float]:
+        """
+        Get delay after which a hedged request is sent (provider's p95 latency).
+        Returns None if hedging is disabled, there is not enough latency history,
+        or the hedge could not start before the deadline.
+        """
+        hedging_config = config.get_hedging_config(provider_name) or {}
+        if not hedging_config.get("enabled", False):
+            return None
+        
+        hedge_delay = latency_tracker.percentile(
+            provider_name, hedging_config.get("percentile", 95), min_samples=hedging_config.get("min_samples", 20)
+        )
+        if hedge_delay is None:
+            return None
+        if deadline is not None and time.monotonic() + hedge_delay >= deadline:
+            return None
+        return hedge_delay
+    
+    async def _call_provider(self,
+                             provider_name: str,
+                             adapter: ProviderAdapter,
+                             circuit_breaker: Optional[CircuitBreaker],
+                             provider_criteria: Dict[str, Any],
+                             deadline: Optional[float],
+                             attempt_stats: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Call provider search (through circuit breaker if configured) and record its latency.
+        
+        With hedging enabled, a second identical request is sent when the first one
+        has not answered within the provider's p95 latency; the first successful
+        response wins and the other request is cancelled.
+        """
+        async def provider_call():
+            return await adapter.search(provider_criteria)
+        
+        def start_call() -> asyncio.Task:
+            if circuit_breaker:
+                # Use circuit breaker for the call
+                return asyncio.create_task(circuit_breaker.call(provider_call))
+            # Direct call without circuit breaker
+            return asyncio.create_task(provider_call())
+        
+        call_start = time.monotonic()
+        hedge_delay = self._get_hedge_delay(provider_name, deadline)
+        tasks = [start_call()]
+        
+        try:
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    attempt_stats["hedged_requests"] += 1
+                    logger.info(f"[PROVIDERS] {provider_name}: no response after p95 ({hedge_delay:.2f}s) - sending hedged request")
+                    tasks.append(start_call())
+            
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        latency_tracker.record(provider_name, time.monotonic() - call_start)
+                        return task.result()
+            
+            # All requests failed - surface the first one's error to the retry logic
+            raise tasks[0].exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
     async def search_all(self, criteria: Dict[str, Any]) -> Dict[str, Any]:
         """
         Search using all available providers with optimized parallel processing.
@@ -330,30 +546,17 @@ class UniversalProvider:
                 }
             }
         
-        # Filter providers based on criteria if specified
-        selected_providers = criteria.get("providers", [])
-        if selected_providers:
-            # Validate and filter providers
-            available_providers = list(self.adapters.keys())
-            valid_providers = [p for p in selected_providers if p in available_providers]
-            
-            # Log provider filtering
-            if len(valid_providers) != len(selected_providers):
-                invalid_providers = [p for p in selected_providers if p not in available_providers]
-                logger.warning(f"Ignoring invalid providers: {invalid_providers}")
-                logger.warning(f"Available providers: {available_providers}")
-            
-            if not valid_providers:
-                logger.warning(f"No valid providers found from request: {selected_providers}")
-                logger.info(f"Falling back to all available providers: {available_providers}")
-                providers_to_search = available_providers
-            else:
-                providers_to_search = valid_providers
-        else:
-            providers_to_search = list(self.adapters.keys())
+        providers_to_search = self._select_providers(criteria)
+        
+        # Resolve hotel IDs for all providers once, before fan-out
+        criteria, mapping_info = await self._resolve_hotel_ids(criteria, hotel_names)
         
         logger.info(f"Starting parallel search across {len(providers_to_search)} providers")
         
+        # Set timeout for provider searches (configurable)
+        search_timeout = criteria.get('search_timeout', 10.0)  # 10 seconds default
+        criteria = {**criteria, "search_deadline": time.monotonic() + search_timeout}
+        
         # Create tasks for concurrent execution
         provider_tasks = {}
         for provider_name in providers_to_search:
@@ -365,10 +568,6 @@ class UniversalProvider:
         
         # Enhanced parallel processing with timeout and partial results
         provider_results = {}
-        all_offers = []
-        
-        # Set timeout for provider searches (configurable)
-        search_timeout = criteria.get('search_timeout', 10.0)  # 10 seconds default
         
         try:
             # Wait for all tasks with timeout
@@ -391,8 +590,6 @@ class UniversalProvider:
                     }
                 else:
                     provider_results[provider_name] = result
-                    if result["status"] == "success":
-                        all_offers.extend(result["offers"])
         
         except asyncio.TimeoutError:
             # Handle timeout - collect partial results from completed providers
@@ -407,8 +604,6 @@ class UniversalProvider:
                     try:
                         result = task.result()  # Use result() instead of await to avoid CancelledError
                         provider_results[provider_name] = result
-                        if result["status"] == "success":
-                            all_offers.extend(result["offers"])
                         completed_providers.append(provider_name)
                     except asyncio.CancelledError:
                         # Task was cancelled during timeout
@@ -455,15 +650,206 @@ class UniversalProvider:
                         "offers": []
                     }
         
+        processing_time_ms = int((time.time() - start_time) * 1000)
+        
+        return {
+            "providers": provider_results,
+            "summary": self._build_summary(
+                provider_results, hotel_names, processing_time_ms, search_timeout, mapping_info
+            )
+        }
+    
+    async def search_stream(self, criteria: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Search all selected providers and yield each provider's result as soon as it completes.
+        
+        Yields events:
+        - {"event": "provider", "provider": name, "result": search_single result} - one per provider
+        - {"event": "summary", "summary": {...}} - last event, same summary as search_all
+        
+        Args:
+            criteria (Dict[str, Any]): Search parameters (same as search_all)
+        Yields:
+            Dict[str, Any]: Provider result events followed by summary event
+        """
+        start_time = time.time()
+        hotel_names = criteria.get("hotel_names", [])
+        search_timeout = criteria.get('search_timeout', 10.0)
+        provider_results: Dict[str, Dict[str, Any]] = {}
+        
+        if not hotel_names:
+            logger.error("No hotel names provided in criteria")
+            yield {
+                "event": "summary",
+                "summary": self._build_summary({}, [], int((time.time() - start_time) * 1000), search_timeout, None)
+            }
+            return
+        
+        providers_to_search = self._select_providers(criteria)
+        criteria, mapping_info = await self._resolve_hotel_ids(criteria, hotel_names)
+        
+        criteria = {**criteria, "search_deadline": time.monotonic() + search_timeout}
+        
+        logger.info(f"Starting streaming search across {len(providers_to_search)} providers")
+        
+        provider_tasks = {
+            asyncio.create_task(self.search_single(provider_name, criteria), name=f"search_{provider_name}"): provider_name
+            for provider_name in providers_to_search
+        }
+        
+        try:
+            # Yield results in completion order until all done or timeout
+            pending = set(provider_tasks)
+            deadline = start_time + search_timeout
+            while pending:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider_name = provider_tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.error(f"Provider {provider_name} failed with exception: {e}")
+                        result = {
+                            "status": "error",
+                            "error": str(e),
+                            "offers": [],
+                            "processing_time_ms": int((time.time() - start_time) * 1000)
+                        }
+                    provider_results[provider_name] = result
+                    yield {"event": "provider", "provider": provider_name, "result": result}
+            
+            # Providers still running after timeout
+            for task in pending:
+                provider_name = provider_tasks[task]
+                task.cancel()
+                result = {
+                    "status": "timeout",
+                    "error": f"Provider search timed out after {search_timeout}s",
+                    "offers": [],
+                    "processing_time_ms": int(search_timeout * 1000)
+                }
+                provider_results[provider_name] = result
+                yield {"event": "provider", "provider": provider_name, "result": result}
+        finally:
+            # Client disconnected or generator closed early - don't leave provider calls running
+            for task in provider_tasks:
+                if not task.done():
+                    task.cancel()
+        
+        processing_time_ms = int((time.time() - start_time) * 1000)
+        yield {
+            "event": "summary",
+            "summary": self._build_summary(
+                provider_results, hotel_names, processing_time_ms, search_timeout, mapping_info
+            )
+        }
+    
+    def _select_providers(self, criteria: Dict[str, Any]) -> List[str]:
+        """
+        Get providers to search - requested ones if valid, otherwise all available.
+        Args:
+            criteria (Dict[str, Any]): Search parameters (optional 'providers' list)
+        Returns:
+            List[str]: Provider names to search
+        """
+        # Filter providers based on criteria if specified
+        selected_providers = criteria.get("providers", [])
+        if selected_providers:
+            # Validate and filter providers
+            available_providers = list(self.adapters.keys())
+            valid_providers = [p for p in selected_providers if p in available_providers]
+            
+            # Log provider filtering
+            if len(valid_providers) != len(selected_providers):
+                invalid_providers = [p for p in selected_providers if p not in available_providers]
+                logger.warning(f"Ignoring invalid providers: {invalid_providers}")
+                logger.warning(f"Available providers: {available_providers}")
+            
+            if not valid_providers:
+                logger.warning(f"No valid providers found from request: {selected_providers}")
+                logger.info(f"Falling back to all available providers: {available_providers}")
+                return available_providers
+            return valid_providers
+        return list(self.adapters.keys())
+    
+    async def _resolve_hotel_ids(self, criteria: Dict[str, Any], hotel_names: List[str]):
+        """
+        Resolve hotel IDs for all providers once, before fan-out.
+        Args:
+            criteria (Dict[str, Any]): Search parameters
+            hotel_names (List[str]): Hotels to resolve
+        Returns:
+            Tuple (criteria with 'resolved_hotel_ids', mapping info dict)
+        """
+        mapping_start = time.time()
+        mapping_stats = {"queries": 0, "source": "none", "resolved": 0}
+        try:
+            from app.services.hotel_mapping import hotel_mapping_service
+            resolved_hotel_ids = await hotel_mapping_service.resolve_hotels(hotel_names, stats=mapping_stats)
+            criteria = {**criteria, "resolved_hotel_ids": resolved_hotel_ids}
+        except Exception as e:
+            # Providers fall back to per-hotel lookups
+            logger.error(f"[MAPPING] Batch hotel resolution failed: {e}")
+        mapping_stats["time_ms"] = int((time.time() - mapping_start) * 1000)
+        return criteria, mapping_stats
+    
+    def _build_summary(self,
+                       provider_results: Dict[str, Dict[str, Any]],
+                       hotel_names: List[str],
+                       processing_time_ms: int,
+                       search_timeout: float,
+                       mapping_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build aggregated search summary and log provider status.
+        Args:
+            provider_results: Results by provider name
+            hotel_names: Searched hotel names
+            processing_time_ms: Total processing time
+            search_timeout: Timeout used for provider searches
+            mapping_info: Hotel ID resolution stats from _resolve_hotel_ids (None if skipped)
+        Returns:
+            Dict[str, Any]: Summary statistics
+        """
+        if mapping_info is None:
+            # Nothing searched - keep the short summary
+            return {
+                "total_offers": 0,
+                "successful_providers": 0,
+                "processing_time_ms": processing_time_ms,
+                "hotel_count": 0
+            }
+        
+        # Result cache summary (hits/misses across providers in this search)
+        cache_summary = None
+        cache_infos = [result["cache"] for result in provider_results.values() if result.get("cache")]
+        if cache_infos:
+            hit_ages = [info["age_seconds"] for info in cache_infos if info["status"] in ("hit", "stale")]
+            cache_summary = {
+                "hits": len(hit_ages),
+                "stale_hits": sum(1 for info in cache_infos if info["status"] == "stale"),
+                "misses": len(cache_infos) - len(hit_ages),
+                "max_age_seconds": max(hit_ages) if hit_ages else None
+            }
+            logger.info(f"[CACHE] Result cache: {cache_summary['hits']} hits ({cache_summary['stale_hits']} stale), {cache_summary['misses']} misses")
+        coalesced_providers = [name for name, result in provider_results.items() if result.get("coalesced")]
+        total_retries = sum(result.get("retries", 0) for result in provider_results.values())
+        total_hedged_requests = sum(result.get("hedged_requests", 0) for result in provider_results.values())
+        
+        # Providers run concurrently - wall time should track the slowest provider, not the sum
+        provider_times = [result.get("processing_time_ms", 0) for result in provider_results.values()]
+        slowest_provider_ms = max(provider_times) if provider_times else 0
+        provider_time_sum_ms = sum(provider_times)
+        
         # Create comprehensive summary
-        hotel_count = len(hotel_names)
+        total_offers = sum(len(result.get("offers", [])) for result in provider_results.values() if result["status"] == "success")
         successful_providers_count = sum(1 for result in provider_results.values() if result["status"] == "success")
         error_providers_count = sum(1 for result in provider_results.values() if result["status"] == "error")
         timeout_providers_count = sum(1 for result in provider_results.values() if result["status"] == "timeout")
         
-        processing_time_ms = int((time.time() - start_time) * 1000)
-        
-        logger.info(f"Search completed in {processing_time_ms}ms: {len(all_offers)} total offers")
+        logger.info(f"Search completed in {processing_time_ms}ms: {total_offers} total offers (slowest provider {slowest_provider_ms}ms, sum {provider_time_sum_ms}ms)")
         
         # Positive messaging for successful operations
         if error_providers_count == 0 and timeout_providers_count == 0:
@@ -472,17 +858,25 @@ class UniversalProvider:
             logger.warning(f"Provider status: {successful_providers_count} successful, {error_providers_count} errors, {timeout_providers_count} timeouts")
         
         return {
-            "providers": provider_results,
-            "summary": {
-                "total_offers": len(all_offers),
-                "successful_providers": successful_providers_count,
-                "error_providers": error_providers_count,
-                "timeout_providers": timeout_providers_count,
-                "processing_time_ms": processing_time_ms,
-                "hotel_count": hotel_count,
-                "hotels_searched": hotel_names,
-                "search_timeout_used": search_timeout
-            }
+            "total_offers": total_offers,
+            "successful_providers": successful_providers_count,
+            "error_providers": error_providers_count,
+            "timeout_providers": timeout_providers_count,
+            "processing_time_ms": processing_time_ms,
+            "slowest_provider_ms": slowest_provider_ms,
+            "provider_time_sum_ms": provider_time_sum_ms,
+            "hotel_count": len(hotel_names),
+            "hotels_searched": hotel_names,
+            "search_timeout_used": search_timeout,
+            "mapping_time_ms": mapping_info["time_ms"],
+            "mapping_queries": mapping_info["queries"],
+            "mapping_source": mapping_info["source"],
+            "hotels_mapped": mapping_info["resolved"],
+            "cache": cache_summary,
+            "coalesced_providers": coalesced_providers,
+            "retries": total_retries,
+            "hedged_requests": total_hedged_requests,
+            "provider_latency": latency_tracker.get_stats()
         }
     
     def get_available_providers(self) -> List[str]:
@@ -493,6 +887,15 @@ class UniversalProvider:
         """
         return list(self.adapters.keys())
     
+    async def prewarm_connections(self) -> Dict[str, int]:
+        """
+        Open keep-alive connections to all available providers via SessionManager.
+        Should be called on application startup.
+        Returns:
+            Dict[str, int]: Connections opened per provider
+        """
+        return await session_manager.prewarm(self.get_available_providers())
+    
     async def close(self):
         """
         Close all sessions via SessionManager.
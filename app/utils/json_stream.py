@@ -0,0 +1,211 @@
+"""
+JSON helpers for large provider responses.
+
+- json_loads: fastest available decoder (orjson when installed, detected at import)
+- StreamingArrayDecoder: decodes items of one array inside a JSON document
+  incrementally from network chunks, so only the item being decoded is held
+  in memory instead of the whole document
+"""
+
+import codecs
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    JSON_BACKEND = "orjson"
+
+    def json_loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON document (orjson)"""
+        return orjson.loads(data)
+
+except ImportError:
+    orjson = None
+    JSON_BACKEND = "json"
+
+    def json_loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON document (stdlib json)"""
+        return json.loads(data)
+
+
+_WHITESPACE_AND_COMMAS = re.compile(r"[\s,]*")
+
+# One complete token of the document before the streamed array: string, structural character or scalar
+_SEEK_TOKEN = re.compile(r'\s*(?:("(?:[^"\\]|\\.)*")|([{}\[\]:,])|([^\s{}\[\]:,"]+))')
+
+
+class StreamingArrayDecoder:
+    """
+    Incremental decoder for the first `"<key>": [ ... ]` array of a JSON document.
+
+    The key is matched only as an object key (never inside a string value)
+    and, when `path` is given, only inside that chain of parent objects.
+    Feed raw byte chunks as they arrive; every call returns the array items
+    completed so far. Items must be JSON objects or arrays (e.g. hotels).
+    After close() the rest of the document is available as `envelope`, with
+    the array replaced by an empty list.
+
+    Example:
+        decoder = StreamingArrayDecoder("hotels", path=("data",))
+        async for chunk in response.content.iter_chunked(65536):
+            for hotel in decoder.feed(chunk):
+                ...
+        for hotel in decoder.close():
+            ...
+        envelope = decoder.envelope
+    """
+
+    def __init__(self, key: str, path: Optional[Sequence[str]] = None):
+        """
+        Initialize decoder.
+
+        Args:
+            key: Object key of the array to stream
+            path: Keys of the parent objects from the document root
+                  (e.g. ("data",) for {"data": {"hotels": [...]}}); None = any depth
+        """
+        self._key = key
+        self._path = tuple(path) if path is not None else None
+        self._seek_position = 0     # scanned part of the buffer while seeking
+        self._containers = []       # open containers while seeking: [is_object, key, expecting_key]
+        self._pending_key = None
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+
+        self._buffer = ""
+        self._state = "seek"        # seek -> items -> tail
+        self._prefix = ""           # document text before the array
+        self._retry_length = 0      # don't retry a failed item decode before buffer reaches this length
+        self.envelope: Optional[Dict[str, Any]] = None
+
+        # Statistics
+        self.bytes_received = 0
+        self.items_decoded = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Add next chunk of the response body.
+
+        Returns:
+            Array items completed by this chunk
+        """
+        self.bytes_received += len(chunk)
+        self._buffer += self._text_decoder.decode(chunk)
+        return self._process(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Finish decoding after the last chunk and set `envelope`
+        (document without the streamed array, array replaced by []).
+
+        Returns:
+            Remaining array items not returned by feed()
+
+        Raises:
+            ValueError: If the document is incomplete or invalid JSON
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._process(final=True)
+
+        if self._state == "seek":
+            # Array key not present (e.g. error response) - plain document
+            self.envelope = json_loads(self._buffer)
+        elif self._state == "items":
+            raise ValueError(f"Truncated JSON document: array not terminated after {self.items_decoded} items")
+        else:
+            self.envelope = json_loads(self._prefix + "[]" + self._buffer)
+        self._buffer = ""
+        return items
+
+    def _process(self, final: bool) -> List[Any]:
+        """Advance state machine over buffered text"""
+        items = []
+
+        if self._state == "seek":
+            array_start = self._seek_array(final)
+            if array_start is None:
+                return items
+            self._prefix = self._buffer[:array_start]
+            self._buffer = self._buffer[array_start + 1:]
+            self._state = "items"
+
+        if self._state == "items":
+            position = 0
+            buffer = self._buffer
+            while True:
+                position = _WHITESPACE_AND_COMMAS.match(buffer, position).end()
+                if position >= len(buffer):
+                    break
+                if buffer[position] == "]":
+                    self._state = "tail"
+                    position += 1
+                    break
+                # Re-parsing an incomplete item is wasted work - wait until buffer doubles
+                if not final and len(buffer) < self._retry_length:
+                    break
+                try:
+                    item, position_after = self._json_decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    self._retry_length = 2 * (len(buffer) - position)
+                    break
+                items.append(item)
+                position = position_after
+                self._retry_length = 0
+            # Keep only the undecoded rest - memory bounded by one item
+            self._buffer = buffer[position:]
+            self.items_decoded += len(items)
+
+        return items
+
+    def _seek_array(self, final: bool) -> Optional[int]:
+        """
+        Scan buffered text token by token up to the array to stream.
+
+        Returns:
+            Buffer position of the array's opening bracket, or None if not reached yet
+        """
+        buffer = self._buffer
+        containers = self._containers
+        while True:
+            match = _SEEK_TOKEN.match(buffer, self._seek_position)
+            # Incomplete token (string or scalar may continue in the next chunk)
+            if not match or (match.end() == len(buffer) and not final and match.group(1) is None and match.group(2) is None):
+                return None
+            string, structural, _ = match.groups()
+            top = containers[-1] if containers else None
+
+            if string is not None:
+                if top is not None and top[0] and top[2]:
+                    self._pending_key = json.loads(string)
+            elif structural == ":":
+                if top is not None and top[0]:
+                    top[1] = self._pending_key
+                    top[2] = False
+            elif structural == ",":
+                if top is not None and top[0]:
+                    top[2] = True
+            elif structural == "{":
+                containers.append([True, None, True])
+            elif structural == "[":
+                if top is not None and top[0] and top[1] == self._key and self._at_path():
+                    return match.end() - 1
+                containers.append([False, None, False])
+            elif structural == "}" or structural == "]":
+                if containers:
+                    containers.pop()
+            self._seek_position = match.end()
+
+    def _at_path(self) -> bool:
+        """Check that the open objects match the configured parent path"""
+        if self._path is None:
+            return True
+        parents = self._containers[:-1]
+        if len(parents) != len(self._path):
+            return False
+        return all(is_object and key == expected for (is_object, key, _), expected in zip(parents, self._path))
@@ -0,0 +1,144 @@
+"""
+Debug watchdog that detects event loop blocking.
+
+A heartbeat coroutine ticks on the monitored loop; a background thread checks
+the heartbeat and, when the loop has not ticked for longer than the threshold,
+captures the loop thread's current stack to show which function is blocking.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Project root - blocking is attributed to the innermost frame inside the project
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class EventLoopBlockingMonitor:
+    """Detects event loop stalls above a threshold and attributes them to the blocking call"""
+
+    def __init__(self, threshold_ms: float = 100.0, interval_ms: float = 20.0):
+        """
+        Initialize monitor.
+
+        Args:
+            threshold_ms: Report stalls longer than this
+            interval_ms: Heartbeat interval
+        """
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_beat = time.monotonic()
+
+        # Statistics
+        self._blocks = 0
+        self._max_block = 0.0
+        self._by_location: Dict[str, int] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._heartbeat_task is not None and not self._heartbeat_task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop (no-op if already monitoring it)"""
+        loop = asyncio.get_running_loop()
+        if self.is_running and self._loop is loop:
+            return
+        self.stop()
+
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        # New stop event per run, so a previous watchdog thread can't be revived
+        self._stop = threading.Event()
+        self._heartbeat_task = loop.create_task(self._heartbeat(self._stop), name="loop_monitor_heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, args=(self._stop,), name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"[LOOP] Event loop blocking monitor started (threshold {self.threshold * 1000:.0f}ms)")
+
+    def stop(self) -> None:
+        """Stop monitoring"""
+        self._stop.set()
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            self._heartbeat_task.cancel()
+        self._heartbeat_task = None
+
+    async def _heartbeat(self, stop: threading.Event) -> None:
+        """Tick on the monitored loop"""
+        while not stop.is_set():
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self, stop: threading.Event) -> None:
+        """Watchdog thread - report when heartbeat stalls"""
+        reported_beat = None
+        while not stop.wait(self.interval):
+            last_beat = self._last_beat
+            stalled = time.monotonic() - last_beat - self.interval
+            if stalled < self.threshold or reported_beat == last_beat:
+                continue
+
+            reported_beat = last_beat
+            location, stack = self._capture_loop_stack()
+
+            # Wait until loop recovers to report full stall duration
+            while self._last_beat == last_beat and not stop.wait(self.interval):
+                pass
+            blocked = max(stalled, self._last_beat - last_beat - self.interval)
+
+            self._blocks += 1
+            self._max_block = max(self._max_block, blocked)
+            self._by_location[location] = self._by_location.get(location, 0) + 1
+            logger.warning(f"[LOOP] Event loop blocked for {blocked * 1000:.0f}ms in {location}")
+            logger.debug(f"[LOOP] Blocking stack:\n{stack}")
+
+    def _capture_loop_stack(self):
+        """Get (blocking location, formatted stack) of the event loop thread"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "unknown", ""
+
+        summary = traceback.extract_stack(frame)
+        location = "unknown"
+        for frame_summary in reversed(summary):
+            if frame_summary.filename.startswith(_PROJECT_ROOT) and frame_summary.filename != __file__:
+                location = f"{frame_summary.name} ({os.path.relpath(frame_summary.filename, _PROJECT_ROOT)}:{frame_summary.lineno})"
+                break
+        else:
+            if summary:
+                location = f"{summary[-1].name} ({summary[-1].filename}:{summary[-1].lineno})"
+        return location, "".join(traceback.format_list(summary))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get blocking statistics"""
+        return {
+            "running": self.is_running,
+            "threshold_ms": self.threshold * 1000,
+            "blocks": self._blocks,
+            "max_block_ms": round(self._max_block * 1000, 1),
+            "by_location": dict(sorted(self._by_location.items(), key=lambda item: -item[1]))
+        }
+
+
+# Global instance
+loop_monitor = EventLoopBlockingMonitor()
+
+
+def start_loop_monitor_if_enabled() -> None:
+    """Start blocking monitor on the running loop when DEBUG_LOOP_BLOCKING=true"""
+    from app.config import Config
+    if Config.DEBUG_LOOP_BLOCKING:
+        loop_monitor.threshold = Config.LOOP_BLOCKING_THRESHOLD_MS / 1000
+        loop_monitor.start()
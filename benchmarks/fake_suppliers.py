@@ -0,0 +1,279 @@
+"""
+Local stand-ins for supplier APIs used by the search benchmarks.
+
+Serves the three endpoints the provider adapters call:
+- POST /rate_hawk/search         Rate Hawk ETG v3 SERP JSON API
+- POST /goglobal/xmlwebservice   GoGlobal SOAP 1.2 endpoint (JSON inside MakeRequestResult)
+- POST /tbo/search               TBO JSON search API
+
+Latency (mean + jitter), payload size (rates per hotel) and error rate are configurable.
+Payload builders are also used directly to benchmark normalize() without HTTP.
+
+Run standalone:
+    python -m benchmarks.fake_suppliers --port 8765 --latency-ms 150 --rates-per-hotel 40
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+from aiohttp import web
+
+ROOM_NAMES = [
+    "Standard Double Room",
+    "Deluxe King Room with Sea View",
+    "Superior Twin Room",
+    "Junior Suite Ocean View",
+    "Family Room with Balcony",
+    "Executive Club Room",
+    "One Bedroom Pool Villa",
+    "Classic Double or Twin Room",
+]
+
+# Native meal values per supplier (same values as in the in-memory meal_mappings table)
+MEALS = {
+    "rate_hawk": ["nomeal", "breakfast", "half-board", "all-inclusive"],
+    "goglobal": ["RO", "BB", "HB", "AI"],
+    "tbo": ["Room_Only", "BreakFast", "Half_Board", "All_Inclusive"],
+}
+
+ROUTES = {
+    "rate_hawk": "/rate_hawk/search",
+    "goglobal": "/goglobal/xmlwebservice",
+    "tbo": "/tbo/search",
+}
+
+
+@dataclass
+class FakeSupplierSettings:
+    """Behaviour of the fake suppliers"""
+    latency_ms: float = 150.0
+    jitter_ms: float = 50.0
+    rates_per_hotel: int = 40
+    error_rate: float = 0.0
+    seed: int = 42
+
+
+# ============ Payload builders ============
+
+def _rng(provider: str, hotel_id: str) -> random.Random:
+    """Deterministic random generator per supplier hotel"""
+    return random.Random(f"{provider}:{hotel_id}")
+
+
+def build_rate_hawk_hotels(hotel_ids: List[str], rates_per_hotel: int) -> List[Dict[str, Any]]:
+    """Build `data.hotels` list of a Rate Hawk SERP response"""
+    free_cancellation = (datetime.utcnow() + timedelta(days=20)).strftime("%Y-%m-%dT%H:%M:%S")
+    hotels = []
+    for hotel_id in hotel_ids:
+        rng = _rng("rate_hawk", hotel_id)
+        rates = []
+        for index in range(rates_per_hotel):
+            amount = round(rng.uniform(60, 900), 2)
+            rates.append({
+                "match_hash": f"m-{hotel_id}-{index}",
+                "room_name": rng.choice(ROOM_NAMES),
+                "meal": rng.choice(MEALS["rate_hawk"]),
+                "daily_prices": [str(round(amount / 3, 2))] * 3,
+                "payment_options": {
+                    "payment_types": [{
+                        "amount": str(amount),
+                        "currency_code": "EUR",
+                        "type": "deposit",
+                        "cancellation_penalties": {
+                            "free_cancellation_before": free_cancellation if rng.random() < 0.6 else None
+                        }
+                    }]
+                },
+                "serp_filters": rng.sample(["has_bathroom", "has_internet", "has_wifi", "air_conditioning"], 2),
+                "rg_ext": {"bathroom": 2, "view": rng.randint(0, 3), "balcony": rng.randint(0, 1), "club": 0, "family": 0},
+                "amenities_data": rng.sample(["non-smoking", "king-bed", "sea-view", "minibar", "safe"], 2),
+                "legal_info": None,
+            })
+        hotels.append({"id": hotel_id, "hid": hotel_id, "rates": rates})
+    return hotels
+
+
+def build_goglobal_result(hotel_ids: List[str], rates_per_hotel: int) -> Dict[str, Any]:
+    """Build JSON document GoGlobal returns in MakeRequestResult"""
+    deadline = (datetime.utcnow() + timedelta(days=20)).strftime("%Y-%m-%d")
+    hotels = []
+    for hotel_id in hotel_ids:
+        rng = _rng("goglobal", hotel_id)
+        offers = []
+        for index in range(rates_per_hotel):
+            offers.append({
+                "HotelSearchCode": f"{hotel_id}/{index}/0",
+                "Rooms": [rng.choice(ROOM_NAMES)],
+                "RoomBasis": rng.choice(MEALS["goglobal"]),
+                "TotalPrice": round(rng.uniform(60, 900), 2),
+                "Currency": "EUR",
+                "Special": "Early booking" if rng.random() < 0.2 else "",
+                "CancellationDeadline": deadline,
+                "Availability": 1,
+            })
+        hotels.append({"HotelCode": hotel_id, "HotelName": f"Hotel {hotel_id}", "Offers": offers})
+    return {"Header": {"Stats": {"HotelQty": len(hotels)}}, "Hotels": hotels}
+
+
+def build_tbo_response(hotel_codes: List[str], rates_per_hotel: int) -> Dict[str, Any]:
+    """Build TBO search response"""
+    free_from = (datetime.utcnow() + timedelta(days=20)).strftime("%d-%m-%Y 00:00:00")
+    hotels = []
+    for hotel_code in hotel_codes:
+        rng = _rng("tbo", hotel_code)
+        rooms = []
+        for index in range(rates_per_hotel):
+            rooms.append({
+                "Name": [rng.choice(ROOM_NAMES)],
+                "BookingCode": f"{hotel_code}!TB!{index}",
+                "MealType": rng.choice(MEALS["tbo"]),
+                "TotalFare": round(rng.uniform(60, 900), 2),
+                "TotalTax": 0.0,
+                "IsRefundable": True,
+                "CancelPolicies": [
+                    {"FromDate": free_from, "ChargeType": "Fixed", "CancellationCharge": 0.0},
+                    {"FromDate": "01-01-2099 00:00:00", "ChargeType": "Percentage", "CancellationCharge": 100.0},
+                ],
+            })
+        hotels.append({"HotelCode": hotel_code, "Currency": "USD", "Rooms": rooms})
+    return {"Status": {"Code": 200, "Description": "Successful"}, "HotelResult": hotels}
+
+
+def wrap_soap_response(result_json: str) -> str:
+    """Wrap GoGlobal JSON result in SOAP 1.2 MakeRequestResponse envelope"""
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope">'
+        '<soap:Body><MakeRequestResponse xmlns="http://www.goglobal.travel/">'
+        f'<MakeRequestResult>{escape(result_json)}</MakeRequestResult>'
+        '</MakeRequestResponse></soap:Body></soap:Envelope>'
+    )
+
+
+@lru_cache(maxsize=256)
+def _response_body(provider: str, hotel_ids: Tuple[str, ...], rates_per_hotel: int) -> bytes:
+    """Serialized response body (cached so the fake server stays cheap)"""
+    ids = list(hotel_ids)
+    if provider == "rate_hawk":
+        body = json.dumps({"status": "ok", "error": None, "data": {"hotels": build_rate_hawk_hotels(ids, rates_per_hotel)}})
+    elif provider == "goglobal":
+        body = wrap_soap_response(json.dumps(build_goglobal_result(ids, rates_per_hotel)))
+    else:
+        body = json.dumps(build_tbo_response(ids, rates_per_hotel))
+    return body.encode("utf-8")
+
+
+# ============ aiohttp application ============
+
+_GOGLOBAL_HOTEL_ID = re.compile(r"<HotelId>([^<]+)</HotelId>")
+
+
+class FakeSupplierServer:
+    """aiohttp application serving all fake supplier endpoints"""
+
+    def __init__(self, settings: FakeSupplierSettings):
+        self.settings = settings
+        self._random = random.Random(settings.seed)
+        self.requests = {provider: 0 for provider in ROUTES}
+        self.errors = {provider: 0 for provider in ROUTES}
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(ROUTES["rate_hawk"], self.rate_hawk)
+        app.router.add_post(ROUTES["goglobal"], self.goglobal)
+        app.router.add_post(ROUTES["tbo"], self.tbo)
+        app.router.add_get("/stats", self.stats)
+        return app
+
+    async def _simulate(self, provider: str) -> bool:
+        """Wait simulated latency; returns False when this request should fail"""
+        self.requests[provider] += 1
+        delay = max(0.0, self._random.gauss(self.settings.latency_ms, self.settings.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        if self._random.random() < self.settings.error_rate:
+            self.errors[provider] += 1
+            return False
+        return True
+
+    async def rate_hawk(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        if not await self._simulate("rate_hawk"):
+            return web.json_response({"status": "error", "error": "core_search_error"}, status=500)
+        body = _response_body("rate_hawk", tuple(str(i) for i in payload.get("ids", [])), self.settings.rates_per_hotel)
+        return web.Response(body=body, content_type="application/json")
+
+    async def goglobal(self, request: web.Request) -> web.Response:
+        envelope = await request.text()
+        if not await self._simulate("goglobal"):
+            return web.Response(text="Server error", status=500)
+        hotel_ids = tuple(_GOGLOBAL_HOTEL_ID.findall(envelope))
+        body = _response_body("goglobal", hotel_ids, self.settings.rates_per_hotel)
+        return web.Response(body=body, content_type="application/soap+xml", charset="utf-8")
+
+    async def tbo(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        if not await self._simulate("tbo"):
+            return web.json_response({"Status": {"Code": 500, "Description": "Internal error"}}, status=500)
+        hotel_codes = tuple(code for code in str(payload.get("HotelCodes", "")).split(",") if code)
+        body = _response_body("tbo", hotel_codes, self.settings.rates_per_hotel)
+        return web.Response(body=body, content_type="application/json")
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"settings": asdict(self.settings), "requests": self.requests, "errors": self.errors})
+
+
+def base_urls(host: str, port: int) -> Dict[str, str]:
+    """Provider base_url values pointing at the fake suppliers"""
+    return {provider: f"http://{host}:{port}{route}" for provider, route in ROUTES.items()}
+
+
+def serve(settings: FakeSupplierSettings, host: str = "127.0.0.1", port: int = 8765, ready=None) -> None:
+    """Run fake suppliers until interrupted (ready: optional multiprocessing.Event set once listening)"""
+
+    async def _main():
+        runner = web.AppRunner(FakeSupplierServer(settings).build_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        if ready is not None:
+            ready.set()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Rate Hawk / GoGlobal / TBO suppliers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--rates-per-hotel", type=int, default=40)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    settings = FakeSupplierSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rates_per_hotel=args.rates_per_hotel,
+        error_rate=args.error_rate
+    )
+    print(f"Fake suppliers on http://{args.host}:{args.port}: {json.dumps(base_urls(args.host, args.port))}")
+    serve(settings, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
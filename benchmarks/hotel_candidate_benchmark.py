@@ -0,0 +1,187 @@
+"""
+Hotel candidate generation benchmark.
+
+Runs ProductionHotelMatcher.run_single_api_matching for a sample of the bundled
+reference hotels (app/data/hotel_mapper/00_api_ref_hotels.csv) with:
+
+- exhaustive: every API hotel of the reference country (Strategy 1) and of the
+              whole catalog (name-only fallback) goes through the matching rules
+- index:      HotelCandidateIndex - character trigram inverted index blocked by
+              country_iso, top-K candidates per reference hotel plus hotels
+              passing the brand rules
+
+API hotel dumps are not bundled, so by default the catalog is synthetic (Rate
+Hawk format): name variants of the sampled reference hotels (typos, extra
+words, word order, chain field) plus distractors built from other reference
+hotels. Real dumps can be passed with --api name=path.
+
+Recall: share of exhaustive matches (reference_id -> api_id) that the index
+run reproduces; confidence differences are reported as well.
+
+Usage (from repository root):
+    python -m benchmarks.hotel_candidate_benchmark --references 200 --distractors 3000
+    python -m benchmarks.hotel_candidate_benchmark --api rate_hawk=app/data/hotel_mapper/01_api_rate_hawk_hotels.csv
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from app.data.hotel_mapper.hotel_mapper import ProductionHotelMatcher
+
+REFERENCE_CSV = "app/data/hotel_mapper/00_api_ref_hotels.csv"
+
+EXTRA_WORDS = ["hotel", "resort", "spa", "beach", "suites", "& spa", "resort & spa", "boutique", "apartments"]
+
+
+def perturb_name(name: str, rng: random.Random) -> str:
+    """Supplier-style variant of a hotel name"""
+    words = name.split()
+    kind = rng.choice(["typo", "extra", "drop", "reorder", "case"])
+    if kind == "typo" and len(name) > 4:
+        pos = rng.randrange(1, len(name) - 1)
+        return name[:pos] + name[pos + 1] + name[pos] + name[pos + 2:]
+    if kind == "extra":
+        return f"{name} {rng.choice(EXTRA_WORDS)}" if rng.random() < 0.5 else f"{rng.choice(EXTRA_WORDS)} {name}"
+    if kind == "drop" and len(words) > 2:
+        del words[rng.randrange(len(words))]
+        return " ".join(words)
+    if kind == "reorder" and len(words) > 1:
+        rng.shuffle(words)
+        return " ".join(words)
+    return name.upper()
+
+
+def build_catalog(references: pd.DataFrame, pool: pd.DataFrame, variants: int, distractors: int,
+                  seed: int) -> pd.DataFrame:
+    """Synthetic Rate Hawk format catalog for the sampled reference hotels"""
+    rng = random.Random(seed)
+    countries = references["country_iso"].unique().tolist()
+    rows = []
+    for _, ref in references.iterrows():
+        for _ in range(rng.randint(0, variants)):
+            rows.append({
+                "name": perturb_name(ref["clean_hotel"], rng),
+                "city": ref["city_raw"] if rng.random() < 0.7 else "",
+                "country": ref["country_iso"],
+                "hotel_chain": (ref["brand"] or "").title() if rng.random() < 0.3 else "",
+            })
+    for _ in range(distractors):
+        other = pool.iloc[rng.randrange(len(pool))]
+        rows.append({
+            "name": perturb_name(other["clean_hotel"], rng) if rng.random() < 0.5 else other["clean_hotel"],
+            "city": other["city_raw"],
+            "country": rng.choice(countries),
+            "hotel_chain": "",
+        })
+    rng.shuffle(rows)
+    catalog = pd.DataFrame(rows)
+    catalog.insert(0, "id", [f"rh_{i}" for i in range(len(catalog))])
+    catalog["address"] = ""
+    catalog["latitude"] = None
+    catalog["longitude"] = None
+    return catalog
+
+
+def run_matching(matcher: ProductionHotelMatcher, api_name: str, use_candidate_index: bool) -> Dict:
+    """Matches, seconds and rule comparisons of one run_single_api_matching"""
+    matcher.use_candidate_index = use_candidate_index
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        matches = matcher.run_single_api_matching(api_name)
+    elapsed = time.perf_counter() - start
+    comparisons = int(re.search(r"Total comparisons: ([\d,]+)", output.getvalue()).group(1).replace(",", ""))
+    return {
+        "matches": {m["reference_id"]: (m["api_id"], m["confidence"]) for m in matches},
+        "seconds": elapsed,
+        "comparisons": comparisons,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel candidate generation benchmark")
+    parser.add_argument("--api", action="append", default=[], help="API dump as name=path (default: synthetic catalog)")
+    parser.add_argument("--references", type=int, default=200, help="Reference hotels sampled (0 = all)")
+    parser.add_argument("--variants", type=int, default=3, help="Max synthetic variants per reference hotel")
+    parser.add_argument("--distractors", type=int, default=3000, help="Synthetic hotels built from other reference hotels")
+    parser.add_argument("--top-k", type=int, default=50, help="Candidates per reference hotel (country block)")
+    parser.add_argument("--fallback-top-k", type=int, default=500, help="Candidates for the name-only fallback")
+    parser.add_argument("--block-by-city", action="store_true", help="Block by (country, city) instead of country")
+    parser.add_argument("--seed", type=int, default=7, help="Sampling and catalog seed")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: print only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    matcher = ProductionHotelMatcher(candidate_top_k=args.top_k, fallback_top_k=args.fallback_top_k,
+                                     block_by_city=args.block_by_city)
+    with contextlib.redirect_stdout(io.StringIO()):
+        pool = matcher.load_reference_hotels(REFERENCE_CSV)
+    pool = pool[pool["country_iso"] != ""]
+    if args.references:
+        matcher.reference_hotels = pool.sample(n=min(args.references, len(pool)), random_state=args.seed)
+    else:
+        matcher.reference_hotels = pool
+
+    api_csvs = dict(item.split("=", 1) for item in args.api)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if not api_csvs:
+            catalog_path = Path(tmp_dir) / "synthetic_rate_hawk_hotels.csv"
+            build_catalog(matcher.reference_hotels, pool, args.variants, args.distractors, args.seed).to_csv(
+                catalog_path, index=False)
+            api_csvs = {"synthetic": str(catalog_path)}
+        with contextlib.redirect_stdout(io.StringIO()):
+            for api_name, csv_path in api_csvs.items():
+                matcher.load_api_hotels(csv_path, api_name)
+
+    results: Dict[str, dict] = {}
+    for api_name in api_csvs:
+        exhaustive = run_matching(matcher, api_name, use_candidate_index=False)
+        indexed = run_matching(matcher, api_name, use_candidate_index=True)
+        expected = exhaustive["matches"]
+        found = sum(1 for ref_id, (api_id, _) in expected.items()
+                    if indexed["matches"].get(ref_id, (None,))[0] == api_id)
+        confidence_diffs: List[str] = [ref_id for ref_id, match in expected.items() if indexed["matches"].get(ref_id) != match]
+        results[api_name] = {
+            "api_hotels": len(matcher.api_hotels_dict[api_name]),
+            "reference_hotels": len(matcher.reference_hotels),
+            "exhaustive_matches": len(expected),
+            "index_matches": len(indexed["matches"]),
+            "recall": round(found / len(expected), 4) if expected else 1.0,
+            "differing_matches": len(confidence_diffs),
+            "extra_matches": len(set(indexed["matches"]) - set(expected)),
+            "exhaustive_comparisons": exhaustive["comparisons"],
+            "index_comparisons": indexed["comparisons"],
+            "exhaustive_s": round(exhaustive["seconds"], 3),
+            "index_s": round(indexed["seconds"], 3),
+            "speedup": round(exhaustive["seconds"] / indexed["seconds"], 2),
+        }
+
+    print(f"{'api':<12} {'hotels':>7} {'refs':>5} {'matches':>8} {'recall':>7} {'differ':>7} "
+          f"{'exh. comparisons':>17} {'index comparisons':>18} {'exh. s':>8} {'index s':>8} {'speedup':>8}")
+    for api_name, stats in results.items():
+        print(f"{api_name:<12} {stats['api_hotels']:>7} {stats['reference_hotels']:>5} {stats['exhaustive_matches']:>8} "
+              f"{stats['recall']:>7.4f} {stats['differing_matches']:>7} {stats['exhaustive_comparisons']:>17,} "
+              f"{stats['index_comparisons']:>18,} {stats['exhaustive_s']:>8} {stats['index_s']:>8} "
+              f"{stats['speedup']:>7.2f}x")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+        print(f"\nResults written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
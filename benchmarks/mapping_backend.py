@@ -0,0 +1,107 @@
+"""
+In-memory mapping backend for benchmarks.
+
+Replaces Azure SQL with a shared in-memory SQLite database holding the
+`dbo.hotel_mappings` and `dbo.meal_mappings` tables, exposed through the real
+AzureSQLConnector (connect_factory), so HotelMapping / MealMapping run their
+normal load and lookup code without network round-trips.
+
+Must be installed before any app.services module is imported - the mapping
+services are created on import.
+"""
+
+import sqlite3
+from typing import Dict, List
+
+from benchmarks.fake_suppliers import MEALS
+
+_MAIN_URI = "file:carter_bench_main?mode=memory&cache=shared"
+_DBO_URI = "file:carter_bench_dbo?mode=memory&cache=shared"
+
+# Standard meal codes -> native supplier values (columns match meal_filtering.sql_column)
+MEAL_CODES = ["RO", "BB", "HB", "AI"]
+
+# Keeps the shared in-memory database alive for the process lifetime
+_keeper: sqlite3.Connection = None
+
+
+def _connect() -> sqlite3.Connection:
+    """New connection with the in-memory database attached as schema `dbo`"""
+    conn = sqlite3.connect(_MAIN_URI, uri=True, check_same_thread=False)
+    conn.execute(f"ATTACH DATABASE '{_DBO_URI}' AS dbo")
+    return conn
+
+
+def benchmark_hotel_names(hotel_count: int) -> List[str]:
+    """Reference hotel names present in the in-memory mapping table"""
+    return [f"Benchmark Hotel {index:05d}" for index in range(hotel_count)]
+
+
+def provider_hotel_ids(index: int) -> Dict[str, str]:
+    """Supplier hotel IDs of benchmark hotel `index`"""
+    return {
+        "rate_hawk": f"rh_hotel_{index}",
+        "goglobal": str(100000 + index),
+        "tbo": str(1000000 + index),
+    }
+
+
+def _create_tables(conn: sqlite3.Connection, hotel_count: int) -> None:
+    conn.execute("DROP TABLE IF EXISTS dbo.hotel_mappings")
+    conn.execute("DROP TABLE IF EXISTS dbo.meal_mappings")
+    conn.execute(
+        "CREATE TABLE dbo.hotel_mappings ("
+        "ref_hotel_name TEXT, rate_hawk_hotel_id TEXT, goglobal_hotel_id TEXT, tbo_hotel_id TEXT)"
+    )
+    conn.execute("CREATE INDEX dbo.ix_hotel_mappings_ref ON hotel_mappings (ref_hotel_name)")
+    conn.executemany(
+        "INSERT INTO dbo.hotel_mappings VALUES (?, ?, ?, ?)",
+        [
+            (name, ids["rate_hawk"], ids["goglobal"], ids["tbo"])
+            for index, name in enumerate(benchmark_hotel_names(hotel_count))
+            for ids in [provider_hotel_ids(index)]
+        ]
+    )
+
+    conn.execute("CREATE TABLE dbo.meal_mappings (Kod TEXT, RateHawk TEXT, GoGlobal TEXT, TBO TEXT)")
+    conn.executemany(
+        "INSERT INTO dbo.meal_mappings VALUES (?, ?, ?, ?)",
+        [
+            (code, MEALS["rate_hawk"][i], MEALS["goglobal"][i], MEALS["tbo"][i])
+            for i, code in enumerate(MEAL_CODES)
+        ]
+    )
+    conn.commit()
+
+
+def install_in_memory_mapping_backend(hotel_count: int = 1000) -> List[str]:
+    """
+    Create in-memory mapping tables and make them the process-wide SQL backend.
+
+    Args:
+        hotel_count: Number of hotels in hotel_mappings
+
+    Returns:
+        Reference hotel names available for searches
+    """
+    global _keeper
+    from app.config import Config
+    from app.services import azure_sql_connector
+
+    if _keeper is None:
+        _keeper = _connect()
+    _create_tables(_keeper, hotel_count)
+
+    # Mapping services check that SQL is configured before using the shared connector
+    Config.AZURE_SQL_SERVER = "in-memory"
+    Config.AZURE_SQL_DATABASE = "benchmarks"
+    Config.AZURE_SQL_USERNAME = "benchmark"
+    Config.AZURE_SQL_PASSWORD = "benchmark"
+
+    azure_sql_connector._shared_connector = azure_sql_connector.AzureSQLConnector(
+        server=Config.AZURE_SQL_SERVER,
+        database=Config.AZURE_SQL_DATABASE,
+        pool_size=Config.SQL_POOL_SIZE,
+        connect_factory=_connect
+    )
+    return benchmark_hotel_names(hotel_count)
@@ -0,0 +1,145 @@
+"""
+Offer memory benchmark.
+
+Normalizes fake supplier payloads with the real adapters and measures, per
+10k offers and provider (tracemalloc):
+
+- normalized:  memory held by normalize() output - CompactOffer objects vs the
+               same offers as plain dicts (the previous representation)
+- pipeline:    peak memory from normalize() to response dicts - the current
+               path (meal codes, validation and room categorization in place,
+               one materialization) vs the previous path, which copied every
+               offer in meal normalization, validation and field filtering
+
+Usage (from repository root):
+    python -m benchmarks.offer_memory_benchmark --offers 10000
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fake_suppliers import base_urls
+from benchmarks.search_benchmark import build_raw_response, configure_app
+
+HOTELS = 20
+
+
+def measure(build: Callable[[], Any]) -> Dict[str, float]:
+    """Retained and peak bytes allocated by build() (result kept alive while measuring)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"retained_bytes": after - before, "peak_bytes": peak - before}
+
+
+def legacy_pipeline(provider_name: str, offers: List[Dict[str, Any]], meal_service, response_fields) -> List[List[Dict[str, Any]]]:
+    """Dict pipeline before CompactOffer: a full copy of every offer per stage"""
+    from app.main import _categorize_rooms
+
+    meal_normalized = []
+    for offer in offers:
+        normalized_offer = offer.copy()
+        standard_code = meal_service.get_standard_code(offer.get("meal_plan"), provider_name) if offer.get("meal_plan") else None
+        if standard_code:
+            normalized_offer["meal_plan"] = standard_code
+        meal_normalized.append(normalized_offer)
+
+    validated = []
+    for offer in meal_normalized:
+        ordered_offer = {"provider": provider_name}
+        ordered_offer.update(offer)
+        validated.append(ordered_offer)
+
+    allowed_fields = set(response_fields)
+    filtered = [{k: v for k, v in offer.items() if k in allowed_fields} for offer in validated]
+    _categorize_rooms(filtered)
+    return [meal_normalized, validated, filtered]
+
+
+def current_pipeline(provider_name: str, offers, meal_service, response_fields) -> List[Dict[str, Any]]:
+    """Current path: in-place stages, materialized once"""
+    from app.main import _categorize_rooms, _validate_provider_offers
+    from app.models.compact_offer import materialize_offers
+
+    offers = meal_service.apply(provider_name, offers)
+    validated = _validate_provider_offers(provider_name, {"offers": offers})
+    _categorize_rooms(validated)
+    return materialize_offers(validated, response_fields)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offer representation memory benchmark")
+    parser.add_argument("--offers", type=int, default=10000, help="Offers per provider")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: print only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ["SEARCH_CACHE_ENABLED"] = "false"
+    configure_app(base_urls("127.0.0.1", 9), coalesce=False)
+
+    from benchmarks.mapping_backend import install_in_memory_mapping_backend
+    install_in_memory_mapping_backend(HOTELS)
+    logging.disable(logging.WARNING)
+
+    from app.main import _response_fields
+    from app.services.meal_mapping import meal_mapping_service
+    from app.services.universal_provider import universal_provider
+
+    results = {}
+    for provider_name, adapter in universal_provider.adapters.items():
+        hotel_ids = [str(900000 + index) for index in range(HOTELS)]
+        raw = build_raw_response(provider_name, hotel_ids, max(1, args.offers // HOTELS))
+        criteria = {"hotel_name_to_id_map": raw["data"]["hotel_name_to_id_map"]} if provider_name == "goglobal" else {}
+        offers = adapter.normalize(raw, criteria)
+        compact_offers = adapter.normalize(raw, criteria)
+        count = len(offers)
+        if not count:
+            continue
+
+        compact = measure(lambda: adapter.normalize(raw, criteria))
+        as_dicts = measure(lambda: [offer.to_dict() for offer in adapter.normalize(raw, criteria)])
+        dict_offers = [offer.to_dict() for offer in offers]
+
+        # Pipeline stages on fresh offers; normalize() output itself is added from above
+        current = measure(lambda: current_pipeline(provider_name, compact_offers, meal_mapping_service, _response_fields()))
+        legacy = measure(lambda: legacy_pipeline(provider_name, dict_offers, meal_mapping_service, _response_fields()))
+        current_peak = compact["retained_bytes"] + current["peak_bytes"]
+        legacy_peak = as_dicts["retained_bytes"] + legacy["peak_bytes"]
+
+        per_10k = lambda value: round(value * 10000 / count / 1024)
+        results[provider_name] = {
+            "offers": count,
+            "normalized_kb_per_10k": {"dict": per_10k(as_dicts["retained_bytes"]), "compact": per_10k(compact["retained_bytes"])},
+            "pipeline_peak_kb_per_10k": {"legacy": per_10k(legacy_peak), "current": per_10k(current_peak)},
+        }
+
+    print(f"{'provider':<10} {'offers':>7} {'dict KB':>9} {'compact KB':>11} {'legacy peak KB':>15} {'current peak KB':>16}  (per 10k offers)")
+    for provider_name, stats in results.items():
+        normalized, pipeline = stats["normalized_kb_per_10k"], stats["pipeline_peak_kb_per_10k"]
+        print(f"{provider_name:<10} {stats['offers']:>7} {normalized['dict']:>9} {normalized['compact']:>11} "
+              f"{pipeline['legacy']:>15} {pipeline['current']:>16}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+        print(f"\nResults written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Room categorization benchmark.
+
+Compares room names categorized per second (RoomDataParser.parse_room_class,
+called for every offer by RoomCategorizerService) by:
+
+- legacy:     the previous implementation - config reads, keyword sort and
+              uncompiled priority patterns on every call
+- compiled:   precompiled rules, memoization disabled (every name is a miss)
+- memoized:   precompiled rules with the room name LRU, over a stream where
+              popular room names repeat as they do across searches
+
+Room names come from the standardized supplier room CSVs in
+app/data/room_mapper/. Every compiled result is checked against legacy first.
+
+Usage (from repository root):
+    python -m benchmarks.room_class_benchmark --names 200000
+"""
+
+import argparse
+import csv
+import json
+import random
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from app.data.room_mapper.universal_room_parser import RoomDataParser
+
+ROOM_CSV_GLOB = "app/data/room_mapper/*_STANDARDIZED.csv"
+
+
+def legacy_parse_room_class(parser_config: dict, room_name: str) -> Optional[str]:
+    """parse_room_class as implemented before rule compilation (kept here as the reference)"""
+    if pd.isna(room_name) or room_name == '':
+        return None
+
+    room_name_lower = str(room_name).lower()
+
+    class_config = parser_config.get('parsing_patterns', {}).get('room_class', {})
+    priority_patterns = class_config.get('priority_patterns', [])
+    keywords = class_config.get('keywords', {})
+    default_value = class_config.get('default', None)
+    case_insensitive = class_config.get('case_insensitive', True)
+
+    for pattern_config in priority_patterns:
+        flags = re.IGNORECASE if case_insensitive else 0
+        if re.search(pattern_config['pattern'], room_name_lower, flags=flags):
+            return pattern_config['value']
+
+    sorted_keywords = sorted(keywords.keys(), key=len, reverse=True)
+    for keyword in sorted_keywords:
+        if case_insensitive:
+            if keyword.lower() in room_name_lower:
+                return keywords[keyword]
+        else:
+            if keyword in room_name:
+                return keywords[keyword]
+
+    return default_value
+
+
+def load_room_names() -> List[str]:
+    """Distinct room names from the standardized supplier CSVs"""
+    names = set()
+    for csv_path in sorted(Path(".").glob(ROOM_CSV_GLOB)):
+        with open(csv_path, encoding="utf-8") as f:
+            names.update(row["room_name"] for row in csv.DictReader(f) if row.get("room_name"))
+    return sorted(names)
+
+
+def build_name_stream(names: List[str], count: int, seed: int) -> List[str]:
+    """Room names as seen across searches - a few popular names repeat often (Zipf-like)"""
+    rng = random.Random(seed)
+    popular = names[:]
+    rng.shuffle(popular)
+    stream = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            stream.append(popular[min(int(rng.paretovariate(1.2)) - 1, len(popular) - 1)])
+        else:
+            stream.append(rng.choice(popular))
+    return stream
+
+
+def measure(categorize: Callable[[str], Optional[str]], names: List[str], repeat: int) -> Dict[str, float]:
+    """Best-of-repeat categorization throughput"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name in names:
+            categorize(name)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "names_per_s": round(len(names) / best, 1),
+        "us_per_name": round(best / len(names) * 1e6, 3),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Room categorization benchmark")
+    parser.add_argument("--names", type=int, default=200000, help="Room names categorized per pass")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per variant (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Results JSON path (default: print only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = load_room_names()
+    if not names:
+        raise SystemExit(f"No room names found in {ROOM_CSV_GLOB}")
+    stream = build_name_stream(names, args.names, args.seed)
+
+    compiled = RoomDataParser(room_class_cache_size=0)
+    for name in names:
+        if compiled.parse_room_class(name) != legacy_parse_room_class(compiled.config, name):
+            raise SystemExit(f"Compiled room_class differs from legacy for {name!r}")
+
+    memoized = RoomDataParser()
+    results = {
+        "legacy": measure(lambda name: legacy_parse_room_class(compiled.config, name), stream, args.repeat),
+        "compiled": measure(compiled.parse_room_class, stream, args.repeat),
+        "memoized": measure(memoized.parse_room_class, stream, args.repeat),
+    }
+    results["memoized"]["cache"] = memoized.get_room_class_cache_stats()
+
+    legacy_nps = results["legacy"]["names_per_s"]
+    print(f"{len(names)} distinct room names, {len(stream)} per pass")
+    print(f"{'variant':<10} {'names/s':>12} {'us/name':>9} {'speedup':>8}")
+    for name, stats in results.items():
+        print(f"{name:<10} {stats['names_per_s']:>12} {stats['us_per_name']:>9} "
+              f"{stats['names_per_s'] / legacy_nps:>7.2f}x")
+    print(f"memoized hit rate: {results['memoized']['cache']['hit_rate']}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+        print(f"\nResults written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
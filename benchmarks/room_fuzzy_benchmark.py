@@ -0,0 +1,181 @@
+"""
+Room main name fuzzy scoring benchmark.
+
+Standardizes the bundled supplier room CSVs (app/data/room_mapper/*_STANDARDIZED.csv)
+with RoomDataParser.process_api, loads them into RoomMapper and, for the hotels
+with the most rooms, compares:
+
+- scalar:   RoomScorer.score_main_name_fuzzy called pair by pair
+- batch:    RoomMapper._score_main_names - one rapidfuzz.process.cdist matrix
+            per provider pair, bonuses applied as array operations (provider
+            pairs too small or sparse for a matrix scored pair by pair)
+
+on the candidate pairs of the blocking index, and times map_rooms_for_hotel in
+both modes.
+
+Score identity: batch scores must be bit-identical (==) to scalar scores for
+every cross-provider pair of the benchmarked hotels, and map_rooms_for_hotel
+must return the same groups and failures in both modes.
+
+Usage (from repository root):
+    python -m benchmarks.room_fuzzy_benchmark --hotels 10 --repeat 5
+"""
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import yaml
+
+from app.data.room_mapper.room_mapper_prod import RoomData, RoomMapper
+from app.data.room_mapper.universal_room_parser import RoomDataParser
+
+CONFIG_PATH = "app/config/room_mappings_config.yaml"
+ROOM_CSV_DIR = Path("app/data/room_mapper")
+
+# Input CSV -> provider
+ROOM_CSVS = {
+    "01_api_rate_hawk_rooms_STANDARDIZED.csv": "ratehawk",
+    "02_api_goglobal_rooms_STANDARDIZED.csv": "goglobal",
+    "03_api_tbo_rooms_STANDARDIZED.csv": "tbo",
+}
+
+
+def build_mapper_config(tmp_dir: Path) -> Path:
+    """Mapper configuration whose input_files are the bundled CSVs standardized into tmp_dir"""
+    with open(CONFIG_PATH, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    input_files = {}
+    for file_name, provider in ROOM_CSVS.items():
+        input_path = ROOM_CSV_DIR / file_name
+        if not input_path.exists():
+            print(f"Skipping missing {input_path}")
+            continue
+        output_path = tmp_dir / f"{provider}.csv"
+        if not RoomDataParser().process_api(str(input_path), str(output_path), provider):
+            raise SystemExit(f"process_api failed for {input_path}")
+        input_files[provider] = str(output_path)
+    if not input_files:
+        raise SystemExit(f"No room CSVs found in {ROOM_CSV_DIR}")
+    config["room_mapping_config"]["input_files"] = input_files
+    config_path = tmp_dir / "room_mappings_config.yaml"
+    config_path.write_text(yaml.safe_dump(config, allow_unicode=True), encoding="utf-8")
+    return config_path
+
+
+def check_identity(mapper: RoomMapper, hotel_name: str, hotel_rooms: List[RoomData], threshold: float) -> None:
+    """Batch scores == scalar scores for all cross-provider pairs; same mapping in both modes"""
+    nodes = dict(enumerate(hotel_rooms))
+    pairs = [(i, j) for i in nodes for j in nodes if nodes[i].provider != nodes[j].provider]
+    limits = mapper.BATCH_MIN_PAIRS, mapper.BATCH_MAX_CELLS_PER_PAIR
+    mapper.BATCH_MIN_PAIRS, mapper.BATCH_MAX_CELLS_PER_PAIR = 0, float("inf")
+    batch_scores = mapper._score_main_names(nodes, pairs)
+    mapper.BATCH_MIN_PAIRS, mapper.BATCH_MAX_CELLS_PER_PAIR = limits
+    for i, j in pairs:
+        scalar_score = mapper.scorer.score_main_name_fuzzy(nodes[i].row, nodes[j].row)
+        if batch_scores[(i, j)] != scalar_score:
+            raise SystemExit(f"Batch score differs for {hotel_name}: {nodes[i].row.get('main_name')!r} vs "
+                             f"{nodes[j].row.get('main_name')!r} ({batch_scores[(i, j)]!r} != {scalar_score!r})")
+
+    mappings = []
+    for batch_scoring in (False, True):
+        mapper.BATCH_SCORING = batch_scoring
+        failures = []
+        groups, _ = mapper.map_rooms_for_hotel(hotel_rooms, threshold, failures=failures)
+        mappings.append((groups, [(i, j, result.score) for i, j, result in failures]))
+    if mappings[0] != mappings[1]:
+        raise SystemExit(f"map_rooms_for_hotel differs between scalar and batch scoring for {hotel_name}")
+
+
+def measure(run: Callable[[], object], repeat: int) -> float:
+    """Best-of-repeat seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Room main name fuzzy scoring benchmark")
+    parser.add_argument("--hotels", type=int, default=10, help="Hotels with the most rooms to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (best is reported)")
+    parser.add_argument("--fuzzy-workers", type=int, default=-1, help="cdist threads (-1 = all cores)")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: print only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mapper = RoomMapper(str(build_mapper_config(Path(tmp_dir))), log_failures=False)
+        all_rooms = mapper.load_room_data()
+    mapper.FUZZY_WORKERS = args.fuzzy_workers
+    threshold = mapper.config.get_similarity_threshold()
+
+    hotels: Dict[str, List[RoomData]] = defaultdict(list)
+    for room in all_rooms:
+        hotels[room.ref_hotel_name].append(room)
+    largest = sorted(hotels.items(), key=lambda item: len(item[1]), reverse=True)[:args.hotels]
+
+    results: Dict[str, dict] = {}
+    for hotel_name, hotel_rooms in largest:
+        check_identity(mapper, hotel_name, hotel_rooms, threshold)
+        nodes = dict(enumerate(hotel_rooms))
+        pairs = mapper._prefilter_rooms(hotel_rooms)  # Blocking index pairs, as in map_rooms_for_hotel
+
+        def scalar():
+            for i, j in pairs:
+                mapper.scorer.score_main_name_fuzzy(nodes[i].row, nodes[j].row)
+
+        def batch():
+            # Provider pairs left out of the matrices are scored one by one, as in score_room
+            scores = mapper._score_main_names(nodes, pairs)
+            for i, j in pairs:
+                if (i, j) not in scores:
+                    mapper.scorer.score_main_name_fuzzy(nodes[i].row, nodes[j].row)
+
+        def map_hotel(batch_scoring: bool):
+            mapper.BATCH_SCORING = batch_scoring
+            return measure(lambda: mapper.map_rooms_for_hotel(hotel_rooms, threshold, failures=[]), args.repeat)
+
+        scalar_s = measure(scalar, args.repeat)
+        batch_s = measure(batch, args.repeat)
+        map_scalar_s, map_batch_s = map_hotel(False), map_hotel(True)
+        results[hotel_name] = {
+            "rooms": len(hotel_rooms),
+            "pairs": len(pairs),
+            "scalar_s": round(scalar_s, 4),
+            "batch_s": round(batch_s, 4),
+            "speedup": round(scalar_s / batch_s, 2),
+            "map_scalar_s": round(map_scalar_s, 4),
+            "map_batch_s": round(map_batch_s, 4),
+            "map_speedup": round(map_scalar_s / map_batch_s, 2),
+        }
+
+    print(f"{'hotel':<40} {'rooms':>5} {'pairs':>6} {'scalar s':>9} {'batch s':>8} {'speedup':>8} "
+          f"{'map scalar s':>13} {'map batch s':>12} {'speedup':>8}")
+    for hotel_name, stats in results.items():
+        print(f"{hotel_name[:40]:<40} {stats['rooms']:>5} {stats['pairs']:>6} {stats['scalar_s']:>9} "
+              f"{stats['batch_s']:>8} {stats['speedup']:>7.2f}x {stats['map_scalar_s']:>13} "
+              f"{stats['map_batch_s']:>12} {stats['map_speedup']:>7.2f}x")
+    print("batch scores bit-identical to scalar scores")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+        print(f"\nResults written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Room CSV standardization benchmark.
+
+Runs RoomDataParser.process_api on the bundled standardized supplier room CSVs
+(app/data/room_mapper/*_rooms_STANDARDIZED.csv) and compares:
+
+- legacy:   process_api before batch parsing - one df['room_name'].apply pass
+            per column over config-driven, uncompiled patterns. Loaded from
+            git (--legacy-rev); skipped when the revision is not available
+- batch:    one fused pass per chunk over precompiled rules
+
+Output identity: every batch output - whole file and in small chunks - must be
+byte-identical to the legacy output, recorded below as SHA-256 digests (and
+compared directly when the legacy revision is available). The digests are also
+checked, independently of this script, by tests/test_universal_room_parser.py.
+
+Usage (from repository root):
+    python -m benchmarks.room_parser_benchmark --repeat 5
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from app.data.room_mapper.universal_room_parser import RoomDataParser
+
+PARSER_PATH = "app/data/room_mapper/universal_room_parser.py"
+ROOM_CSV_DIR = Path("app/data/room_mapper")
+
+# Input CSV -> (provider, SHA-256 of the legacy process_api output)
+ROOM_CSVS = {
+    "01_api_rate_hawk_rooms_STANDARDIZED.csv": ("ratehawk", "6561898aea667c5b76f0603584100f1ba3f42dee613b5b24fdab7860f8ebd981"),
+    "02_api_goglobal_rooms_STANDARDIZED.csv": ("goglobal", "87f2278734a81120c167abedf252d5efffb60c7604fe1ead2efa19b43b1e9ce5"),
+    "03_api_tbo_rooms_STANDARDIZED.csv": ("tbo", "368ae131f22a7f623345a2d8146f717ae67a963f583cc6b50bf66f9069fc46b6"),
+}
+
+# Last revision with the per-column process_api
+LEGACY_REV = "805f4738f3251485e7e9a1bc3df091991fc87b27"
+
+
+def load_legacy_parser(rev: str) -> Optional[type]:
+    """RoomDataParser class of universal_room_parser.py at git revision rev (None if unavailable)"""
+    try:
+        source = subprocess.run(
+            ["git", "show", f"{rev}:{PARSER_PATH}"], capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    spec = importlib.util.spec_from_loader("legacy_universal_room_parser", loader=None)
+    module = importlib.util.module_from_spec(spec)
+    exec(compile(source, f"{rev}:{PARSER_PATH}", "exec"), module.__dict__)
+    sys.modules[spec.name] = module
+    return module.RoomDataParser
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def measure(parser_factory: Callable[[], object], input_path: Path, output_path: Path,
+            provider: str, repeat: int, **kwargs) -> float:
+    """Best-of-repeat process_api seconds, a fresh parser per run (parser setup not timed)"""
+    best = None
+    for _ in range(repeat):
+        parser = parser_factory()
+        start = time.perf_counter()
+        if not parser.process_api(str(input_path), str(output_path), provider, **kwargs):
+            raise SystemExit(f"process_api failed for {input_path}")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Room CSV standardization benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (best is reported)")
+    parser.add_argument("--check-chunk-size", type=int, default=97, help="Small chunk size checked for identical output")
+    parser.add_argument("--legacy-rev", default=LEGACY_REV, help="Git revision of the legacy parser")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: print only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Legacy process_api assigns columns on a filtered frame (warning class removed in pandas 3)
+    setting_with_copy_warning = getattr(pd.errors, "SettingWithCopyWarning", None)
+    if setting_with_copy_warning is not None:
+        warnings.simplefilter("ignore", setting_with_copy_warning)
+    legacy_parser = load_legacy_parser(args.legacy_rev)
+    if legacy_parser is None:
+        print(f"Legacy parser not available at {args.legacy_rev} - checking recorded digests only")
+
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for file_name, (provider, legacy_digest) in ROOM_CSVS.items():
+            input_path = ROOM_CSV_DIR / file_name
+            if not input_path.exists():
+                print(f"Skipping missing {input_path}")
+                continue
+            batch_path = Path(tmp_dir) / f"batch_{provider}.csv"
+            chunked_path = Path(tmp_dir) / f"chunked_{provider}.csv"
+            legacy_path = Path(tmp_dir) / f"legacy_{provider}.csv"
+
+            batch_s = measure(RoomDataParser, input_path, batch_path, provider, args.repeat)
+            measure(RoomDataParser, input_path, chunked_path, provider, 1, chunk_size=args.check_chunk_size)
+            for path in (batch_path, chunked_path):
+                if file_digest(path) != legacy_digest:
+                    raise SystemExit(f"{path.name} differs from legacy process_api output for {file_name}")
+
+            stats = {"provider": provider, "batch_s": round(batch_s, 4)}
+            if legacy_parser is not None:
+                legacy_s = measure(legacy_parser, input_path, legacy_path, provider, args.repeat)
+                if legacy_path.read_bytes() != batch_path.read_bytes():
+                    raise SystemExit(f"Legacy output at {args.legacy_rev} differs from batch output for {file_name}")
+                stats.update({"legacy_s": round(legacy_s, 4), "speedup": round(legacy_s / batch_s, 2)})
+            results[file_name] = stats
+
+    print(f"{'file':<42} {'provider':<9} {'legacy s':>9} {'batch s':>8} {'speedup':>8}")
+    for file_name, stats in results.items():
+        legacy_s = stats.get("legacy_s", "-")
+        speedup = f"{stats['speedup']:.2f}x" if "speedup" in stats else "-"
+        print(f"{file_name:<42} {stats['provider']:<9} {legacy_s:>9} {stats['batch_s']:>8} {speedup:>8}")
+    print("output identical to legacy (whole file and chunked)")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+        print(f"\nResults written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+Search hot path benchmark and load test.
+
+Starts the fake suppliers (benchmarks/fake_suppliers.py) in a separate process,
+points the real provider adapters at them via Config.PROVIDERS base_url, installs
+the in-memory mapping backend and measures:
+
+- normalize:  adapter.normalize() time per 1k rates and offers/s for every provider
+- adapters:   UniversalProvider.search_single() for every provider
+- search_all: UniversalProvider.search_all() across all providers
+- route:      FastAPI POST /hotels/search (in-process ASGI transport)
+
+For every load scenario: throughput, p50/p95/p99 latency, event loop lag and
+memory allocated per search (tracemalloc peak and net allocated blocks, measured
+in a separate sequential pass). Results are written as JSON; --compare prints
+the change against an earlier results file.
+
+Usage (from repository root):
+    python -m benchmarks.search_benchmark --requests 200 --concurrency 20
+    python -m benchmarks.search_benchmark --scenarios normalize,search_all --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.fake_suppliers import (
+    FakeSupplierSettings, base_urls, serve,
+    build_rate_hawk_hotels, build_goglobal_result, build_tbo_response
+)
+
+SCENARIOS = ["normalize", "adapters", "search_all", "route"]
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(values_ms: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/mean/max in milliseconds"""
+    return {
+        "p50": _round(percentile(values_ms, 50)),
+        "p95": _round(percentile(values_ms, 95)),
+        "p99": _round(percentile(values_ms, 99)),
+        "mean": _round(sum(values_ms) / len(values_ms)) if values_ms else None,
+        "max": _round(max(values_ms)) if values_ms else None
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+class LoopLagProbe:
+    """Measures how late the event loop wakes a sleeping coroutine"""
+
+    def __init__(self, interval_ms: float = 10.0):
+        self.interval = interval_ms / 1000
+        self.samples_ms: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples_ms.append(max(0.0, (time.perf_counter() - start - self.interval) * 1000))
+
+    def start(self) -> None:
+        self.samples_ms = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> Dict[str, Optional[float]]:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return {
+            "p50": _round(percentile(self.samples_ms, 50)),
+            "p99": _round(percentile(self.samples_ms, 99)),
+            "max": _round(max(self.samples_ms)) if self.samples_ms else None
+        }
+
+
+async def run_load(call: Callable[[int], Awaitable[bool]], requests: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Run `requests` calls with at most `concurrency` in flight.
+
+    Args:
+        call: Coroutine function taking request index, returns True on success
+        requests: Total number of calls
+        concurrency: Concurrent workers
+    """
+    latencies_ms: List[float] = []
+    failures = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, failures
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                ok = await call(index)
+            except Exception:
+                ok = False
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                failures += 1
+
+    probe = LoopLagProbe()
+    probe.start()
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_start
+    loop_lag = await probe.stop()
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "failures": failures,
+        "wall_time_s": round(wall, 3),
+        "throughput_rps": round(requests / wall, 2) if wall else None,
+        "latency_ms": latency_summary(latencies_ms),
+        "loop_lag_ms": loop_lag
+    }
+
+
+async def measure_allocations(call: Callable[[int], Awaitable[bool]], samples: int) -> Dict[str, Any]:
+    """
+    Memory allocated per search, sequential calls under tracemalloc.
+
+    peak_kb is the tracemalloc peak above the pre-call level (transient allocations),
+    net_blocks the change in allocated interpreter blocks (objects kept after the call).
+    """
+    peaks_kb, net_blocks = [], []
+    await call(0)  # warm-up (sessions, lazy imports)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for index in range(1, samples + 1):
+            tracemalloc.reset_peak()
+            current_before, _ = tracemalloc.get_traced_memory()
+            blocks_before = sys.getallocatedblocks()
+            await call(index)
+            _, peak = tracemalloc.get_traced_memory()
+            net_blocks.append(sys.getallocatedblocks() - blocks_before)
+            peaks_kb.append((peak - current_before) / 1024)
+    finally:
+        tracemalloc.stop()
+    return {
+        "samples": samples,
+        "peak_kb_per_search": _round(percentile(peaks_kb, 50)),
+        "net_blocks_per_search": percentile(net_blocks, 50)
+    }
+
+
+# ============ Setup ============
+
+def configure_app(urls: Dict[str, str], coalesce: bool) -> None:
+    """Point provider adapters at the fake suppliers (before adapters are loaded)"""
+    from app.config import Config
+
+    for provider_name, provider_config in Config.PROVIDERS.items():
+        if provider_name not in urls:
+            provider_config["active"] = False
+            continue
+        provider_config["base_url"] = urls[provider_name]
+        for credential in ("username", "password", "agency_id"):
+            if credential in provider_config and not provider_config[credential]:
+                provider_config[credential] = "benchmark"
+        provider_config.setdefault("result_cache", {})["coalesce_requests"] = coalesce
+
+
+def start_suppliers(settings: FakeSupplierSettings, host: str, port: int) -> multiprocessing.Process:
+    """Start fake suppliers in a separate process (keeps their CPU out of the measurements)"""
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    process = context.Process(target=serve, args=(settings, host, port, ready), daemon=True)
+    process.start()
+    if not ready.wait(30):
+        process.terminate()
+        raise RuntimeError("Fake suppliers did not start")
+    return process
+
+
+def build_raw_response(provider_name: str, hotel_ids: List[str], rates_per_hotel: int) -> Dict[str, Any]:
+    """Raw response in the shape each adapter's search() passes to normalize()"""
+    id_to_name = {hotel_id: f"Benchmark Hotel {hotel_id}" for hotel_id in hotel_ids}
+    if provider_name == "rate_hawk":
+        return {"data": {"hotels": build_rate_hawk_hotels(hotel_ids, rates_per_hotel)}, "hotel_id_to_name_map": id_to_name}
+    if provider_name == "goglobal":
+        data = build_goglobal_result(hotel_ids, rates_per_hotel)
+        data["hotel_name_to_id_map"] = id_to_name
+        return {"status": "success", "data": data}
+    return {"success": True, "data": build_tbo_response(hotel_ids, rates_per_hotel), "hotel_id_to_name_map": id_to_name}
+
+
+# ============ Scenarios ============
+
+def bench_normalize(universal_provider, rates: int, repeat: int) -> Dict[str, Any]:
+    """adapter.normalize() time per 1k rates and offers normalized per second"""
+    results = {}
+    hotels = 10
+    rates_per_hotel = max(1, rates // hotels)
+    for provider_name, adapter in universal_provider.adapters.items():
+        raw = build_raw_response(provider_name, [str(900000 + i) for i in range(hotels)], rates_per_hotel)
+        timings = []
+        offers = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            offers = adapter.normalize(raw, {})
+            timings.append((time.perf_counter() - start) * 1000)
+        total_rates = hotels * rates_per_hotel
+        results[provider_name] = {
+            "rates": total_rates,
+            "offers": len(offers),
+            "ms_per_1k_rates": _round(percentile(timings, 50) * 1000 / total_rates),
+            "best_ms_per_1k_rates": _round(min(timings) * 1000 / total_rates),
+            "offers_per_s": round(len(offers) * 1000 / percentile(timings, 50))
+        }
+    return results
+
+
+async def run_scenario(call: Callable[[int], Awaitable[bool]], args) -> Dict[str, Any]:
+    """Load test + allocation pass for one scenario"""
+    result = await run_load(call, args.requests, args.concurrency)
+    result["allocations"] = await measure_allocations(call, args.alloc_samples)
+    return result
+
+
+async def run_benchmarks(args, hotel_pool: List[str]) -> Dict[str, Any]:
+    from app.services.universal_provider import universal_provider
+    from app.services.hotel_mapping import hotel_mapping_service
+
+    await hotel_mapping_service.preload()
+
+    check_in = date.today() + timedelta(days=30)
+    rng = random.Random(args.seed)
+
+    def make_criteria(index: int) -> Dict[str, Any]:
+        # Different hotel sets per request - no two concurrent searches are identical
+        return {
+            "hotel_names": rng.sample(hotel_pool, args.hotels_per_search),
+            "check_in": check_in.isoformat(),
+            "check_out": (check_in + timedelta(days=3)).isoformat(),
+            "adults": 2,
+            "children": 0,
+            "children_ages": [],
+            "currency": "EUR",
+            "nationality": "PL"
+        }
+
+    results: Dict[str, Any] = {}
+
+    if "normalize" in args.scenarios:
+        print("Running normalize...")
+        results["normalize"] = bench_normalize(universal_provider, args.normalize_rates, args.normalize_repeat)
+
+    if "adapters" in args.scenarios:
+        results["adapters"] = {}
+        for provider_name in universal_provider.get_available_providers():
+            print(f"Running adapter {provider_name}...")
+
+            async def call_adapter(index: int, provider_name=provider_name) -> bool:
+                result = await universal_provider.search_single(provider_name, make_criteria(index))
+                return result.get("status") == "success"
+
+            results["adapters"][provider_name] = await run_scenario(call_adapter, args)
+
+    if "search_all" in args.scenarios:
+        print("Running search_all...")
+        provider_count = len(universal_provider.get_available_providers())
+
+        async def call_search_all(index: int) -> bool:
+            result = await universal_provider.search_all(make_criteria(index))
+            return result["summary"].get("successful_providers") == provider_count
+
+        results["search_all"] = await run_scenario(call_search_all, args)
+
+    if "route" in args.scenarios:
+        print("Running route /hotels/search...")
+        import httpx
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+
+            async def call_route(index: int) -> bool:
+                criteria = make_criteria(index)
+                response = await client.post("/hotels/search", json={
+                    "hotel_names": criteria["hotel_names"],
+                    "check_in": criteria["check_in"],
+                    "check_out": criteria["check_out"],
+                    "adults": criteria["adults"]
+                })
+                return response.status_code == 200
+
+            results["route"] = await run_scenario(call_route, args)
+
+    from app.services.session_manager import session_manager
+    results["http_sessions"] = session_manager.get_session_stats()
+
+    await universal_provider.close()
+    return results
+
+
+# ============ Reporting ============
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _flatten_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    """Key regression metrics as flat name -> value"""
+    metrics = {}
+    for provider_name, stats in results.get("normalize", {}).items():
+        metrics[f"normalize.{provider_name}.ms_per_1k_rates"] = stats["ms_per_1k_rates"]
+        metrics[f"normalize.{provider_name}.offers_per_s"] = stats.get("offers_per_s")
+
+    load_scenarios = [(f"adapters.{name}", stats) for name, stats in results.get("adapters", {}).items()]
+    load_scenarios += [(name, results[name]) for name in ("search_all", "route") if name in results]
+    for name, stats in load_scenarios:
+        metrics[f"{name}.throughput_rps"] = stats["throughput_rps"]
+        metrics[f"{name}.p95_ms"] = stats["latency_ms"]["p95"]
+        metrics[f"{name}.p99_ms"] = stats["latency_ms"]["p99"]
+        metrics[f"{name}.loop_lag_p99_ms"] = stats["loop_lag_ms"]["p99"]
+        metrics[f"{name}.peak_kb_per_search"] = stats["allocations"]["peak_kb_per_search"]
+    return metrics
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    current = _flatten_metrics(report["results"])
+    previous = _flatten_metrics(baseline["results"]) if baseline else {}
+
+    print()
+    print(f"{'metric':<50} {'value':>12} {'baseline':>12} {'change':>9}")
+    for name, value in current.items():
+        base = previous.get(name)
+        change = f"{(value - base) / base * 100:+.1f}%" if base and value is not None else ""
+        print(f"{name:<50} {value if value is not None else '-':>12} {base if base is not None else '-':>12} {change:>9}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Search hot path benchmark with local fake suppliers")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--alloc-samples", type=int, default=20, help="Sequential searches measured with tracemalloc")
+    parser.add_argument("--hotels", type=int, default=1000, help="Hotels in the in-memory mapping table")
+    parser.add_argument("--hotels-per-search", type=int, default=5)
+    parser.add_argument("--normalize-rates", type=int, default=1000)
+    parser.add_argument("--normalize-repeat", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Mean fake supplier latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--rates-per-hotel", type=int, default=40, help="Fake supplier payload size")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake supplier requests failing with HTTP 500")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--suppliers-url", default=None,
+                        help="Use already running fake suppliers (e.g. http://127.0.0.1:8765) instead of starting them")
+    parser.add_argument("--coalesce", action="store_true", help="Keep request coalescing enabled")
+    parser.add_argument("--cache", action="store_true", help="Keep search result cache enabled")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Results JSON path (default benchmarks/results/search_<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Must be set before app.config is imported
+    os.environ["SEARCH_CACHE_ENABLED"] = "true" if args.cache else "false"
+    os.environ.setdefault("DEBUG_LOOP_BLOCKING", "false")
+
+    settings = FakeSupplierSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rates_per_hotel=args.rates_per_hotel,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+
+    supplier_process = None
+    if args.suppliers_url:
+        host_port = args.suppliers_url.split("://", 1)[-1].rstrip("/")
+        host, port = host_port.rsplit(":", 1)
+        urls = base_urls(host, int(port))
+    else:
+        supplier_process = start_suppliers(settings, "127.0.0.1", args.port)
+        urls = base_urls("127.0.0.1", args.port)
+
+    try:
+        configure_app(urls, coalesce=args.coalesce)
+
+        from benchmarks.mapping_backend import install_in_memory_mapping_backend
+        hotel_pool = install_in_memory_mapping_backend(args.hotels)
+
+        # App log output is part of the hot path, but console noise is not useful here
+        logging.disable(getattr(logging, args.log_level.upper()) - 1)
+
+        results = asyncio.run(run_benchmarks(args, hotel_pool))
+    finally:
+        if supplier_process is not None:
+            supplier_process.terminate()
+            supplier_process.join(5)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "suppliers": asdict(settings),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "hotels": args.hotels,
+            "hotels_per_search": args.hotels_per_search,
+            "cache": args.cache,
+            "coalesce": args.coalesce
+        },
+        "results": results
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"search_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(report, baseline)
+    print(f"\nResults saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+GoGlobal SOAP request building benchmark.
+
+Compares request bodies built per second by:
+
+- legacy:         the previous per-request f-string builder (_build_xml_request +
+                  _build_soap_envelope, encoded by aiohttp on send)
+- template_cold:  SoapRequestTemplate with every search distinct (no cache hits)
+- template_warm:  SoapRequestTemplate over a small set of repeated searches
+
+Every template body is checked to be byte-identical to the legacy one first.
+
+Usage (from repository root):
+    python -m benchmarks.soap_request_benchmark --requests 50000 --hotels-per-search 5
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from app.services.providers.goglobal import SoapRequestTemplate
+
+CREDENTIALS = {"agency_id": "148234", "username": "BENCHMARK_USER", "password": "benchmark-password"}
+
+
+def legacy_request_body(credentials: Dict[str, Any], params: dict) -> bytes:
+    """Request body as built before SoapRequestTemplate (kept here as the reference)"""
+    children_xml = ""
+    if params["children"] > 0 and params["children_ages"]:
+        for age in params["children_ages"][:params["children"]]:
+            children_xml += f"<ChildAge>{age}</ChildAge>"
+
+    meal_filter_xml = ""
+    if params["meal_type"]:
+        meal_filter_xml = f"""<FilterRoomBasises>
+<FilterRoomBasis>{params['meal_type']}</FilterRoomBasis>
+</FilterRoomBasises>"""
+
+    hotels_xml = "<Hotels>"
+    hotel_ids = params.get('hotel_ids', [params.get('hotel_id')])
+    for hotel_id in hotel_ids:
+        if hotel_id:
+            hotels_xml += f"<HotelId>{hotel_id}</HotelId>"
+    hotels_xml += "</Hotels>"
+
+    xml_request = f'''<Root>
+<Header>
+<Agency>{credentials['agency_id']}</Agency>
+<User>{credentials['username']}</User>
+<Password>{credentials['password']}</Password>
+<Operation>HOTEL_SEARCH_REQUEST</Operation>
+<OperationType>Request</OperationType>
+</Header>
+<Main Version="2.3" ResponseFormat="JSON" Currency="EUR">
+{meal_filter_xml}
+{hotels_xml}
+<ArrivalDate>{params['arrival_date']}</ArrivalDate>
+<Nights>{params['nights']}</Nights>
+<Rooms>
+<Room Adults="{params['adults']}" RoomCount="1" ChildCount="{params['children']}">
+{children_xml}
+</Room>
+</Rooms>
+</Main>
+</Root>'''
+
+    soap_envelope = f'''<?xml version="1.0" encoding="utf-8"?>
+<soap12:Envelope xmlns:soap12="http://www.w3.org/2003/05/soap-envelope">
+<soap12:Body>
+<MakeRequest xmlns="http://www.goglobal.travel/">
+<requestType>11</requestType>
+<xmlRequest><![CDATA[{xml_request}]]></xmlRequest>
+</MakeRequest>
+</soap12:Body>
+</soap12:Envelope>'''
+    # aiohttp encodes str payloads on send - part of the old per-request cost
+    return soap_envelope.encode('utf-8')
+
+
+def build_search_params(count: int, hotels_per_search: int, seed: int) -> List[dict]:
+    """Distinct search params in the shape of GoGlobalProvider._prepare_search_params"""
+    rng = random.Random(seed)
+    params_list = []
+    for index in range(count):
+        children = rng.choice([0, 0, 1, 2])
+        params_list.append({
+            "arrival_date": (date(2026, 1, 1) + timedelta(days=index % 365)).isoformat(),
+            "nights": rng.randint(1, 14),
+            "adults": rng.randint(1, 3),
+            "children": children,
+            "children_ages": [rng.randint(2, 16) for _ in range(children)],
+            "meal_type": rng.choice([None, "BB", "HB", "AI"]),
+            "hotel_ids": [str(100000 + rng.randrange(50000)) for _ in range(hotels_per_search)],
+        })
+    return params_list
+
+
+def measure(build: Callable[[dict], bytes], params_list: List[dict], repeat: int) -> Dict[str, float]:
+    """Best-of-repeat throughput of building one body per params"""
+    best = None
+    total_bytes = 0
+    for _ in range(repeat):
+        total_bytes = 0
+        start = time.perf_counter()
+        for params in params_list:
+            total_bytes += len(build(params))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "requests_per_s": round(len(params_list) / best, 1),
+        "mb_per_s": round(total_bytes / best / 1e6, 2),
+        "us_per_request": round(best / len(params_list) * 1e6, 3),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GoGlobal SOAP request building benchmark")
+    parser.add_argument("--requests", type=int, default=50000, help="Request bodies built per pass")
+    parser.add_argument("--hotels-per-search", type=int, default=5)
+    parser.add_argument("--distinct-searches", type=int, default=100, help="Distinct searches in the warm cache pass")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes per variant (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Results JSON path (default: print only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    params_list = build_search_params(args.requests, args.hotels_per_search, args.seed)
+    repeated = params_list[:args.distinct_searches] * (args.requests // max(1, args.distinct_searches))
+
+    check_template = SoapRequestTemplate(**CREDENTIALS)
+    for params in params_list[:1000]:
+        if check_template.render(params) != legacy_request_body(CREDENTIALS, params):
+            raise SystemExit(f"Template output differs from legacy builder for {params}")
+
+    cold_template = SoapRequestTemplate(**CREDENTIALS, cache_size=0)
+    warm_template = SoapRequestTemplate(**CREDENTIALS)
+
+    results = {
+        "legacy": measure(lambda params: legacy_request_body(CREDENTIALS, params), params_list, args.repeat),
+        "template_cold": measure(cold_template.render, params_list, args.repeat),
+        "template_warm": measure(warm_template.render, repeated, args.repeat),
+    }
+    results["template_warm"]["cache"] = warm_template.get_stats()
+
+    legacy_rps = results["legacy"]["requests_per_s"]
+    print(f"{'variant':<16} {'req/s':>12} {'MB/s':>9} {'us/req':>9} {'speedup':>8}")
+    for name, stats in results.items():
+        print(f"{name:<16} {stats['requests_per_s']:>12} {stats['mb_per_s']:>9} {stats['us_per_request']:>9} "
+              f"{stats['requests_per_s'] / legacy_rps:>7.2f}x")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+        print(f"\nResults written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,9 @@ except ImportError:
 async def managed_search():
     """Context manager for search operations with proper cleanup"""
     try:
+        # Debug: report event loop blocking (DEBUG_LOOP_BLOCKING=true)
+        from app.utils.loop_monitor import start_loop_monitor_if_enabled
+        start_loop_monitor_if_enabled()
         yield
     finally:
         # Always cleanup sessions
@@ -264,6 +267,78 @@ async def hotel_search(req: func.HttpRequest) -> func.HttpResponse:
         )
 
 
+@app.function_name(name="HotelSearchStream")
+@app.route(route="search/stream", methods=["POST"], auth_level=AuthLevel.FUNCTION)
+async def hotel_search_stream(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Hotel search returning per-provider events (NDJSON or SSE, ?format=sse).
+
+    Same events as FastAPI /hotels/search/stream. The classic Functions HTTP
+    binding returns the body at once, so events are written in provider
+    completion order but delivered when the last one is ready.
+    """
+    logger.info('Hotel search stream request received')
+
+    try:
+        # Validate deployment health
+        health_response = _validate_deployment_health()
+        if health_response:
+            return health_response
+
+        # Parse and validate request
+        req_body, validation_error = _validate_request_body(req)
+        if validation_error:
+            return validation_error
+
+        from app.main import STREAM_MEDIA_TYPES, format_stream_event, prepare_stream_search, stream_search_events
+        from app.models.request import HotelSearchRequest
+
+        stream_format = req.params.get("format", "ndjson")
+        if stream_format not in STREAM_MEDIA_TYPES:
+            return func.HttpResponse(
+                json.dumps({
+                    "error": "Validation error",
+                    "details": f"Invalid format '{stream_format}'. Supported formats: {list(STREAM_MEDIA_TYPES)}"
+                }),
+                status_code=400,
+                mimetype="application/json"
+            )
+
+        async with managed_search():
+            request_id, criteria = prepare_stream_search(HotelSearchRequest(**req_body))
+            body_parts = []
+            async for event in stream_search_events(request_id, criteria):
+                body_parts.append(format_stream_event(event, stream_format))
+
+        return func.HttpResponse(
+            "".join(body_parts),
+            status_code=200,
+            mimetype=STREAM_MEDIA_TYPES[stream_format],
+            headers={"X-Request-ID": request_id}
+        )
+
+    except ValueError as e:
+        logger.error(f"Validation error: {e}", exc_info=True)
+        return func.HttpResponse(
+            json.dumps({
+                "error": "Validation error",
+                "details": "Invalid request parameters"
+            }),
+            status_code=400,
+            mimetype="application/json"
+        )
+    except Exception as e:
+        logger.error(f"Error processing hotel search stream: {e}", exc_info=True)
+        return func.HttpResponse(
+            json.dumps({
+                "error": "Internal server error",
+                "details": "An unexpected error occurred"
+            }),
+            status_code=500,
+            mimetype="application/json"
+        )
+
+
 @app.function_name(name="ProvidersStatus")
 @app.route(route="providers/status", methods=["GET"], auth_level=AuthLevel.FUNCTION)
 async def providers_status(req: func.HttpRequest) -> func.HttpResponse:
@@ -452,6 +527,37 @@ async def diagnostics_check(req: func.HttpRequest) -> func.HttpResponse:
         except Exception as e:
             diagnostics["providers"]["error"] = f"Failed to load universal_provider: {str(e)}"
 
+        # Database connection pool and hotel mapping cache metrics
+        try:
+            from app.services.hotel_mapping import hotel_mapping_service
+            diagnostics["database"] = {
+                "connection_pool": hotel_mapping_service.sql_connector.get_pool_stats() if hotel_mapping_service.sql_connector else None,
+                "hotel_mapping_cache": hotel_mapping_service.get_cache_stats()
+            }
+        except Exception as e:
+            diagnostics["database"] = {"error": str(e)}
+
+        # Room categorization memoization
+        try:
+            from app.services.room_mapping import get_room_mapping_service
+            diagnostics["room_categorization"] = get_room_mapping_service().get_cache_stats()
+        except Exception as e:
+            diagnostics["room_categorization"] = {"error": str(e)}
+
+        # HTTP connection pool usage per provider
+        try:
+            from app.services.session_manager import session_manager
+            diagnostics["http_sessions"] = session_manager.get_session_stats()
+        except Exception as e:
+            diagnostics["http_sessions"] = {"error": str(e)}
+
+        # Event loop blocking stats (populated when DEBUG_LOOP_BLOCKING=true)
+        try:
+            from app.utils.loop_monitor import loop_monitor
+            diagnostics["event_loop"] = loop_monitor.get_stats()
+        except Exception as e:
+            diagnostics["event_loop"] = {"error": str(e)}
+
         # Determine overall health
         is_healthy = (
             diagnostics["configuration"]["is_valid"] and
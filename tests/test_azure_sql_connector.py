@@ -0,0 +1,50 @@
+import asyncio
+import sqlite3
+
+from app.services.azure_sql_connector import AzureSQLConnector
+
+
+def _sqlite_connector(path, pool_size: int, pool_timeout: float) -> AzureSQLConnector:
+    return AzureSQLConnector(
+        server="local",
+        database="test",
+        pool_size=pool_size,
+        pool_timeout=pool_timeout,
+        connect_factory=lambda: sqlite3.connect(str(path), check_same_thread=False),
+    )
+
+
+def test_saturated_pool_hands_connections_over_without_timeouts(tmp_path):
+    connector = _sqlite_connector(tmp_path / "pool.db", pool_size=2, pool_timeout=5.0)
+
+    async def use_connection():
+        async with connector.get_connection() as conn:
+            await asyncio.sleep(0.01)
+            return conn.execute("SELECT 1").fetchone()[0]
+
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(*(use_connection() for _ in range(20))), timeout=4.0)
+
+    assert asyncio.run(run()) == [1] * 20
+    stats = connector.pool.get_stats()
+    assert stats["timeouts"] == 0
+    assert stats["created"] <= 2
+    assert stats["in_use"] == 0
+
+
+def test_failed_block_discards_connection(tmp_path):
+    connector = _sqlite_connector(tmp_path / "pool.db", pool_size=1, pool_timeout=1.0)
+
+    async def run():
+        try:
+            async with connector.get_connection():
+                raise ValueError("query failed")
+        except ValueError:
+            pass
+        async with connector.get_connection() as conn:
+            return conn.execute("SELECT 1").fetchone()[0]
+
+    assert asyncio.run(run()) == 1
+    stats = connector.pool.get_stats()
+    assert stats["recycled"] == 1
+    assert stats["created"] == 2
@@ -0,0 +1,49 @@
+import asyncio
+
+from app.services.hotel_mapping import HotelMapping
+
+
+class FakeSQLConnector:
+    """Counts hotel_mappings loads; fails them while `failing` is set"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+        self.failing = False
+
+    async def execute_query(self, query, parameters=None):
+        self.queries += 1
+        if self.failing:
+            raise ConnectionError("database unavailable")
+        return self.rows
+
+
+def _mapping_service(connector) -> HotelMapping:
+    service = HotelMapping()
+    service.provider_configs = {"rate_hawk": {"hotel_id_column": "rate_hawk_hotel_id"}}
+    service.sql_connector = connector
+    return service
+
+
+def test_failed_refresh_is_not_retried_by_searches_within_retry_interval():
+    connector = FakeSQLConnector([{"ref_hotel_name": "Hotel A", "rate_hawk_hotel_id": "ra-1"}])
+    service = _mapping_service(connector)
+
+    async def run():
+        assert await service.preload()
+        service._cache_ttl = 0  # Every lookup sees stale indexes
+        service._retry_interval = 60
+        connector.failing = True
+
+        resolved = await service.resolve_hotels(["Hotel A"])
+        await service._refresh_task  # Background refresh fails
+        assert connector.queries == 2
+
+        for _ in range(5):
+            resolved = await service.resolve_hotels(["Hotel A"])
+            await asyncio.sleep(0)
+        return resolved
+
+    assert asyncio.run(run()) == {"Hotel A": {"rate_hawk": "ra-1"}}
+    assert connector.queries == 2
+    assert service.get_cache_stats()["last_load_failed"]
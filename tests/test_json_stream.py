@@ -0,0 +1,34 @@
+import json
+
+from app.utils.json_stream import StreamingArrayDecoder
+
+
+def _decode(raw: bytes, chunk_size: int, **kwargs):
+    decoder = StreamingArrayDecoder("hotels", **kwargs)
+    items = []
+    for start in range(0, len(raw), chunk_size):
+        items.extend(decoder.feed(raw[start:start + chunk_size]))
+    items.extend(decoder.close())
+    return items, decoder.envelope
+
+
+def test_key_inside_string_values_and_other_paths_is_ignored():
+    document = {
+        "debug": {"note": 'x "hotels": [1]', "hotels": [{"id": "debug"}], "v": "hotels"},
+        "data": {"hotels": [{"id": i, "name": ']"hotels": ['} for i in range(5)], "total_hotels": 5},
+        "status": "ok",
+    }
+    raw = json.dumps(document).encode()
+    expected_envelope = json.loads(raw)
+    expected_envelope["data"]["hotels"] = []
+
+    for chunk_size in (1, 3, 7, 64, len(raw)):
+        items, envelope = _decode(raw, chunk_size, path=("data",))
+        assert items == document["data"]["hotels"]
+        assert envelope == expected_envelope
+
+
+def test_missing_array_returns_plain_document():
+    items, envelope = _decode(b'{"data": null, "error": "core_search_error", "ok": false}', 5, path=("data",))
+    assert items == []
+    assert envelope == {"data": None, "error": "core_search_error", "ok": False}
@@ -0,0 +1,127 @@
+import csv
+from pathlib import Path
+
+import pytest
+import yaml
+
+from app.data.room_mapper.room_mapper_prod import (
+    ConfigurationError,
+    MappingFailureLogger,
+    RoomMapper,
+    ScoreResult,
+    parse_args,
+    pyarrow,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = REPO_ROOT / "app" / "config" / "room_mappings_config.yaml"
+ROOM_DATA_DIR = REPO_ROOT / "app" / "data" / "room_mapper"
+
+
+@pytest.fixture
+def mapper_config(tmp_path, monkeypatch):
+    """Mapper configuration reading the bundled *_STANDARDIZED.csv files; cwd is tmp_path"""
+    config = yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8"))
+    input_files = config["room_mapping_config"]["input_files"]
+    for provider, file_path in input_files.items():
+        input_files[provider] = str(ROOM_DATA_DIR / Path(file_path).name)
+    config_path = tmp_path / "room_mappings_config.yaml"
+    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return str(config_path)
+
+
+def _failure_log_rows(path="production_mapping_failures.csv"):
+    """Failure log rows without the timestamp column"""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [row[1:] for row in csv.reader(f)]
+    Path(path).unlink()
+    return rows
+
+
+def _log(failure_logger, hotel_name, room_name, score):
+    room = {'ref_hotel_name': hotel_name, 'main_name': room_name, 'bedding_config': 'double'}
+    failure_logger.log_failure(room, dict(room, main_name=f"{room_name} other"), ScoreResult(score, {}),
+                               0.7, 'ratehawk', 'goglobal')
+
+
+def _logged(path):
+    """(hotel_name, room1_name, final_score) of every written failure row"""
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(row['hotel_name'], row['room1_name'], row['final_score']) for row in csv.DictReader(f)]
+
+
+def test_failure_logger_writes_full_batches_and_rest_on_flush(tmp_path):
+    path = tmp_path / "failures.csv"
+    failure_logger = MappingFailureLogger(path, batch_size=2)
+
+    written = []
+    for number in range(5):
+        _log(failure_logger, "Hotel A", f"room {number}", 0.1 * number)
+        written.append(len(_logged(path)))
+    assert written == [0, 2, 2, 4, 4]
+
+    failure_logger.flush()
+    assert [room_name for _, room_name, _ in _logged(path)] == [f"room {number}" for number in range(5)]
+
+
+def test_failure_logger_keeps_top_k_per_hotel_in_logging_order(tmp_path):
+    path = tmp_path / "failures.csv"
+    failure_logger = MappingFailureLogger(path, batch_size=100, top_k=2)
+
+    for room_name, score in [("a1", 0.1), ("a2", 0.5), ("a3", 0.3), ("a4", 0.6), ("a5", 0.6)]:
+        _log(failure_logger, "Hotel A", room_name, score)
+    _log(failure_logger, "Hotel B", "b1", 0.2)
+    failure_logger.flush()
+
+    assert _logged(path) == [("Hotel A", "a4", "0.600"), ("Hotel A", "a5", "0.600"), ("Hotel B", "b1", "0.200")]
+
+
+@pytest.mark.skipif(pyarrow is None, reason="Parquet failure log requires pyarrow")
+def test_failure_logger_writes_parquet_part_per_batch(tmp_path):
+    import pandas as pd
+
+    failure_logger = MappingFailureLogger(tmp_path / "failures.parquet", batch_size=2, output_format='parquet')
+    for number in range(3):
+        _log(failure_logger, "Hotel A", f"room {number}", 0.25)
+    failure_logger.flush()
+
+    parts = sorted((tmp_path / "failures.parquet").glob("part-*.parquet"))
+    assert len(parts) == 2
+    df = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+    assert list(df.columns) == MappingFailureLogger.COLUMNS
+    assert list(df['room1_name']) == ["room 0", "room 1", "room 2"]
+    assert list(df['final_score']) == [0.25, 0.25, 0.25]
+
+
+def test_failure_top_k_must_be_positive(tmp_path):
+    with pytest.raises(ConfigurationError):
+        MappingFailureLogger(tmp_path / "failures.csv", top_k=0)
+    with pytest.raises(SystemExit):
+        parse_args(["--failure-top-k", "0"])
+
+
+def test_parallel_top_k_failure_log_matches_serial(mapper_config):
+    serial_output = RoomMapper(mapper_config, failure_top_k=3).map_all_rooms(workers=1)
+    serial_failures = _failure_log_rows()
+
+    parallel_output = RoomMapper(mapper_config, failure_top_k=3).map_all_rooms(workers=2, chunk_pairs=500)
+    parallel_failures = _failure_log_rows()
+
+    assert parallel_output.equals(serial_output)
+    assert parallel_failures == serial_failures
+    hotel_counts = {}
+    for row in serial_failures[1:]:
+        hotel_counts[row[0]] = hotel_counts.get(row[0], 0) + 1
+    assert hotel_counts and max(hotel_counts.values()) <= 3
+
+
+def test_incremental_run_reuses_results_stored_without_failure_logging(mapper_config):
+    full_output = RoomMapper(mapper_config).map_all_rooms()
+    full_failures = _failure_log_rows()
+
+    RoomMapper(mapper_config, log_failures=False).map_all_rooms(store_path="store.sqlite")
+    incremental_output = RoomMapper(mapper_config).map_all_rooms(store_path="store.sqlite")
+
+    assert incremental_output.equals(full_output)
+    assert _failure_log_rows() == full_failures
@@ -0,0 +1,82 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.main import app
+
+
+def _provider_results():
+    """Fresh provider results: one valid offer, one missing a required field, one not an offer mapping"""
+    return {
+        "rate_hawk": {
+            "status": "success",
+            "processing_time_ms": 12.0,
+            "offers": [
+                {"total_price": 100.0, "currency": "EUR", "room_name": "Deluxe Double Room", "hotel_id": "h1",
+                 "internal_debug": "dropped by field filter"},
+                {"total_price": 90.0, "room_name": "Standard Room"},
+                "not an offer",
+            ],
+        },
+        "tbo": {"status": "error", "processing_time_ms": 5.0, "error": "timeout"},
+    }
+
+
+def _search_request():
+    check_in = date.today() + timedelta(days=30)
+    return {
+        "hotel_names": ["Hotel A"],
+        "check_in": check_in.isoformat(),
+        "check_out": (check_in + timedelta(days=2)).isoformat(),
+        "adults": 2,
+    }
+
+
+def _assert_validated(offers):
+    assert len(offers) == 1
+    offer = offers[0]
+    assert offer["provider"] == "rate_hawk"
+    assert offer["room_name"] == "Deluxe Double Room"
+    assert "room_category" in offer
+    assert "internal_debug" not in offer
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def search_all(criteria):
+        return {"providers": _provider_results(), "summary": {}}
+
+    async def search_stream(criteria):
+        for provider_name, provider_result in _provider_results().items():
+            yield {"event": "provider", "provider": provider_name, "result": provider_result}
+        yield {"event": "summary", "summary": {"total_offers": 1}}
+
+    monkeypatch.setattr(main.universal_provider, "search_all", search_all)
+    monkeypatch.setattr(main.universal_provider, "search_stream", search_stream)
+    return TestClient(app)
+
+
+def test_search_returns_only_validated_offers(client):
+    response = client.post("/hotels/search", json=_search_request())
+
+    assert response.status_code == 200
+    body = response.json()
+    _assert_validated(body["data"])
+    breakdown = body["meta"]["provider_breakdown"]
+    assert breakdown["rate_hawk"]["offers_count"] == 1
+    assert breakdown["tbo"] == {"status": "error", "offers_count": 0, "processing_time_ms": 5.0, "error": "timeout"}
+
+
+def test_stream_search_validates_offers_like_buffered_search(client):
+    response = client.post("/hotels/search/stream", json=_search_request())
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    by_provider = {event["provider"]: event for event in events if event["event"] == "provider"}
+    _assert_validated(by_provider["rate_hawk"]["data"])
+    assert by_provider["rate_hawk"]["offers_count"] == 1
+    assert by_provider["tbo"]["data"] == [] and by_provider["tbo"]["error"] == "timeout"
+    assert events[-1]["event"] == "summary"
@@ -0,0 +1,29 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from app.data.room_mapper.universal_room_parser import RoomDataParser
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ROOM_CSV_DIR = REPO_ROOT / "app" / "data" / "room_mapper"
+
+# Input CSV -> (provider, SHA-256 of the legacy per-column process_api output)
+ROOM_CSVS = {
+    "01_api_rate_hawk_rooms_STANDARDIZED.csv": ("ratehawk", "6561898aea667c5b76f0603584100f1ba3f42dee613b5b24fdab7860f8ebd981"),
+    "02_api_goglobal_rooms_STANDARDIZED.csv": ("goglobal", "87f2278734a81120c167abedf252d5efffb60c7604fe1ead2efa19b43b1e9ce5"),
+    "03_api_tbo_rooms_STANDARDIZED.csv": ("tbo", "368ae131f22a7f623345a2d8146f717ae67a963f583cc6b50bf66f9069fc46b6"),
+}
+
+
+@pytest.mark.parametrize("chunk_size", [None, 97])
+@pytest.mark.parametrize("file_name", sorted(ROOM_CSVS))
+def test_process_api_output_matches_legacy_digest(file_name, chunk_size, tmp_path, monkeypatch):
+    """Fused, chunked process_api writes byte-identical output to the legacy per-column parser"""
+    monkeypatch.chdir(REPO_ROOT)  # Parser loads app/config/room_mappings_config.yaml relative to cwd
+    provider, legacy_digest = ROOM_CSVS[file_name]
+    output_path = tmp_path / f"{provider}.csv"
+    kwargs = {} if chunk_size is None else {"chunk_size": chunk_size}
+
+    assert RoomDataParser().process_api(str(ROOM_CSV_DIR / file_name), str(output_path), provider, **kwargs)
+    assert hashlib.sha256(output_path.read_bytes()).hexdigest() == legacy_digest